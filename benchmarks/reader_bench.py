@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Headless benchmarks for Reader.
+
+Generates synthetic translations in the README XML shape, times the navigation hot path
+(cold start, set_root, get_books, get_chapters, get_verses, get_chapter_text) and search, measures
+the memory one open translation costs and how several processes share one store, and writes the
+results to JSON so runs can be compared across commits:
+
+    python benchmarks/reader_bench.py --output before.json
+    python benchmarks/reader_bench.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.books import CANONICAL_BOOKS  # noqa: E402
+from src.reader import Reader  # noqa: E402
+from src.search import SearchEngine  # noqa: E402
+from src.storage import store_path  # noqa: E402
+
+WORDS = (
+    "the and of to that in he shall unto for his lord they be is him not them it with all thou thy "
+    "which was god said before when came out upon come into people word light life love father son"
+).split()
+
+
+def write_translation(path: str, books: int, chapters: int, verses: int, seed: int = 0) -> None:
+    """
+    Write a synthetic translation XML file.
+
+    :param path: Destination file.
+    :param books: Number of books (canonical names are used while they last).
+    :param chapters: Chapters per book.
+    :param verses: Verses per chapter (plus one section title per chapter).
+    :param seed: Random seed for the verse text.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<bible>\n")
+        for book_index in range(books):
+            name = CANONICAL_BOOKS[book_index] if book_index < len(CANONICAL_BOOKS) else f"Book {book_index + 1}"
+            f.write(f'  <b n="{escape(name)}">\n')
+            for chapter in range(1, chapters + 1):
+                f.write(f'    <c n="{chapter}">\n      <v n="0">Section {chapter}</v>\n')
+                for verse in range(1, verses + 1):
+                    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40)))
+                    f.write(f'      <v n="{verse}">{text}.</v>\n')
+                f.write("    </c>\n")
+            f.write("  </b>\n")
+        f.write("</bible>\n")
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Call fn repeat times and return timing statistics in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "runs": len(samples),
+    }
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Return the peak resident set size of this process in KiB, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def translation_memory(workdir: str, name: str, backend: str) -> Dict[str, float]:
+    """
+    Measure what keeping one translation open costs, next to parsing its XML into an ElementTree.
+
+    :return: Python heap allocated by opening the store, the store's own size estimate (mostly
+        memory-mapped or page cache, shared between processes) and the heap of a full ElementTree, in KiB.
+    """
+    Reader(workdir, backend=backend).load_root(name)  # make sure the store is built
+    reader = Reader(workdir, backend=backend)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = reader.load_root(name)
+    store_heap = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    tree = ET.parse(os.path.join(workdir, name + ".xml"))
+    etree_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return {"store_heap_kb": store_heap / 1024, "store_nbytes_kb": store.nbytes / 1024, "etree_heap_kb": etree_heap / 1024}
+
+
+def mapping_kb(path: str) -> Dict[str, int]:
+    """Return the Rss, Pss and private pages of this process's mappings of a file in KiB (Linux only)."""
+    totals = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    inside = False
+    with open("/proc/self/smaps") as f:
+        for line in f:
+            fields = line.split()
+            if "-" in fields[0] and not fields[0].endswith(":"):
+                inside = fields[-1] == path
+            elif inside and fields[0][:-1] in totals:
+                totals[fields[0][:-1]] += int(fields[1])
+    return totals
+
+
+def attach_worker(workdir: str, name: str, backend: str, barrier, results) -> None:
+    """Open a translation as a new window's process would, read all of it and report what it costs."""
+    start = time.perf_counter()
+    reader = Reader(workdir, backend=backend)
+    store = reader.load_root(name)
+    attach_ms = (time.perf_counter() - start) * 1000
+    for verse_index in range(store.verse_count):
+        store.verse_text(verse_index)
+    barrier.wait()  # every process holds its mapping before any is measured
+    mapping = mapping_kb(os.path.realpath(store_path(reader.compiled_dir, name, reader.backend)))
+    results.put({"attach_ms": attach_ms, "rss_kb": mapping["Rss"], "pss_kb": mapping["Pss"],
+                 "private_kb": mapping["Private_Clean"] + mapping["Private_Dirty"]})
+    barrier.wait()
+
+
+def shared_store(workdir: str, name: str, backend: str, processes: int = 4) -> Dict[str, float]:
+    """
+    Open the same compiled translation in several processes at once, as separate reader windows do.
+
+    :return: Mean time for a process to open the already compiled store and, for its memory
+        mapping, the mean resident, proportional (Pss) and private size in KiB. Pss shrinks
+        as processes are added because the mapped pages are shared; empty off Linux or for SQLite.
+    """
+    if backend != "compiled" or not os.path.exists("/proc/self/smaps"):
+        return {}
+    Reader(workdir, backend=backend).load_root(name)  # make sure the store is built
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(processes), context.Queue()
+    workers = [context.Process(target=attach_worker, args=(workdir, name, backend, barrier, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return {
+        "ms": statistics.mean(report["attach_ms"] for report in reports),
+        "processes": processes,
+        **{key: statistics.mean(report[key] for report in reports) for key in ("rss_kb", "pss_kb", "private_kb")},
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit, if available."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    """Generate the translations, run every benchmark and return the results."""
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="bible-bench-") as workdir:
+        names = [f"SYN{index}" for index in range(args.translations)]
+        for index, name in enumerate(names):
+            write_translation(os.path.join(workdir, name + ".xml"), args.books, args.chapters, args.verses, seed=index)
+
+        # Cold start: empty compiled cache, first translation is compiled from XML
+        start = time.perf_counter()
+        reader = Reader(workdir, backend=args.backend)
+        reader.set_root(names[0])
+        results["cold_start"] = {"ms": (time.perf_counter() - start) * 1000}
+
+        # Warm start: a new Reader opening the compiled file left by the cold start
+        def warm_start() -> None:
+            fresh = Reader(workdir, backend=args.backend)
+            fresh.set_root(names[0])
+        results["warm_start"] = time_calls(warm_start, args.repeat)
+
+        for name in names[1:]:
+            reader.set_root(name)  # compile every translation once before timing switches
+        switch = iter(range(10 ** 9))
+        results["set_root"] = time_calls(lambda: reader.set_root(names[next(switch) % len(names)]), args.repeat)
+
+        reader.set_root(names[0])
+        books = reader.get_books()
+        rng = random.Random(1)
+        targets = [(rng.choice(books), str(rng.randint(1, args.chapters)), rng.randint(1, args.verses))
+                   for _ in range(args.repeat)]
+        picks = iter(range(10 ** 9))
+
+        def pick():
+            return targets[next(picks) % len(targets)]
+
+        results["get_books"] = time_calls(reader.get_books, args.repeat)
+        results["get_chapters"] = time_calls(lambda: reader.get_chapters(pick()[0]), args.repeat)
+        results["get_verses"] = time_calls(lambda: reader.get_verses(*pick()[:2]), args.repeat)
+        results["get_chapter_text"] = time_calls(lambda: reader.get_chapter_text(*pick()), args.repeat)
+        search_engine = SearchEngine(reader)
+        search_engine.index_for(names[0])
+        results["search_terms"] = time_calls(lambda: search_engine.search(names[0], "the lord"), args.repeat)
+        results["search_phrase"] = time_calls(lambda: search_engine.search(names[0], '"the lord"'), args.repeat)
+        results["memory"] = translation_memory(workdir, names[0], args.backend)
+        results["shared_store"] = shared_store(workdir, names[0], args.backend)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {key: getattr(args, key) for key in ("translations", "books", "chapters", "verses", "repeat", "backend")},
+        "results": results,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    Compare median timings against a baseline run.
+
+    :return: Descriptions of operations slower than threshold times the baseline.
+    """
+    regressions = []
+    for operation, stats in current["results"].items():
+        before = baseline.get("results", {}).get(operation)
+        if not before:
+            continue
+        key = "median_ms" if "median_ms" in stats else "ms"
+        if key not in stats or key not in before or not before[key]:
+            continue
+        ratio = stats[key] / before[key]
+        line = f"{operation:18} {before[key]:10.3f} ms -> {stats[key]:10.3f} ms  x{ratio:.2f}"
+        print(line)
+        if ratio > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Reader on synthetic translations")
+    parser.add_argument("--translations", type=int, default=3, help="Number of synthetic translations")
+    parser.add_argument("--books", type=int, default=66, help="Books per translation")
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters per book")
+    parser.add_argument("--verses", type=int, default=25, help="Verses per chapter")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per timed operation")
+    parser.add_argument("--backend", choices=("compiled", "sqlite"), default="compiled", help="Reader storage backend")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above x{args.threshold}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ setup(
     author="David Rose",
     packages=find_packages(),
     include_package_data=True,
+    package_data={"src": ["data/*.json"]},
     install_requires=load_requirements('requirements.txt'),
     entry_points={"console_scripts": ["bible-gui=src.main:main"]},
     license="MIT",
@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional
+
+OLD_TESTAMENT: List[str] = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua", "Judges", "Ruth",
+    "1 Samuel", "2 Samuel", "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles", "Ezra", "Nehemiah",
+    "Esther", "Job", "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah",
+    "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos", "Obadiah", "Jonah", "Micah", "Nahum",
+    "Habakkuk", "Zephaniah", "Haggai", "Zechariah", "Malachi",
+]
+
+NEW_TESTAMENT: List[str] = [
+    "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians", "2 Corinthians", "Galatians",
+    "Ephesians", "Philippians", "Colossians", "1 Thessalonians", "2 Thessalonians", "1 Timothy",
+    "2 Timothy", "Titus", "Philemon", "Hebrews", "James", "1 Peter", "2 Peter", "1 John", "2 John",
+    "3 John", "Jude", "Revelation",
+]
+
+CANONICAL_BOOKS: List[str] = OLD_TESTAMENT + NEW_TESTAMENT
+
+# Common abbreviations of each book (besides unique prefixes of the full name, which always resolve)
+ABBREVIATIONS: Dict[str, List[str]] = {
+    "Genesis": ["gn", "ge"], "Exodus": ["exo", "ex", "exod"], "Leviticus": ["lv", "le", "lev"],
+    "Numbers": ["nm", "nu", "num"], "Deuteronomy": ["dt", "deut", "de"], "Joshua": ["jos", "josh", "jsh"],
+    "Judges": ["jdg", "judg", "jg"], "Ruth": ["rth", "ru"], "1 Samuel": ["1 sm", "1 sa", "1 sam"],
+    "2 Samuel": ["2 sm", "2 sa", "2 sam"], "1 Kings": ["1 kgs", "1 ki"], "2 Kings": ["2 kgs", "2 ki"],
+    "1 Chronicles": ["1 chr", "1 ch", "1 chron"], "2 Chronicles": ["2 chr", "2 ch", "2 chron"],
+    "Ezra": ["ezr"], "Nehemiah": ["ne", "neh"], "Esther": ["est", "esth"], "Job": ["jb"],
+    "Psalms": ["ps", "psa", "pss", "psalm"], "Proverbs": ["pr", "prov", "prv"], "Ecclesiastes": ["ec", "eccl", "qoh"],
+    "Song of Solomon": ["song", "sos", "so", "ss", "cant"], "Isaiah": ["is", "isa"], "Jeremiah": ["je", "jer", "jr"],
+    "Lamentations": ["la", "lam"], "Ezekiel": ["eze", "ezek", "ezk"], "Daniel": ["da", "dan", "dn"],
+    "Hosea": ["ho", "hos"], "Joel": ["jl", "joe"], "Amos": ["am"], "Obadiah": ["ob", "obad"],
+    "Jonah": ["jon", "jnh"], "Micah": ["mi", "mic"], "Nahum": ["na", "nah"], "Habakkuk": ["hab", "hb"],
+    "Zephaniah": ["zep", "zeph", "zp"], "Haggai": ["hag", "hg"], "Zechariah": ["zec", "zech", "zc"],
+    "Malachi": ["mal", "ml"], "Matthew": ["mt", "mat", "matt"], "Mark": ["mk", "mr", "mrk"],
+    "Luke": ["lk", "luk"], "John": ["jn", "jhn", "joh"], "Acts": ["ac", "act"], "Romans": ["ro", "rom", "rm"],
+    "1 Corinthians": ["1 co", "1 cor"], "2 Corinthians": ["2 co", "2 cor"], "Galatians": ["ga", "gal"],
+    "Ephesians": ["eph", "ephes"], "Philippians": ["php", "phil", "pp"], "Colossians": ["col", "co"],
+    "1 Thessalonians": ["1 th", "1 thess", "1 thes"], "2 Thessalonians": ["2 th", "2 thess", "2 thes"],
+    "1 Timothy": ["1 ti", "1 tim", "1 tm"], "2 Timothy": ["2 ti", "2 tim", "2 tm"], "Titus": ["ti", "tit"],
+    "Philemon": ["phm", "philem", "phlm"], "Hebrews": ["he", "heb"], "James": ["jas", "jm"],
+    "1 Peter": ["1 pe", "1 pet", "1 pt"], "2 Peter": ["2 pe", "2 pet", "2 pt"], "1 John": ["1 jn", "1 jo", "1 jhn"],
+    "2 John": ["2 jn", "2 jo", "2 jhn"], "3 John": ["3 jn", "3 jo", "3 jhn"], "Jude": ["jud", "jde"],
+    "Revelation": ["re", "rev", "rv", "apoc"],
+}
+
+# Books with a single chapter, where 'Jude 3' means verse 3
+SINGLE_CHAPTER_BOOKS = {"Obadiah", "Philemon", "2 John", "3 John", "Jude"}
+
+# Alternate spellings used by some translations, mapped to the canonical name
+ALIASES: Dict[str, str] = {
+    "psalm": "Psalms",
+    "song of songs": "Song of Solomon",
+    "canticles": "Song of Solomon",
+    "revelations": "Revelation",
+    "revelation of john": "Revelation",
+}
+
+
+def normalize(book_name: str) -> str:
+    """
+    Normalize a book name for comparisons (lowercase, collapsed whitespace, roman numerals as digits).
+
+    :param book_name: Book name as written in a translation or by a user.
+    :return: The normalized name.
+    """
+    words = book_name.lower().replace(".", " ").split()
+    if words and words[0] in ("i", "ii", "iii"):
+        words[0] = str(len(words[0]))
+    if words and len(words[0]) > 1 and words[0][0] in "123" and not words[0].isdigit():
+        words[0:1] = [words[0][0], words[0][1:]]  # '1cor' -> '1 cor'
+    return " ".join(words)
+
+
+_CANONICAL_BY_KEY: Dict[str, str] = {normalize(name): name for name in CANONICAL_BOOKS}
+_CANONICAL_BY_KEY.update(ALIASES)
+
+
+def canonical_name(book_name: str) -> Optional[str]:
+    """
+    Return the canonical name of a book, or None if the name is not recognized.
+
+    :param book_name: Book name as written in a translation.
+    """
+    return _CANONICAL_BY_KEY.get(normalize(book_name))
+
+
+def testament(book_name: str) -> Optional[str]:
+    """
+    Return 'OT' or 'NT' for a book name, or None if the book is not recognized.
+
+    :param book_name: Book name as written in a translation.
+    """
+    name = canonical_name(book_name)
+    if name is None:
+        return None
+    return "NT" if name in NEW_TESTAMENT else "OT"
+
+
+_ABBREVIATION_KEYS: Dict[str, str] = {
+    normalize(abbreviation): name for name, abbreviations in ABBREVIATIONS.items() for abbreviation in abbreviations
+}
+
+
+def resolve_book(text: str) -> Optional[str]:
+    """
+    Resolve a book name, alias, abbreviation or unique prefix (e.g. 'Rom', '1 Cor', 'Revelations') to its canonical name.
+
+    :param text: Book as typed by a user.
+    :return: The canonical name, or None if it is unknown or ambiguous.
+    """
+    key = normalize(text)
+    if not key:
+        return None
+    if key in _CANONICAL_BY_KEY:
+        return _CANONICAL_BY_KEY[key]
+    if key in _ABBREVIATION_KEYS:
+        return _ABBREVIATION_KEYS[key]
+    matches = {name for candidate, name in _CANONICAL_BY_KEY.items() if candidate.startswith(key)}
+    return matches.pop() if len(matches) == 1 else None
+
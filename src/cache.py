@@ -0,0 +1,201 @@
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+UNBOUNDED = sys.maxsize  # Budget of a cache that never evicts
+
+
+class LRUCache:
+    """
+    A least-recently-used mapping bounded by a total size budget.
+
+    Every entry is stored together with its size (in bytes, or any unit the caller chooses).
+    When the sum of the sizes exceeds the budget, the least recently used entries are evicted.
+    The most recently inserted entry is never evicted, so a single oversized value is still cached.
+    """
+    def __init__(self, budget: int) -> None:
+        """
+        :param budget: Maximum total size of the cached values.
+        """
+        self.budget = budget
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.total_size = 0
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[Hashable]:
+        """Return the cached keys, least recently used first."""
+        return list(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for key and mark it as most recently used.
+
+        :param key: Cache key.
+        :return: The cached value, or None if the key is not cached.
+        """
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """
+        Insert or replace a value and evict older entries until the budget is respected.
+
+        :param key: Cache key.
+        :param value: Value to cache.
+        :param size: Size of the value counted against the budget.
+        """
+        self.discard(key)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.total_size += size
+        self._evict()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], sizeof: Callable[[Any], int]) -> Any:
+        """
+        Return the cached value for key, calling loader to produce it on a miss.
+
+        :param key: Cache key.
+        :param loader: Zero-argument callable producing the value.
+        :param sizeof: Callable returning the size of a loaded value.
+        :return: The cached or freshly loaded value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.loads += 1
+            self.put(key, value, sizeof(value))
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        """Remove key from the cache if it is present."""
+        if key in self._entries:
+            del self._entries[key]
+            self.total_size -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        """Remove every entry without touching the statistics."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.total_size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters as a dictionary."""
+        return {
+            "entries": len(self._entries),
+            "size": self.total_size,
+            "budget": self.budget,
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self) -> None:
+        while self.total_size > self.budget and len(self._entries) > 1:
+            key, _ = self._entries.popitem(last=False)
+            self.total_size -= self._sizes.pop(key)
+            self.evictions += 1  # counted, not logged: keys can hold whole verses and eviction is on the hot path
+
+
+class SharedLRUCache:
+    """
+    An LRUCache that can be shared between threads.
+
+    The lock only covers lookups and inserts; values are loaded outside it, so a slow load (e.g.
+    compiling a translation) never blocks readers of other keys. Each key is loaded at most once
+    at a time: concurrent callers asking for a key that is being loaded wait for that load.
+    """
+    def __init__(self, budget: int) -> None:
+        """
+        :param budget: Maximum total size of the cached values.
+        """
+        self._cache = LRUCache(budget)
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._cache
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if it is not cached."""
+        with self._lock:
+            return self._cache.get(key)
+
+    def keys(self) -> List[Hashable]:
+        """Return the cached keys, least recently used first."""
+        with self._lock:
+            return self._cache.keys()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], sizeof: Callable[[Any], int]) -> Any:
+        """
+        Return the cached value for key, calling loader outside the lock to produce it on a miss.
+
+        :param key: Cache key.
+        :param loader: Zero-argument callable producing the value.
+        :param sizeof: Callable returning the size of a loaded value.
+        :return: The cached or freshly loaded value.
+        """
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+            future = self._loading.get(key)
+            loading = future is None
+            if loading:
+                future = self._loading[key] = Future()
+        if not loading:
+            return future.result()
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if self._loading.get(key) is future:  # not discarded while loading
+                del self._loading[key]
+                self._cache.loads += 1
+                self._cache.put(key, value, sizeof(value))
+        future.set_result(value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        """Remove key from the cache; a load of key in progress is still returned but not cached."""
+        with self._lock:
+            self._cache.discard(key)
+            self._loading.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every key matching predicate, including loads in progress."""
+        with self._lock:
+            for key in [key for key in self._cache.keys() if predicate(key)]:
+                self._cache.discard(key)
+            for key in [key for key in self._loading if predicate(key)]:
+                del self._loading[key]
+
+    def clear(self) -> None:
+        """Remove every entry without touching the statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._loading.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters as a dictionary."""
+        with self._lock:
+            return self._cache.stats()
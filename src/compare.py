@@ -0,0 +1,230 @@
+import os
+import pickle
+from concurrent.futures import as_completed
+from difflib import SequenceMatcher
+from html import escape
+from os.path import join
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from .books import CANONICAL_BOOKS
+from .logs import get_logger
+from .parallel import VERSIFICATION_SUFFIX, VerseKey, Versification, book_key
+from .processes import reader_pool, worker_reader
+
+logger = get_logger(__name__)
+
+COMPARISON_VERSION = 2
+COMPARISON_EXTENSION = ".cmp"
+
+Opcode = Tuple[str, int, int, int, int]  # difflib opcode over word indices: (tag, i1, i2, j1, j2)
+
+
+class VerseDiff(NamedTuple):
+    key: VerseKey
+    left: str
+    right: str
+    similarity: float       # 0-1 word-level similarity ratio
+    opcodes: List[Opcode]
+
+    @property
+    def reference(self) -> str:
+        return f"{self.key[0]} {self.key[1]}:{self.key[2]}"
+
+
+class BookComparison(NamedTuple):
+    book: str               # canonical book name
+    identical: int          # verses with the same text in both translations
+    changed: List[VerseDiff]
+    missing: List[VerseKey]  # verses of the left translation absent from the right one
+    extra: List[VerseKey]    # verses of the right translation absent from the left one
+
+
+class Comparison(NamedTuple):
+    left: str
+    right: str
+    books: List[BookComparison]
+
+    @property
+    def changed(self) -> List[VerseDiff]:
+        return [diff for book in self.books for diff in book.changed]
+
+    def summary(self) -> Dict[str, float]:
+        """Return verse counts and the mean similarity of the verses present in both translations."""
+        identical = sum(book.identical for book in self.books)
+        changed = self.changed
+        aligned = identical + len(changed)
+        return {
+            "aligned": aligned,
+            "identical": identical,
+            "changed": len(changed),
+            "missing": sum(len(book.missing) for book in self.books),
+            "extra": sum(len(book.extra) for book in self.books),
+            "similarity": (identical + sum(diff.similarity for diff in changed)) / aligned if aligned else 1.0,
+        }
+
+
+def diff_words(left: str, right: str) -> Tuple[float, List[Opcode]]:
+    """
+    Compare two verse texts word by word.
+
+    :return: (similarity ratio, difflib opcodes over the whitespace-separated words).
+    """
+    matcher = SequenceMatcher(None, left.split(), right.split(), autojunk=False)
+    return matcher.ratio(), matcher.get_opcodes()
+
+
+def diff_html(diff: VerseDiff) -> str:
+    """Render a verse diff as HTML: removed words struck through in red, added words in green."""
+    left, right = diff.left.split(), diff.right.split()
+    parts = []
+    for tag, i1, i2, j1, j2 in diff.opcodes:
+        if tag == "equal":
+            parts.append(escape(" ".join(left[i1:i2])))
+            continue
+        if i2 > i1:
+            parts.append(f'<span style="color:#c00;text-decoration:line-through">{escape(" ".join(left[i1:i2]))}</span>')
+        if j2 > j1:
+            parts.append(f'<span style="color:#080;font-weight:bold">{escape(" ".join(right[j1:j2]))}</span>')
+    return " ".join(parts)
+
+
+def _book_verses(reader, translation_str: str, book: str) -> Dict[VerseKey, str]:
+    """Return the verses of a canonical book in one translation, keyed by canonical verse key."""
+    versification = Versification.load(reader.translations_dir, translation_str)
+    verses: Dict[VerseKey, str] = {}
+    for name in reader.get_books(translation_str=translation_str):
+        if book_key(name) != book:
+            continue
+        for chapter in reader.get_chapters(name, translation_str):
+            for verse_str, text in reader.get_verse_entries(name, chapter, translation_str):
+                if verse_str != "0":
+                    verses[versification.to_canonical((book, int(chapter), int(verse_str)))] = text
+    return verses
+
+
+def compare_book(left: str, right: str, book: str, reader=None) -> BookComparison:
+    """
+    Align one canonical book of two translations and diff every verse present in both.
+
+    :param left: Name of the reference translation.
+    :param right: Name of the translation under review.
+    :param book: Canonical book name.
+    :param reader: Reader to use (defaults to the worker process's Reader).
+    :return: The BookComparison.
+    """
+    reader = reader or worker_reader()
+    left_verses = _book_verses(reader, left, book)
+    right_verses = _book_verses(reader, right, book)
+    identical = 0
+    changed = []
+    for key in sorted(left_verses.keys() & right_verses.keys()):
+        left_text, right_text = left_verses[key], right_verses[key]
+        if left_text == right_text:
+            identical += 1
+            continue
+        similarity, opcodes = diff_words(left_text, right_text)
+        changed.append(VerseDiff(key, left_text, right_text, similarity, opcodes))
+    return BookComparison(
+        book, identical, changed,
+        sorted(left_verses.keys() - right_verses.keys()),
+        sorted(right_verses.keys() - left_verses.keys()),
+    )
+
+
+def _books(reader, left: str, right: str) -> List[str]:
+    """Return the canonical books of either translation, in canonical order."""
+    books = {book_key(name) for translation in (left, right) for name in reader.get_books(translation_str=translation)}
+    order = {name: index for index, name in enumerate(CANONICAL_BOOKS)}
+    return sorted(books, key=lambda name: (order.get(name, len(order)), name))
+
+
+def comparison_path(reader, left: str, right: str) -> str:
+    """Return the path of the cached comparison of two translations."""
+    return join(reader.compiled_dir, f"{left}--{right}{COMPARISON_EXTENSION}")
+
+
+def _source_stamps(reader, left: str, right: str) -> List[Optional[Tuple[int, int]]]:
+    """
+    Return (mtime, size) of every file a comparison depends on: both translation XML files and
+    both versification files (None where a file does not exist).
+    """
+    stamps = []
+    for name in (left, right):
+        for path in (reader._translation_path(name), join(reader.translations_dir, name + VERSIFICATION_SUFFIX)):
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+    return stamps
+
+
+def _load_cached(reader, left: str, right: str) -> Optional[Comparison]:
+    path = comparison_path(reader, left, right)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") == COMPARISON_VERSION and data["sources"] == _source_stamps(reader, left, right):
+            return data["comparison"]
+    except (OSError, pickle.UnpicklingError, KeyError, AttributeError) as e:
+        logger.error(f"Ignoring unreadable comparison {path}: {e}")
+    return None
+
+
+def _save_cached(reader, comparison: Comparison, sources: List[Optional[Tuple[int, int]]]) -> None:
+    path = comparison_path(reader, comparison.left, comparison.right)
+    try:
+        os.makedirs(reader.compiled_dir, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump({"version": COMPARISON_VERSION, "sources": sources, "comparison": comparison}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        logger.error(f"Could not write comparison {path}: {e}")
+
+
+def compare_translations(reader, left: str, right: str, max_workers: Optional[int] = None, use_cache: bool = True,
+                         progress: Optional[Callable[[int, int], None]] = None) -> Comparison:
+    """
+    Compare two translations verse by verse, one book per task in a process pool.
+
+    Verses are aligned on canonical (book, chapter, verse) keys, honouring each translation's
+    versification file. Results are cached next to the compiled translations until either
+    translation's XML or versification file changes.
+
+    :param reader: The Reader providing translations (its directories and backend are reused by the workers).
+    :param left: Name of the reference translation.
+    :param right: Name of the translation under review.
+    :param max_workers: Worker processes (defaults to the number of CPUs); 1 compares in this process.
+    :param use_cache: Reuse and store the on-disk comparison.
+    :param progress: Optional callback receiving (books done, total books).
+    :return: The Comparison, books in canonical order.
+    """
+    sources = _source_stamps(reader, left, right)  # taken first, so changes made while comparing are noticed
+    if use_cache:
+        cached = _load_cached(reader, left, right)
+        if cached is not None:
+            return cached
+
+    for name in (left, right):
+        reader.load_root(name)  # build missing stores once here instead of in every worker
+    books = _books(reader, left, right)
+    results: Dict[str, BookComparison] = {}
+    if max_workers == 1:
+        for done, book in enumerate(books, 1):
+            results[book] = compare_book(left, right, book, reader)
+            if progress is not None:
+                progress(done, len(books))
+    else:
+        with reader_pool(reader, max_workers) as executor:
+            futures = {executor.submit(compare_book, left, right, book): book for book in books}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done, len(books))
+
+    comparison = Comparison(left, right, [results[book] for book in books])
+    if use_cache:
+        _save_cached(reader, comparison, sources)
+    return comparison
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from os.path import join
+from typing import Optional, Tuple, Union
+from .importer import ImportReport, ProgressCallback, import_translation
+from .logs import get_logger
+from .storage import StorageBackend, TranslationStore, build_lock, is_fresh
+
+logger = get_logger(__name__)
+
+COMPILED_EXTENSION = ".bgtc"
+MAGIC = b"BGTC"
+FORMAT_VERSION = 1
+BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+
+# magic, format version, byte order, book count, chapter count, verse count, text blob size
+HEADER = struct.Struct("<4sHHIIII")
+
+BOOK_FIELDS = 4     # name offset, name length, first chapter index, chapter count
+CHAPTER_FIELDS = 3  # chapter number, first verse index, verse count
+VERSE_FIELDS = 3    # verse number, text offset, text length
+
+
+class CompiledTranslation(TranslationStore):
+    """
+    A read-only view over a compiled translation file.
+
+    The file is a header followed by three uint32 offset tables (books, chapters, verses)
+    and a single UTF-8 text blob. Tables are cast straight out of the buffer, so opening a
+    memory-mapped file costs no parsing at all; only the text that is read gets decoded.
+    """
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        """
+        :param buffer: The raw contents of a compiled translation (bytes or a memory map).
+        """
+        magic, version, byte_order, n_books, n_chapters, n_verses, blob_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER:
+            raise ValueError("Unsupported compiled translation format")
+
+        self._buffer = buffer
+        view = memoryview(buffer)
+        offset = HEADER.size
+        self.books = view[offset:offset + n_books * BOOK_FIELDS * 4].cast("I")
+        offset += n_books * BOOK_FIELDS * 4
+        self.chapters = view[offset:offset + n_chapters * CHAPTER_FIELDS * 4].cast("I")
+        offset += n_chapters * CHAPTER_FIELDS * 4
+        self.verses = view[offset:offset + n_verses * VERSE_FIELDS * 4].cast("I")
+        offset += n_verses * VERSE_FIELDS * 4
+        self.blob = view[offset:offset + blob_size]
+
+        self.book_count = n_books
+        self.chapter_count = n_chapters
+        self.verse_count = n_verses
+        self.nbytes = len(buffer)
+        self._build_index()
+
+    @classmethod
+    def open(cls, path: str) -> "CompiledTranslation":
+        """
+        Memory-map a compiled translation file read-only.
+
+        :param path: Path of the compiled file.
+        :return: A CompiledTranslation backed by the mapping.
+        """
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _text(self, offset: int, length: int) -> str:
+        return str(self.blob[offset:offset + length], "utf-8")
+
+    def book_name(self, book_index: int) -> str:
+        """Return the name of the book at book_index."""
+        base = book_index * BOOK_FIELDS
+        return self._text(self.books[base], self.books[base + 1])
+
+    def book_chapters(self, book_index: int) -> range:
+        """Return the range of chapter indices belonging to a book."""
+        base = book_index * BOOK_FIELDS
+        return range(self.books[base + 2], self.books[base + 2] + self.books[base + 3])
+
+    def chapter_number(self, chapter_index: int) -> int:
+        """Return the chapter number of the chapter at chapter_index."""
+        return self.chapters[chapter_index * CHAPTER_FIELDS]
+
+    def chapter_verses(self, chapter_index: int) -> range:
+        """Return the range of verse indices belonging to a chapter."""
+        base = chapter_index * CHAPTER_FIELDS
+        return range(self.chapters[base + 1], self.chapters[base + 1] + self.chapters[base + 2])
+
+    def verse_number(self, verse_index: int) -> int:
+        """Return the verse number of the verse at verse_index (0 for section titles)."""
+        return self.verses[verse_index * VERSE_FIELDS]
+
+    def verse_text(self, verse_index: int) -> str:
+        """Return the text of the verse at verse_index."""
+        base = verse_index * VERSE_FIELDS
+        return self._text(self.verses[base + 1], self.verses[base + 2])
+
+
+class TranslationBuilder:
+    """Accumulates books, chapters and verses in document order and serializes them to the compiled format."""
+    def __init__(self) -> None:
+        self.books = array("I")
+        self.chapters = array("I")
+        self.verses = array("I")
+        self.blob = bytearray()
+
+    def _append_text(self, text: str) -> tuple:
+        data = text.encode("utf-8")
+        offset = len(self.blob)
+        self.blob += data
+        return offset, len(data)
+
+    def add_book(self, name: str) -> None:
+        """Start a new book; following chapters belong to it."""
+        offset, length = self._append_text(name)
+        self.books.extend((offset, length, len(self.chapters) // CHAPTER_FIELDS, 0))
+
+    def add_chapter(self, number: int) -> None:
+        """Start a new chapter in the current book; following verses belong to it."""
+        self.chapters.extend((number, len(self.verses) // VERSE_FIELDS, 0))
+        self.books[-1] += 1
+
+    def add_verse(self, number: int, text: str) -> None:
+        """Append a verse (or a section title when number is 0) to the current chapter."""
+        offset, length = self._append_text(text)
+        self.verses.extend((number, offset, length))
+        self.chapters[-1] += 1
+
+    def to_bytes(self) -> bytes:
+        """Serialize the accumulated translation."""
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, BYTE_ORDER,
+            len(self.books) // BOOK_FIELDS,
+            len(self.chapters) // CHAPTER_FIELDS,
+            len(self.verses) // VERSE_FIELDS,
+            len(self.blob),
+        )
+        return b"".join((header, self.books.tobytes(), self.chapters.tobytes(), self.verses.tobytes(), bytes(self.blob)))
+
+
+def build_translation(xml_path: str, progress: Optional[ProgressCallback] = None) -> Tuple[bytes, ImportReport]:
+    """
+    Convert a translation XML file into the compiled binary format.
+    The XML is streamed, so memory use is bounded by the compiled output rather than the parsed tree.
+
+    :param xml_path: Path of the source XML file.
+    :param progress: Optional callback receiving (bytes read, total bytes).
+    :return: The compiled translation as bytes and the import report.
+    """
+    builder = TranslationBuilder()
+    report = import_translation(xml_path, builder, progress)
+    return builder.to_bytes(), report
+
+
+def compiled_path(compiled_dir: str, translation_str: str) -> str:
+    """Return the path of the compiled file for a translation."""
+    return join(compiled_dir, translation_str + COMPILED_EXTENSION)
+
+
+def compile_translation(xml_path: str, binary_path: str,
+                        progress: Optional[ProgressCallback] = None) -> Tuple[bytes, ImportReport]:
+    """
+    Compile a translation XML file and write the result atomically to binary_path.
+
+    :param xml_path: Path of the source XML file.
+    :param binary_path: Destination of the compiled file.
+    :param progress: Optional callback receiving (bytes read, total bytes).
+    :return: The compiled bytes, so callers can use them even if writing fails, and the import report.
+    """
+    data, report = build_translation(xml_path, progress)
+    try:
+        os.makedirs(os.path.dirname(binary_path), exist_ok=True)
+        tmp_path = binary_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, binary_path)
+        logger.info(f"Compiled {xml_path} -> {binary_path}")
+    except OSError as e:
+        logger.error(f"Could not write compiled translation {binary_path}: {e}")
+    return data, report
+
+
+def load_translation(xml_path: str, binary_path: str) -> CompiledTranslation:
+    """
+    Open the compiled form of a translation, rebuilding it first if it is missing or stale.
+
+    :param xml_path: Path of the source XML file.
+    :param binary_path: Path of the compiled file.
+    :return: The opened CompiledTranslation.
+    """
+    stale = not is_fresh(xml_path, binary_path)
+    if not stale:
+        try:
+            return CompiledTranslation.open(binary_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable compiled translation {binary_path}: {e}")
+    with build_lock(binary_path):
+        if stale and is_fresh(xml_path, binary_path):
+            return CompiledTranslation.open(binary_path)  # compiled by another process while we waited
+        data, _ = compile_translation(xml_path, binary_path)
+    if is_fresh(xml_path, binary_path):
+        return CompiledTranslation.open(binary_path)
+    return CompiledTranslation(data)
+
+
+BACKEND = StorageBackend(
+    name="compiled",
+    extension=COMPILED_EXTENSION,
+    build=lambda xml_path, binary_path, progress=None: compile_translation(xml_path, binary_path, progress)[1],
+    load=load_translation,
+)
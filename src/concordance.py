@@ -0,0 +1,233 @@
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .cache import UNBOUNDED, SharedLRUCache
+from .logs import get_logger
+from .search import SearchEngine, SearchIndex, tokenize
+
+logger = get_logger(__name__)
+
+# Left out of top-N word lists unless asked for; they dominate every book
+COMMON_WORDS = frozenset(
+    "a an and are as at be but by for from had has have he her him his i in is it me my not of on or our shall she "
+    "so that the their them then there they this thou thy to unto us was we were which who will with ye you your".split()
+)
+
+
+class Occurrence(NamedTuple):
+    book: str
+    chapter: str
+    verse: str
+    text: str
+    count: int  # occurrences of the word in this verse
+
+
+class WordFrequency(NamedTuple):
+    word: str
+    total: int
+    books: List[Tuple[str, int]]  # (book, count) for every book containing the word, in translation order
+
+
+class Concordance:
+    """
+    Word counts for one translation, derived from its SearchIndex.
+
+    Terms are numbered in sorted order. Counts are kept in a term x book matrix stored row by
+    row in one flat array, so the frequencies of a word are a single slice and the frequencies
+    of a book are a strided slice. Verse lookups go straight to the index postings.
+    """
+    def __init__(self, index: SearchIndex, book_count: int) -> None:
+        """
+        :param index: The search index of the translation.
+        :param book_count: Number of books in the translation.
+        """
+        self.index = index
+        self.terms: List[str] = sorted(index.terms)
+        self.term_ids: Dict[str, int] = {term: term_id for term_id, term in enumerate(self.terms)}
+        self.book_count = book_count
+        self.book_counts = array("I", bytes(4 * len(self.terms) * self.book_count))  # term x book, row-major
+        self.totals = array("I")  # occurrences of every term in the whole translation
+        verse_book = array("I", map(index.chapter_book.__getitem__, index.verse_chapter))
+        for term_id, term in enumerate(self.terms):
+            docs, tfs, _ = index.terms[term]
+            row = term_id * self.book_count
+            for doc, tf in zip(docs, tfs):
+                self.book_counts[row + verse_book[doc]] += tf
+            self.totals.append(sum(tfs))
+
+    @property
+    def verse_chapter(self) -> array:
+        """Chapter index of every verse index."""
+        return self.index.verse_chapter
+
+    @property
+    def chapter_book(self) -> array:
+        """Book index of every chapter index."""
+        return self.index.chapter_book
+
+    def term_id(self, word: str) -> Optional[int]:
+        """Return the id of a word (matched like search terms), or None if it never occurs."""
+        tokens = tokenize(word)
+        return self.term_ids.get(tokens[0]) if len(tokens) == 1 else None
+
+    def book_row(self, term_id: int) -> array:
+        """Return the occurrence count of a term in every book."""
+        row = term_id * self.book_count
+        return self.book_counts[row:row + self.book_count]
+
+    def book_column(self, book_index: int) -> array:
+        """Return the occurrence count of every term in a book."""
+        return self.book_counts[book_index::self.book_count]
+
+    def verse_counts(self, term_id: int) -> Dict[int, int]:
+        """Return the occurrence count of a term in every verse containing it, keyed by verse index."""
+        docs, tfs, _ = self.index.terms[self.terms[term_id]]
+        return dict(zip(docs, tfs))
+
+    def top_terms(self, n: int, book_indices: Optional[Sequence[int]] = None,
+                  include_common: bool = False) -> List[Tuple[int, int]]:
+        """
+        Return the most frequent terms of a selection of books.
+
+        :param n: Number of terms to return.
+        :param book_indices: Books to count (default: the whole translation).
+        :param include_common: Keep the words in COMMON_WORDS.
+        :return: (term id, count) pairs, most frequent first.
+        """
+        if book_indices is None:
+            counts = self.totals
+        elif not book_indices:
+            return []
+        else:
+            columns = [self.book_column(book_index) for book_index in book_indices]
+            counts = columns[0] if len(columns) == 1 else array("I", map(sum, zip(*columns)))
+        candidates = (t for t in range(len(self.terms)) if counts[t] and (include_common or self.terms[t] not in COMMON_WORDS))
+        return [(t, counts[t]) for t in heapq.nlargest(n, candidates, key=counts.__getitem__)]
+
+
+class ConcordanceEngine:
+    """
+    Concordance lookups over the translations known to a Reader.
+
+    Concordances are derived from the search indexes of a SearchEngine on first use, so the
+    tokenizing, persistence and freshness checks are the index's.
+    """
+    def __init__(self, reader, search_engine: Optional[SearchEngine] = None) -> None:
+        """
+        :param reader: The Reader providing translations.
+        :param search_engine: The SearchEngine whose indexes are counted (defaults to a new one on reader).
+        """
+        self.reader = reader
+        self.search_engine = search_engine or SearchEngine(reader)
+        # Shared by every window's worker threads; each translation is counted at most once at a time
+        self._concordances = SharedLRUCache(UNBOUNDED)
+
+    def concordance_for(self, translation_str: str) -> Concordance:
+        """
+        Return the concordance of a translation, counting its search index as needed.
+        Threads asking for a translation that is being counted wait for that count.
+
+        :param translation_str: Name of the translation.
+        :return: The Concordance for the translation.
+        """
+        return self._concordances.get_or_load(translation_str, lambda: self._count(translation_str), lambda _: 1)
+
+    def _count(self, translation_str: str) -> Concordance:
+        index = self.search_engine.index_for(translation_str)
+        logger.info(f"Counting concordance for {translation_str}. . .")
+        return Concordance(index, self.reader.load_root(translation_str).book_count)
+
+    def invalidate(self, translation_str: str) -> None:
+        """Drop the loaded concordance of a translation; it is reloaded or rebuilt on next use."""
+        self._concordances.discard(translation_str)
+
+    def frequency(self, translation_str: str, word: str) -> WordFrequency:
+        """
+        Return how often a word occurs in a translation, in total and per book.
+
+        :param translation_str: Name of the translation.
+        :param word: The word to count (case-insensitive).
+        :return: The WordFrequency (a total of 0 if the word never occurs).
+        """
+        concordance = self.concordance_for(translation_str)
+        term_id = concordance.term_id(word)
+        if term_id is None:
+            return WordFrequency(word.strip().lower(), 0, [])
+        book_order = self.reader.load_root(translation_str).book_order
+        row = concordance.book_row(term_id)
+        return WordFrequency(concordance.terms[term_id], sum(row), [(book_order[index], count) for index, count in enumerate(row) if count])
+
+    def chapter_frequencies(self, translation_str: str, word: str, book: str) -> List[Tuple[str, int]]:
+        """
+        Return how often a word occurs in each chapter of a book.
+
+        :param translation_str: Name of the translation.
+        :param word: The word to count.
+        :param book: Book name.
+        :return: (chapter, count) for every chapter containing the word, in order.
+        """
+        concordance = self.concordance_for(translation_str)
+        term_id = concordance.term_id(word)
+        if term_id is None:
+            return []
+        translation = self.reader.load_root(translation_str)
+        chapters = translation.book_chapters(translation.find_book(book))
+        verse_chapter = concordance.verse_chapter
+        counts: Counter = Counter()
+        for verse, count in concordance.verse_counts(term_id).items():
+            if chapters.start <= verse_chapter[verse] < chapters.stop:
+                counts[verse_chapter[verse]] += count
+        return [(str(translation.chapter_number(index)), counts[index]) for index in sorted(counts)]
+
+    def occurrences(self, translation_str: str, word: str, book: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[Occurrence]:
+        """
+        Return the verses containing a word, in order.
+
+        :param translation_str: Name of the translation.
+        :param word: The word to find.
+        :param book: Restrict the occurrences to this book.
+        :param limit: Maximum number of verses returned.
+        :return: One Occurrence per verse.
+        """
+        concordance = self.concordance_for(translation_str)
+        term_id = concordance.term_id(word)
+        if term_id is None:
+            return []
+        translation = self.reader.load_root(translation_str)
+        verse_counts = concordance.verse_counts(term_id)
+        if book is not None:
+            chapters = translation.book_chapters(translation.find_book(book))
+            verse_counts = {verse: count for verse, count in verse_counts.items()
+                            if chapters.start <= concordance.verse_chapter[verse] < chapters.stop}
+        occurrences = []
+        for verse in sorted(verse_counts)[:limit]:
+            chapter_index = concordance.verse_chapter[verse]
+            occurrences.append(Occurrence(
+                translation.book_order[concordance.chapter_book[chapter_index]],
+                str(translation.chapter_number(chapter_index)),
+                str(translation.verse_number(verse)),
+                translation.verse_text(verse),
+                verse_counts[verse],
+            ))
+        return occurrences
+
+    def top_words(self, translation_str: str, n: int = 50, books: Optional[List[str]] = None,
+                  include_common: bool = False) -> List[Tuple[str, int]]:
+        """
+        Return the most frequent words of a translation or a selection of its books.
+
+        :param translation_str: Name of the translation.
+        :param n: Number of words to return.
+        :param books: Book names to count (default: the whole translation).
+        :param include_common: Keep articles, pronouns and other COMMON_WORDS.
+        :return: (word, count) pairs, most frequent first.
+        """
+        concordance = self.concordance_for(translation_str)
+        book_indices = None
+        if books is not None:
+            translation = self.reader.load_root(translation_str)
+            book_indices = [translation.find_book(book) for book in books]
+        return [(concordance.terms[term_id], count)
+                for term_id, count in concordance.top_terms(n, book_indices, include_common)]
@@ -1,10 +1,36 @@
-from PyQt5.QtCore import Qt, QSize, QModelIndex, QItemSelectionModel
-from PyQt5.QtGui import QStandardItemModel, QStandardItem, QKeyEvent
-from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5.QtCore import Qt, QSize, QModelIndex, QItemSelectionModel, QTimer, QEvent, QObject, pyqtSignal
+from PyQt5.QtGui import QCloseEvent, QFontDatabase, QKeyEvent
+from PyQt5.QtWidgets import QApplication, QMainWindow, QAction, QHeaderView, QTableView
+from PyQt5.QtWidgets import QDialog, QHBoxLayout, QInputDialog, QLineEdit, QPlainTextEdit, QPushButton, QTextBrowser, QVBoxLayout
 from PyQt5.QtWidgets import QStyleOptionViewItem, QStyledItemDelegate, QAbstractItemView, QListView, QListWidget,QListWidgetItem
 from .view import Ui_MainWindow
-from .reader import Reader
-from typing import List, Tuple, Optional
+from .books import canonical_name
+from .delegates import VerseDelegate
+from .concordance import ConcordanceEngine, Occurrence, WordFrequency
+from .compare import Comparison, compare_translations, diff_html
+from .models import ChapterModel, ParallelModel, PassageModel
+from .parallel import ParallelChapter, ParallelFetcher
+from .query import Query, QueryError
+from .quickjump import QuickJumpIndex, Suggestion
+from .reader import DEFAULT_BACKEND, Reader, RenderedChapter
+from .references import ReferenceParseError, parse_references
+from .search import SearchEngine, SearchResults
+from .workers import TaskRunner
+from . import tracing
+from .tracing import traced
+from .watcher import TranslationWatcher
+from contextlib import contextmanager
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+
+
+SEARCH_PAGE_SIZE = 50
+CONCORDANCE_LIMIT = 500  # Verses listed for one word on the concordance page
+TOP_WORDS = 50  # Words listed on the concordance page when no word is entered
+NAVIGATION_DELAY_MS = 120  # Idle time after the last book/chapter/verse change before the text is refreshed
+
+# Navigation levels; a pending change of a higher level makes lower level changes obsolete
+BOOK_LEVEL, CHAPTER_LEVEL, VERSE_LEVEL = range(3)
 
 
 def make_enumeration(list_: List[str]) -> List[Tuple[int, str]]:
@@ -16,19 +42,6 @@ def make_enumeration(list_: List[str]) -> List[Tuple[int, str]]:
     """
     return list(enumerate(list_))
 
-class WrappingDelegate(QStyledItemDelegate):
-    """
-        Adjusts the size hint for each item to allow wrapping.
-
-        :param option: Style option.
-        :param index: Model index.
-        :return: Adjusted QSize object.
-    """
-    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
-        size = super().sizeHint(option, index)
-        size.setHeight(size.height() * 2)  # Adjust as needed
-        return size
-
 class VerseItemDelegate(QStyledItemDelegate):
     """
         Reduces the height of each item for a more compact display.
@@ -41,30 +54,223 @@ class VerseItemDelegate(QStyledItemDelegate):
         size = super().sizeHint(option, index)
         return QSize(size.width(), max(18, size.height() - 6))
 
+class QuickJumpDialog(QDialog):
+    """
+    Small popup with a reference box whose suggestions update on every keystroke.
+    Up and Down move through the suggestions; Enter or a double click jumps to the selected one.
+    """
+    suggestionChosen = pyqtSignal(object)  # the chosen Suggestion
+
+    def __init__(self, index: QuickJumpIndex, parent: Optional[QMainWindow] = None) -> None:
+        """
+        :param index: Quick-jump index of the current translation.
+        """
+        super().__init__(parent)
+        self.index = index
+        self.setWindowTitle("Quick Jump")
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.resize(360, 280)
+        self.input = QLineEdit(self)
+        self.input.setPlaceholderText("e.g. jhn 3:16, 1 cor 13, revelation")
+        self.suggestions = QListWidget(self)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.input)
+        layout.addWidget(self.suggestions)
+        self.input.textEdited.connect(self.update_suggestions)
+        self.input.returnPressed.connect(self.choose)
+        self.suggestions.itemActivated.connect(self.choose)
+        self.input.installEventFilter(self)
+
+    def update_suggestions(self, text: str) -> None:
+        """Replace the suggestion list with the suggestions for the typed text."""
+        self.suggestions.clear()
+        for suggestion in self.index.suggest(text):
+            item = QListWidgetItem(suggestion.label)
+            item.setData(Qt.UserRole, suggestion)
+            self.suggestions.addItem(item)
+        self.suggestions.setCurrentRow(0)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self.input and event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            row = self.suggestions.currentRow() + (1 if event.key() == Qt.Key_Down else -1)
+            if 0 <= row < self.suggestions.count():
+                self.suggestions.setCurrentRow(row)
+            return True
+        return super().eventFilter(watched, event)
+
+    def choose(self, *args) -> None:
+        """Emit the selected suggestion and close."""
+        item = self.suggestions.currentItem()
+        if item is not None:
+            suggestion: Suggestion = item.data(Qt.UserRole)
+            self.suggestionChosen.emit(suggestion)
+            self.accept()
+
+
+class Library(QObject):
+    """
+    The Reader, engines and caches shared by a window and every window opened from it.
+
+    The translations directory is watched here, once for all windows: a change is reloaded a
+    single time and translationsReloaded then tells every window to update its translation list.
+    """
+    translationsReloaded = pyqtSignal(dict)  # translation -> 'added', 'changed' or 'removed'
+    reloadFailed = pyqtSignal(str)
+
+    def __init__(self, backend: str = DEFAULT_BACKEND) -> None:
+        """
+        :param backend: Storage backend of the translations (see reader.BACKENDS).
+        """
+        super().__init__()
+        self.reader = Reader(backend=backend)
+        self.search_engine = SearchEngine(self.reader)
+        self.concordance_engine = ConcordanceEngine(self.reader, self.search_engine)
+        self.parallel_fetcher = ParallelFetcher(self.reader)
+        self.quick_jump_indices: Dict[str, QuickJumpIndex] = {}
+        self.windows: List["Controller"] = []  # open windows sharing this library
+        self.pending_reload: Dict[str, str] = {}  # translation -> 'added', 'changed' or 'removed', until reloaded
+        self.tasks = TaskRunner(self)
+        self.translationWatcher = TranslationWatcher(self.reader.translations_dir, self)
+        self.translationWatcher.translationsChanged.connect(self.on_translations_changed)
+
+    def on_translations_changed(self, added: List[str], changed: List[str], removed: List[str]) -> None:
+        """
+        Reload the translation files that changed on disk in the background.
+
+        Changes that arrive while a reload is running are merged into the next one, so none is lost
+        when the running reload is superseded.
+
+        :param added: Translations whose file appeared.
+        :param changed: Translations whose file was modified.
+        :param removed: Translations whose file disappeared.
+        """
+        for name in added:
+            self.pending_reload[name] = "changed" if self.pending_reload.get(name) == "removed" else "added"
+        for name in changed:
+            self.pending_reload.setdefault(name, "changed")
+        for name in removed:
+            self.pending_reload[name] = "removed"
+        self.tasks.submit("reload", self.reload_translations, self.on_translations_reloaded, dict(self.pending_reload),
+                          on_error=self.reloadFailed.emit)
+
+    def reload_translations(self, changes: Dict[str, str]) -> Dict[str, str]:
+        """
+        Rebuild the stores of changed translations and drop everything cached for them (runs on a worker).
+        Other translations and their caches are left untouched.
+
+        :param changes: Translation -> 'added', 'changed' or 'removed'.
+        :return: The changes that were applied.
+        """
+        for name in changes:
+            self.reader.invalidate(name)
+            for cache in (self.search_engine, self.concordance_engine, self.parallel_fetcher):
+                cache.invalidate(name)
+        return changes
+
+    def on_translations_reloaded(self, changes: Dict[str, str]) -> None:
+        """
+        Forget the applied changes and tell every window about them.
+
+        :param changes: The changes applied by reload_translations.
+        """
+        for name, change in changes.items():
+            if self.pending_reload.get(name) == change:
+                del self.pending_reload[name]
+            self.quick_jump_indices.pop(name, None)
+        self.translationsReloaded.emit(changes)
+
+
 class Controller(QMainWindow, Ui_MainWindow):
     """Main Controller class handling Bible UI behavior and navigation."""
-    def __init__(self) -> None:
+    def __init__(self, backend: str = DEFAULT_BACKEND, source: Optional["Controller"] = None) -> None:
+        """
+        :param backend: Storage backend of the translations (see reader.BACKENDS).
+        :param source: Window opening this one; its Library (Reader, engines and translation watcher) is
+            shared instead of created, and this window starts at its translation and position.
+        """
         super().__init__()
         self.setupUi(self)
 
-        self.reader = Reader()
-        self.reader.set_root("NLT")
+        self.translation_name: Optional[str] = None
+        self.tasks = TaskRunner(self)
+        self.search_query = ""
+        self.search_page = 0
+        self.search_total = 0
+        self.library = Library(backend) if source is None else source.library
+        self.reader = self.library.reader
+        self.search_engine = self.library.search_engine
+        self.concordance_engine = self.library.concordance_engine
+        self.parallel_fetcher = self.library.parallel_fetcher
+        self.quick_jump_indices = self.library.quick_jump_indices
+        self.windows = self.library.windows
+        self.windows.append(self)
+        if source is not None:
+            self.setAttribute(Qt.WA_DeleteOnClose)
+        self.pending_position: Optional[Tuple[str, str, str]] = None
+        self.pending_navigation: Optional[Tuple[int, Callable[[], None]]] = None
+        self.navigating = False  # True while a navigation change cascades synchronously
+        self.navigationTimer = QTimer(self)
+        self.navigationTimer.setSingleShot(True)
+        self.navigationTimer.setInterval(NAVIGATION_DELAY_MS)
 
-        self.textAreaModel = QStandardItemModel()
+        self.textAreaModel = ChapterModel(self)
+        self.passageModel = PassageModel(self)
         self.textArea.setModel(self.textAreaModel)
 
         self.textArea.setSelectionMode(QAbstractItemView.SingleSelection)
         self.textArea.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.textArea.setViewMode(QListView.ListMode)
-        self.textArea.setWrapping(True)
+        self.textArea.setWrapping(False)  # rows span the viewport; the delegate wraps their text
         self.textArea.setWordWrap(True)
         self.textArea.setUniformItemSizes(False)
-        self.textArea.setItemDelegate(WrappingDelegate(self.textArea))
+        self.textArea.setLayoutMode(QListView.Batched)
+        self.textArea.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.textAreaDelegate = VerseDelegate(self.textArea)
+        self.textArea.setItemDelegate(self.textAreaDelegate)
+
+        self.parallelModel = ParallelModel(self)
+        self.parallelView = QTableView(self.centralwidget)
+        self.parallelView.setObjectName("parallelView")
+        self.parallelView.setModel(self.parallelModel)
+        self.parallelView.setWordWrap(True)
+        self.parallelView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.parallelView.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.parallelView.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.parallelView.hide()
+        self.gridLayout.addWidget(self.parallelView, 1, 1, 1, 1)
+
+        viewMenu = self.menubar.addMenu("View")
+        self.actionParallel = QAction("Parallel Translations", self)
+        self.actionParallel.setCheckable(True)
+        self.actionParallel.setShortcut("Ctrl+P")
+        viewMenu.addAction(self.actionParallel)
+        self.actionNewWindow = QAction("New Window", self)
+        self.actionNewWindow.setShortcut("Ctrl+Shift+N")
+        viewMenu.addAction(self.actionNewWindow)
+        self.actionPassage = QAction("Go to Passage...", self)
+        self.actionPassage.setShortcut("Ctrl+G")
+        viewMenu.addAction(self.actionPassage)
+        self.actionQuickJump = QAction("Quick Jump...", self)
+        self.actionQuickJump.setShortcut("Ctrl+L")
+        viewMenu.addAction(self.actionQuickJump)
+        self.actionCompare = QAction("Compare Translations...", self)
+        viewMenu.addAction(self.actionCompare)
+        self.actionTrace = QAction("Trace Timings...", self)
+        self.actionTrace.setVisible(tracing.is_enabled())
+        viewMenu.addAction(self.actionTrace)
 
         self.setUpActions()
 
         self.populate_translations()
-        self.listTranslations.setCurrentRow(0)
+        if source is not None and source.translation_name is not None:
+            self.pending_position = source.current_position()
+            items = self.listTranslations.findItems(source.translation_name, Qt.MatchExactly)
+        else:
+            items = []
+        if items:
+            self.listTranslations.setCurrentItem(items[0])
+        else:
+            self.listTranslations.setCurrentRow(0)  # also when the source's translation was just removed
         self.listTranslations.setFocus()
 
         self.show()
@@ -75,7 +281,24 @@ class Controller(QMainWindow, Ui_MainWindow):
         self.listTranslations.currentItemChanged.connect(self.on_translation_selected)
         self.listBooks.currentItemChanged.connect(self.on_book_selected)
         self.listChapters.currentItemChanged.connect(self.on_chapter_selected)
-        self.listVerses.currentItemChanged.connect(self.display_verse_text)
+        self.listVerses.currentItemChanged.connect(self.on_verse_selected)
+        self.navigationTimer.timeout.connect(self.apply_navigation)
+        self.searchInput.returnPressed.connect(self.run_search)
+        self.listSearchResults.currentItemChanged.connect(self.on_search_result_selected)
+        self.listSearchResults.verticalScrollBar().valueChanged.connect(self.on_search_results_scrolled)
+        self.concordanceInput.returnPressed.connect(self.run_concordance)
+        self.listConcordance.currentItemChanged.connect(self.on_concordance_item_selected)
+        self.listConcordance.itemActivated.connect(self.on_concordance_word_activated)
+        self.tasks.busyChanged.connect(self.on_busy_changed)
+        self.actionParallel.toggled.connect(self.set_parallel_mode)
+        self.actionTrace.triggered.connect(self.show_trace_timings)
+        self.actionPassage.triggered.connect(self.open_passage)
+        self.actionQuickJump.triggered.connect(self.open_quick_jump)
+        self.actionNewWindow.triggered.connect(self.open_new_window)
+        self.actionCompare.triggered.connect(self.open_comparison)
+        self.listTranslations.itemChanged.connect(self.on_translation_checked)
+        self.library.translationsReloaded.connect(self.on_translations_reloaded)
+        self.library.reloadFailed.connect(lambda message: self.statusbar.showMessage(f"Reloading translations failed: {message}"))
         self.setFocusPolicy(Qt.StrongFocus)
         self.setFocus()
 
@@ -108,11 +331,12 @@ class Controller(QMainWindow, Ui_MainWindow):
                 current_index = selection_model.currentIndex()
                 row = current_index.row()
 
+                model = focused_widget.model()
                 if event.key() == Qt.Key_Up and row > 0:
-                    next_index = self.textAreaModel.index(row - 1, 0)
+                    next_index = model.index(row - 1, 0)
                     selection_model.setCurrentIndex(next_index, QItemSelectionModel.SelectCurrent)
-                elif event.key() == Qt.Key_Down and row < self.textAreaModel.rowCount() - 1:
-                    next_index = self.textAreaModel.index(row + 1, 0)
+                elif event.key() == Qt.Key_Down and row < model.rowCount() - 1:
+                    next_index = model.index(row + 1, 0)
                     selection_model.setCurrentIndex(next_index, QItemSelectionModel.SelectCurrent)
 
         else:
@@ -134,6 +358,7 @@ class Controller(QMainWindow, Ui_MainWindow):
         for _, item in self.translations:
             self.listTranslations.addItem(item)
 
+    @traced
     def on_translation_selected(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
         """
         Handle translation selection and populate books accordingly.
@@ -142,28 +367,183 @@ class Controller(QMainWindow, Ui_MainWindow):
         :param previous: Previously selected item.
         """
         if current:
-            self.reader.set_root(current.text())
+            translation = current.text()
+            if self.listBooks.currentItem() and self.listChapters.currentItem():
+                self.pending_position = self.current_position()
+            self.cancel_navigation()
             self.listBooks.clear()
             self.listChapters.clear()
             self.listVerses.clear()
             self.textAreaModel.clear()
-            self.populate_books()
-            self.listBooks.setCurrentRow(0)
+            self.listSearchResults.clear()
+            self.search_total = 0
+            self.tasks.cancel("search")
+            self.listConcordance.clear()
+            self.labelConcordanceStats.clear()
+            self.tasks.cancel("concordance")
+            self.tasks.cancel("text")
+            self.tasks.submit("translation", self.reader.load_root, lambda _: self.on_translation_loaded(translation),
+                              translation, on_error=self.show_text_error)
+
+    def current_position(self) -> Optional[Tuple[str, str, str]]:
+        """Return the (book, chapter, verse) selected in the navigation lists, or None if no chapter is selected."""
+        if not (self.listBooks.currentItem() and self.listChapters.currentItem()):
+            return None
+        verse_item = self.listVerses.currentItem()
+        return (self.listBooks.currentItem().text(), self.listChapters.currentItem().text(),
+                verse_item.text() if verse_item else "1")
+
+    @traced
+    def open_new_window(self) -> "Controller":
+        """
+        Open another reading window at the current translation and position.
+
+        The window shares this window's Reader, so translations already open (memory-mapped
+        compiled stores) and every cache are reused and nothing is loaded again.
+        """
+        return Controller(source=self)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        if self in self.windows:
+            self.windows.remove(self)
+        super().closeEvent(event)
+
+    @traced
+    def on_translation_loaded(self, translation: str) -> None:
+        """
+        Make a translation loaded by a worker current and populate its books.
+
+        :param translation: Name of the loaded translation.
+        """
+        self.reader.set_root(translation)
+        self.translation_name = translation
+        self.populate_books()
+        position, self.pending_position = self.pending_position, None
+        with self.immediate_navigation():
+            if position:
+                # Keep the reading position when switching translations, matching books by canonical name
+                book_key = canonical_name(position[0]) or position[0]
+                for _, book in self.books:
+                    if (canonical_name(book) or book) == book_key:
+                        self.jump_to(book, position[1], position[2])
+                        break
+            if self.listBooks.currentRow() < 0:
+                self.listBooks.setCurrentRow(0)
+
+    def on_translations_reloaded(self, changes: Dict[str, str]) -> None:
+        """
+        Update the translation list in place after a reload, keeping the current translation and position.
+
+        :param changes: The changes applied by Library.reload_translations.
+        """
+        current = self.listTranslations.currentItem()
+        current_name = current.text() if current else None
+        self.listTranslations.blockSignals(True)
+        for name, change in sorted(changes.items()):
+            items = self.listTranslations.findItems(name, Qt.MatchExactly)
+            if change == "removed":
+                for item in items:
+                    self.listTranslations.takeItem(self.listTranslations.row(item))
+            elif not items:
+                item = QListWidgetItem(name)
+                if self.actionParallel.isChecked():
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Unchecked)
+                self.listTranslations.addItem(item)
+        self.listTranslations.blockSignals(False)
+        self.translations = make_enumeration([self.listTranslations.item(row).text()
+                                              for row in range(self.listTranslations.count())])
+        self.statusbar.showMessage("Reloaded " + ", ".join(f"{name} ({change})" for name, change in sorted(changes.items())),
+                                   5000)
+
+        if current_name in changes:
+            if changes[current_name] == "removed":
+                self.translation_name = None
+                if self.listTranslations.count():
+                    self.listTranslations.blockSignals(True)
+                    self.listTranslations.setCurrentRow(0)
+                    self.listTranslations.blockSignals(False)
+                    self.on_translation_selected(self.listTranslations.currentItem(), None)
+                else:
+                    for list_widget in (self.listBooks, self.listChapters, self.listVerses):
+                        list_widget.clear()
+                    self.textAreaModel.clear()
+            else:
+                self.on_translation_selected(current, None)  # reopen it at the same book, chapter and verse
+        elif self.actionParallel.isChecked() and changes.keys() & set(self.parallel_translations()):
+            self.display_verse_text(self.listVerses.currentItem())
+
+    def on_busy_changed(self, busy: bool) -> None:
+        """
+        Show a loading indicator in the status bar while reader work is running.
+
+        :param busy: True while background tasks are pending.
+        """
+        if busy:
+            self.statusbar.showMessage("Loading. . .")
+        else:
+            self.statusbar.clearMessage()
 
     def populate_books(self) -> None:
         """Load books into sidebar menu"""
-        self.books = make_enumeration(self.reader.get_books())
+        self.books = make_enumeration(self.reader.get_books(self.translation_name))
         self.listBooks.clear()
         for _, book in self.books:
             self.listBooks.addItem(book)
 
+    @contextmanager
+    def immediate_navigation(self) -> Iterator[None]:
+        """Apply navigation changes made inside the block right away instead of coalescing them."""
+        navigating, self.navigating = self.navigating, True
+        try:
+            yield
+        finally:
+            self.navigating = navigating
+
+    def schedule_navigation(self, level: int, handler: Callable[[], None]) -> None:
+        """
+        Run a navigation handler once the selection has been idle for NAVIGATION_DELAY_MS.
+        The list highlight moves immediately; repeated changes (e.g. holding an arrow key) only
+        repopulate and render for the final selection. Changes made by a handler cascade at once.
+
+        :param level: BOOK_LEVEL, CHAPTER_LEVEL or VERSE_LEVEL.
+        :param handler: Callable reading the final selection from the lists.
+        """
+        if self.navigating:
+            handler()
+            return
+        if self.pending_navigation is not None and self.pending_navigation[0] < level:
+            return  # the pending higher level change repopulates this list anyway
+        self.pending_navigation = (level, handler)
+        self.navigationTimer.start()
+
+    def apply_navigation(self) -> None:
+        """Run the pending navigation handler."""
+        self.navigationTimer.stop()
+        pending, self.pending_navigation = self.pending_navigation, None
+        if pending is not None:
+            with self.immediate_navigation():
+                pending[1]()
+
+    def cancel_navigation(self) -> None:
+        """Drop a pending navigation change (e.g. when the lists are rebuilt)."""
+        self.navigationTimer.stop()
+        self.pending_navigation = None
+
     def on_book_selected(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
         """
-        Handle book selection and populate chapters.
+        Handle book selection; chapters are populated once the selection settles.
 
         :param current: Currently selected item.
         :param previous: Previously selected item.
         """
+        if current:
+            self.schedule_navigation(BOOK_LEVEL, self.show_book)
+
+    @traced
+    def show_book(self) -> None:
+        """Populate the chapters of the selected book and select its first chapter."""
+        current = self.listBooks.currentItem()
         if current:
             self.book_name = current.text()
             self.listChapters.clear()
@@ -178,7 +558,7 @@ class Controller(QMainWindow, Ui_MainWindow):
 
         :param book_name: Name of the selected book.
         """
-        self.chapters = make_enumeration(self.reader.get_chapters(book_name))
+        self.chapters = make_enumeration(self.reader.get_chapters(book_name, self.translation_name))
         self.chapter_number = self.chapters[0][1] if self.chapters else "1"
 
         for _, chapter in self.chapters:
@@ -186,11 +566,18 @@ class Controller(QMainWindow, Ui_MainWindow):
 
     def on_chapter_selected(self, current:Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
         """
-        Handle chapter selection and populate verses.
+        Handle chapter selection; verses are populated once the selection settles.
 
         :param current: Currently selected item.
         :param previous: Previously selected item.
         """
+        if current:
+            self.schedule_navigation(CHAPTER_LEVEL, self.show_chapter)
+
+    @traced
+    def show_chapter(self) -> None:
+        """Populate the verses of the selected chapter and select its first verse."""
+        current = self.listChapters.currentItem()
         if current:
             self.chapter_number = current.text()
             self.listVerses.clear()
@@ -205,13 +592,25 @@ class Controller(QMainWindow, Ui_MainWindow):
         :param book: Name of the selected book
         :param chapter: Selected chapter number
         """
-        self.verses = make_enumeration(self.reader.get_verses(book, chapter))
+        self.verses = make_enumeration(self.reader.get_verses(book, chapter, self.translation_name))
         for _, verse in self.verses:
             self.listVerses.addItem(verse)
 
+    def on_verse_selected(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
+        """
+        Handle verse selection; the text is shown once the selection settles.
+
+        :param current: Currently selected item.
+        :param previous: Previously selected item.
+        """
+        if current:
+            self.schedule_navigation(VERSE_LEVEL, lambda: self.display_verse_text(self.listVerses.currentItem()))
+
+    @traced
     def display_verse_text(self, item: QListWidgetItem) -> None:
         """
-        Displays the verse text starting from the selected verse to the end of the chapter.
+        Displays the chapter of the selected verse and scrolls to the verse.
+        Selecting another verse of the chapter already shown only scrolls.
 
         :param item: QListWidgetItem containing the selected verse number.
         """
@@ -220,24 +619,437 @@ class Controller(QMainWindow, Ui_MainWindow):
             book = self.listBooks.currentItem().text() if self.listBooks.currentItem() else self.books[0][1]
             chapter = self.listChapters.currentItem().text() if self.listChapters.currentItem() else self.chapters[0][1]
 
-            verses = self.reader.get_chapter_text(book, chapter, verse_number)
+            if self.actionParallel.isChecked():
+                self.tasks.cancel("text")
+                self.show_parallel(book, chapter, verse_number)
+                return
 
-            self.textAreaModel.clear()
+            key = (self.translation_name, book, chapter)
+            rendered = None if self.textAreaModel.chapter_key() == key else self.reader.cached_chapter(*key[1:], key[0])
+        except Exception as e:
+            self.show_text_error(str(e))
+            return
 
-            for verse_text, is_red, is_title in verses:
-                item = QStandardItem(verse_text)
+        if self.textAreaModel.chapter_key() == key or rendered is not None:
+            self.tasks.cancel("text")
+            self.show_rendered_chapter(key, verse_number, rendered)
+        else:
+            # Rendering reads the store (and may wait for a compile), so it never runs on the GUI thread
+            self.tasks.submit("text", self.reader.render_chapter,
+                              lambda chapter: self.show_rendered_chapter(key, verse_number, chapter),
+                              book, chapter, self.translation_name, on_error=self.show_text_error)
 
-                if is_red:
-                    item.setForeground(Qt.red)
-                elif is_title:
-                    font = item.font()
-                    font.setBold(True)
-                    item.setFont(font)
+    def show_rendered_chapter(self, key: Tuple[str, str, str], verse_number: int,
+                              rendered: Optional[RenderedChapter]) -> None:
+        """
+        Show a rendered chapter in the text area and scroll to a verse.
 
-                item.setTextAlignment(Qt.AlignLeft | Qt.AlignTop)
-                self.textAreaModel.appendRow(item)
+        :param key: (translation, book, chapter) of the chapter.
+        :param verse_number: Verse to scroll to.
+        :param rendered: The rendered chapter, or None to keep the chapter already shown.
+        """
+        self.show_chapter_model()
+        if rendered is not None:
+            self.textAreaModel.set_chapter(*key, rendered)
+            self.reader.prefetch_neighbors(key[1], key[2], key[0])
+        row = self.textAreaModel.row_for_verse(verse_number)
+        if row >= 0:
+            self.textArea.scrollTo(self.textAreaModel.index(row, 0), QAbstractItemView.PositionAtTop)
+
+    def show_text_error(self, message: str) -> None:
+        """
+        Replace the text area contents with an error message.
+
+        :param message: Error description.
+        """
+        self.show_chapter_model()
+        self.textAreaModel.set_message(f"Error displaying verse: {message}")
+
+    def show_chapter_model(self) -> None:
+        """Switch the text area back from a passage to the chapter selected in the sidebar."""
+        if self.textArea.model() is not self.textAreaModel:
+            self.passageModel.clear()
+            self.textArea.setModel(self.textAreaModel)
+
+    def open_passage(self) -> None:
+        """Ask for references (e.g. 'Gen 1:1-3:24; Ps 23') and show them in the text area."""
+        text, accepted = QInputDialog.getText(self, "Go to Passage", "References:")
+        if accepted and text.strip():
+            self.show_passage(text.strip())
+
+    @traced
+    def show_passage(self, text: str) -> None:
+        """
+        Show a passage that may span chapters and books. Rows are read lazily as the view scrolls,
+        so whole books display immediately.
+
+        :param text: References such as 'Gen 1:1-3:24' or 'Romans'.
+        """
+        if self.translation_name is None:
+            return
+        self.tasks.cancel("text")
+        try:
+            query = Query(self.reader, self.translation_name)
+            entries = [query.entries(reference) for reference in parse_references(text)]
+        except (ReferenceParseError, QueryError) as e:
+            self.statusbar.showMessage(str(e), 5000)
+            return
+        self.actionParallel.setChecked(False)
+        self.passageModel.set_passage(chain.from_iterable(entries))
+        self.textArea.setModel(self.passageModel)
+        self.textArea.scrollToTop()
+
+    @traced
+    def run_search(self) -> None:
+        """Run the query typed in the search box against the current translation."""
+        self.search_query = self.searchInput.text().strip()
+        self.search_page = 0
+        self.search_total = 0
+        self.listSearchResults.clear()
+        if self.search_query:
+            self.load_search_page()
+
+    def load_search_page(self) -> None:
+        """Fetch the next page of results for the current query on a worker."""
+        if self.translation_name is None:
+            return
+        self.tasks.submit("search", self.search_engine.search, self.append_search_results,
+                          self.translation_name, self.search_query, page=self.search_page + 1, page_size=SEARCH_PAGE_SIZE,
+                          on_error=lambda message: self.statusbar.showMessage(f"Search failed: {message}"))
+
+    @traced
+    def append_search_results(self, results: SearchResults) -> None:
+        """
+        Append a page of search results to the results list.
+
+        :param results: Page of results returned by the search engine.
+        """
+        self.search_page = results.page
+        self.search_total = results.total
+        for hit in results.hits:
+            item = QListWidgetItem(f"{hit.book} {hit.chapter}:{hit.verse} — {hit.text}")
+            item.setData(Qt.UserRole, (hit.book, hit.chapter, hit.verse))
+            self.listSearchResults.addItem(item)
+        self.statusbar.showMessage(f"{self.search_total} results for {self.search_query}")
+
+    def on_search_results_scrolled(self, value: int) -> None:
+        """
+        Load the next page of results when the results list is scrolled to the bottom.
+
+        :param value: New scrollbar position.
+        """
+        scrollbar = self.listSearchResults.verticalScrollBar()
+        if (value == scrollbar.maximum() and self.listSearchResults.count() < self.search_total
+                and not self.tasks.is_pending("search")):
+            self.load_search_page()
+
+    def on_search_result_selected(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]) -> None:
+        """
+        Jump to the verse of the selected search result.
+
+        :param current: Currently selected item.
+        :param previous: Previously selected item.
+        """
+        if current:
+            self.jump_to(*current.data(Qt.UserRole))
+
+    @traced
+    def run_concordance(self) -> None:
+        """
+        Look up the word typed on the concordance page, or list the most frequent words of the
+        current book when the box is empty.
+        """
+        if self.translation_name is None:
+            return
+        word = self.concordanceInput.text().strip()
+        self.listConcordance.clear()
+        self.labelConcordanceStats.clear()
+        on_error = lambda message: self.statusbar.showMessage(f"Concordance failed: {message}")
+        engine, translation = self.concordance_engine, self.translation_name
+        if word:
+            self.tasks.submit("concordance",
+                              lambda: (engine.frequency(translation, word),
+                                       engine.occurrences(translation, word, limit=CONCORDANCE_LIMIT)),
+                              lambda result: self.show_concordance(*result), on_error=on_error)
+        else:
+            book = self.listBooks.currentItem().text() if self.listBooks.currentItem() else None
+            self.tasks.submit("concordance", engine.top_words, lambda words: self.show_top_words(book, words),
+                              translation, TOP_WORDS, [book] if book else None, on_error=on_error)
+
+    def show_concordance(self, frequency: WordFrequency, occurrences: List[Occurrence]) -> None:
+        """
+        List the verses containing a word, with its frequency per book above them.
+
+        :param frequency: Counts of the word in the translation.
+        :param occurrences: The first CONCORDANCE_LIMIT verses containing it.
+        """
+        if not frequency.total:
+            self.labelConcordanceStats.setText(f"'{frequency.word}' does not occur in {self.translation_name}")
+            return
+        books = sorted(frequency.books, key=lambda item: -item[1])
+        self.labelConcordanceStats.setText(
+            f"{frequency.total} occurrences of '{frequency.word}' in {len(frequency.books)} books. Most in: "
+            + ", ".join(f"{book} ({count})" for book, count in books[:5])
+        )
+        for occurrence in occurrences:
+            count = f" ×{occurrence.count}" if occurrence.count > 1 else ""
+            item = QListWidgetItem(f"{occurrence.book} {occurrence.chapter}:{occurrence.verse}{count} — {occurrence.text}")
+            item.setData(Qt.UserRole, (occurrence.book, occurrence.chapter, occurrence.verse))
+            self.listConcordance.addItem(item)
+        if len(occurrences) == CONCORDANCE_LIMIT:
+            self.statusbar.showMessage(f"Showing the first {CONCORDANCE_LIMIT} verses for '{frequency.word}'", 5000)
+
+    def show_top_words(self, book: Optional[str], words: List[Tuple[str, int]]) -> None:
+        """
+        List the most frequent words of a book; activating one looks it up.
+
+        :param book: The book counted, or None for the whole translation.
+        :param words: (word, count) pairs, most frequent first.
+        """
+        self.labelConcordanceStats.setText(f"Most frequent words in {book or self.translation_name}")
+        for word, count in words:
+            item = QListWidgetItem(f"{word} ({count})")
+            item.setData(Qt.UserRole, word)
+            self.listConcordance.addItem(item)
+
+    def on_concordance_item_selected(self, current: Optional[QListWidgetItem],
+                                     previous: Optional[QListWidgetItem]) -> None:
+        """
+        Jump to the verse of the selected occurrence.
+
+        :param current: Currently selected item.
+        :param previous: Previously selected item.
+        """
+        if current and isinstance(current.data(Qt.UserRole), tuple):
+            self.jump_to(*current.data(Qt.UserRole))
+
+    def on_concordance_word_activated(self, item: QListWidgetItem) -> None:
+        """
+        Look up a word activated in the top words list.
+
+        :param item: The activated item.
+        """
+        if isinstance(item.data(Qt.UserRole), str):
+            self.concordanceInput.setText(item.data(Qt.UserRole))
+            self.run_concordance()
+
+    def jump_to(self, book: str, chapter: str, verse: str) -> None:
+        """
+        Select a book, chapter and verse in the navigation lists.
+
+        :param book: Book name.
+        :param chapter: Chapter number.
+        :param verse: Verse number.
+        """
+        self.navigate_to(book, chapter, verse)
+
+    @traced
+    def navigate_to(self, book: str, chapter: str, verse: str) -> bool:
+        """
+        Move the navigation lists to a verse in a single step and show it.
+
+        Unlike selecting the items one after another, the lists are updated with their signals
+        blocked: the chapters are only repopulated when the book changes, the verses only when the
+        chapter changes, and the text is rendered once for the final position.
+
+        :param book: Book name.
+        :param chapter: Chapter number.
+        :param verse: Verse number; the first verse is selected if the chapter has no such verse.
+        :return: False (and nothing changes) if the book or chapter does not exist.
+        """
+        book_items = self.listBooks.findItems(book, Qt.MatchExactly)
+        if not book_items:
+            return False
+        book_changed = self.listBooks.currentItem() is not book_items[0]
+        if chapter not in (self.reader.get_chapters(book, self.translation_name) if book_changed else [c for _, c in self.chapters]):
+            return False
+
+        self.cancel_navigation()
+        lists = (self.listBooks, self.listChapters, self.listVerses)
+        for list_widget in lists:
+            list_widget.blockSignals(True)
+        try:
+            if book_changed:
+                self.listBooks.setCurrentItem(book_items[0])
+                self.book_name = book
+                self.listChapters.clear()
+                self.populate_chapters(book)
+            chapter_item = self.listChapters.findItems(chapter, Qt.MatchExactly)[0]
+            if book_changed or self.listChapters.currentItem() is not chapter_item:
+                self.listChapters.setCurrentItem(chapter_item)
+                self.chapter_number = chapter
+                self.listVerses.clear()
+                self.populate_verses(book, chapter)
+            verse_items = self.listVerses.findItems(verse, Qt.MatchExactly)
+            if verse_items:
+                self.listVerses.setCurrentItem(verse_items[0])
+            else:
+                self.listVerses.setCurrentRow(0)
+        finally:
+            for list_widget in lists:
+                list_widget.blockSignals(False)
+        for list_widget in lists:
+            if list_widget.currentItem() is not None:
+                list_widget.scrollToItem(list_widget.currentItem())
+        self.display_verse_text(self.listVerses.currentItem())
+        return True
+
+    def quick_jump_index(self, translation_str: str) -> QuickJumpIndex:
+        """Return the quick-jump index of a translation, building it on first use."""
+        index = self.quick_jump_indices.get(translation_str)
+        if index is None:
+            index = self.quick_jump_indices[translation_str] = QuickJumpIndex.for_translation(self.reader, translation_str)
+        return index
+
+    def open_quick_jump(self) -> None:
+        """Open the quick-jump box for the current translation."""
+        if self.translation_name is None:
+            return
+        dialog = QuickJumpDialog(self.quick_jump_index(self.translation_name), self)
+        dialog.suggestionChosen.connect(
+            lambda suggestion: self.navigate_to(suggestion.book, str(suggestion.chapter or 1), str(suggestion.verse or 1)))
+        dialog.show()
+
+    def set_parallel_mode(self, enabled: bool) -> None:
+        """
+        Switch between the single translation text view and the parallel translations table.
+        In parallel mode every translation gets a checkbox; checked ones are shown next to the current one.
+
+        :param enabled: True to show translations side by side.
+        """
+        self.listTranslations.blockSignals(True)
+        for row in range(self.listTranslations.count()):
+            item = self.listTranslations.item(row)
+            if enabled:
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Checked if item is self.listTranslations.currentItem() else Qt.Unchecked)
+            else:
+                item.setFlags(item.flags() & ~Qt.ItemIsUserCheckable)
+                item.setData(Qt.CheckStateRole, None)
+        self.listTranslations.blockSignals(False)
+
+        self.textArea.setVisible(not enabled)
+        self.parallelView.setVisible(enabled)
+        if not enabled:
+            self.tasks.cancel("parallel")
+            self.parallelModel.clear()
+        self.display_verse_text(self.listVerses.currentItem())
+
+    def parallel_translations(self) -> List[str]:
+        """Return the translations shown in parallel mode: the current one first, then the checked ones."""
+        translations = [self.translation_name] if self.translation_name else []
+        for row in range(self.listTranslations.count()):
+            item = self.listTranslations.item(row)
+            if item.checkState() == Qt.Checked and item.text() not in translations:
+                translations.append(item.text())
+        return translations
+
+    def on_translation_checked(self, item: QListWidgetItem) -> None:
+        """
+        Refresh the parallel table when a translation is checked or unchecked.
+
+        :param item: The translation item whose check state changed.
+        """
+        if self.actionParallel.isChecked():
+            self.display_verse_text(self.listVerses.currentItem())
+
+    @traced
+    def show_parallel(self, book: str, chapter: str, verse_number: int) -> None:
+        """
+        Fetch a chapter from all parallel translations on a worker and show it aligned by verse.
+
+        :param book: Book name in the current translation.
+        :param chapter: Chapter number.
+        :param verse_number: Verse to scroll to.
+        """
+        self.tasks.submit("parallel", self.parallel_fetcher.fetch_chapter,
+                          lambda parallel_chapter: self.render_parallel(parallel_chapter, verse_number),
+                          self.parallel_translations(), book, chapter,
+                          on_error=lambda message: self.statusbar.showMessage(f"Parallel view failed: {message}"))
+
+    @traced
+    def render_parallel(self, parallel_chapter: ParallelChapter, verse_number: int) -> None:
+        """
+        Show an aligned chapter in the parallel table and scroll every column to a verse.
+
+        :param parallel_chapter: Chapter aligned across translations.
+        :param verse_number: Verse to scroll to.
+        """
+        self.parallelModel.set_chapter(parallel_chapter)
+        row = self.parallelModel.row_for_verse(verse_number)
+        if row >= 0:
+            self.parallelView.scrollTo(self.parallelModel.index(row, 0), QAbstractItemView.PositionAtTop)
+
+    def show_trace_timings(self) -> None:
+        """Show the traced operation timings in a debug dialog (View menu, only when tracing is enabled)."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Trace Timings")
+        dialog.resize(900, 400)
+        text = QPlainTextEdit(dialog)
+        text.setReadOnly(True)
+        text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        text.setPlainText(tracing.tracer.report())
+        refresh = QPushButton("Refresh", dialog)
+        refresh.clicked.connect(lambda: text.setPlainText(tracing.tracer.report()))
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(text)
+        layout.addWidget(refresh)
+        dialog.show()
+
+    def open_comparison(self) -> None:
+        """Ask for a translation to compare with the current one and compare them in the background."""
+        others = [name for _, name in self.translations if name != self.translation_name]
+        if self.translation_name is None or not others:
+            return
+        other, accepted = QInputDialog.getItem(self, "Compare Translations",
+                                               f"Compare {self.translation_name} with:", others, 0, False)
+        if accepted:
+            self.statusbar.showMessage(f"Comparing {self.translation_name} with {other}. . .")
+            self.tasks.submit("compare", compare_translations, self.show_comparison, self.reader,
+                              self.translation_name, other,
+                              on_error=lambda message: self.statusbar.showMessage(f"Comparison failed: {message}"))
+
+    def show_comparison(self, comparison: Comparison) -> None:
+        """
+        Show a translation comparison: differing verses on the left, the highlighted word diff on the right.
+        Double-clicking a verse jumps to it.
+
+        :param comparison: Result of compare_translations.
+        """
+        summary = comparison.summary()
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"{comparison.left} / {comparison.right}: {summary['changed']} changed, "
+                              f"{summary['missing']} missing, {summary['extra']} extra "
+                              f"({summary['similarity']:.1%} similar)")
+        dialog.resize(1000, 600)
+        verses = QListWidget(dialog)
+        details = QTextBrowser(dialog)
+        for book in comparison.books:
+            for diff in book.changed:
+                item = QListWidgetItem(f"{diff.reference}  {diff.similarity:.0%}")
+                item.setData(Qt.UserRole, (diff.key, diff_html(diff)))
+                verses.addItem(item)
+            for label, keys in (("missing", book.missing), ("extra", book.extra)):
+                for key in keys:
+                    item = QListWidgetItem(f"{key[0]} {key[1]}:{key[2]}  {label}")
+                    item.setData(Qt.UserRole, (key, f"<i>Only in {comparison.left if label == 'missing' else comparison.right}</i>"))
+                    verses.addItem(item)
+        verses.currentItemChanged.connect(lambda current, previous: details.setHtml(current.data(Qt.UserRole)[1]) if current else None)
+        verses.itemDoubleClicked.connect(lambda item: self.jump_to_key(item.data(Qt.UserRole)[0]))
+        layout = QHBoxLayout(dialog)
+        layout.addWidget(verses, 1)
+        layout.addWidget(details, 2)
+        self.statusbar.clearMessage()
+        dialog.show()
+
+    def jump_to_key(self, key: Tuple[str, int, int]) -> None:
+        """
+        Jump to a verse given by canonical (book, chapter, verse) key in the current translation.
+
+        :param key: Canonical verse key.
+        """
+        for _, book in self.books:
+            if (canonical_name(book) or book) == key[0]:
+                self.jump_to(book, str(key[1]), str(key[2]))
+                return
 
-        except Exception as e:
-            self.textAreaModel.clear()
-            error_item = QStandardItem(f"Error displaying verse: {e}")
-            self.textAreaModel.appendRow(error_item)
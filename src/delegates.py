@@ -0,0 +1,154 @@
+from math import ceil
+from typing import Dict, Hashable, List, Tuple
+from PyQt5.QtCore import Qt, QEvent, QModelIndex, QObject, QPersistentModelIndex, QPointF, QSize, QTimer
+from PyQt5.QtGui import QFont, QFontMetricsF, QPainter, QTextLayout, QTextOption
+from PyQt5.QtWidgets import QAbstractItemView, QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from .cache import LRUCache
+from .logs import get_logger
+from .tracing import traced
+
+logger = get_logger(__name__)
+
+LAYOUT_CACHE_SIZE = 2048  # Text layouts kept, one per (text, width, font)
+RELAYOUT_DELAY_MS = 60  # Idle time after the last viewport resize before rows are laid out at the new width
+H_MARGIN = 6
+V_MARGIN = 4
+
+
+class VerseDelegate(QStyledItemDelegate):
+    """
+    Paints wrapped verse text from cached QTextLayouts and sizes every row to its real wrapped height.
+
+    Layouts are cached by (text, width, font), so repaints and returning to a chapter never lay
+    the text out again. Rows without a layout at the current width get an estimated height from
+    the font metrics; they are laid out when first painted, and once the paint is over the view
+    is told which rows have a real height that differs. After a resize only the rows on screen
+    are laid out at the new width.
+    """
+    def __init__(self, view: QAbstractItemView) -> None:
+        """
+        :param view: The view using the delegate; its viewport width is the wrapping width.
+        """
+        super().__init__(view)
+        self.view = view
+        self._viewport = view.viewport()  # kept, so events arriving while the view is destroyed never touch it
+        self._layouts = LRUCache(LAYOUT_CACHE_SIZE)
+        self._width = self._viewport_width()
+        self._relayoutTimer = QTimer(self)
+        self._relayoutTimer.setSingleShot(True)
+        self._relayoutTimer.setInterval(RELAYOUT_DELAY_MS)
+        self._relayoutTimer.timeout.connect(self.relayout)
+        self._misestimated: List[QPersistentModelIndex] = []  # rows whose size hint changes after the paint
+        self._viewport.installEventFilter(self)
+        view.destroyed.connect(self._relayoutTimer.stop)
+
+    def _viewport_width(self) -> int:
+        return max(self._viewport.width() - 2 * H_MARGIN, 50)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return the layout cache counters (loads are layouts computed)."""
+        return self._layouts.stats()
+
+    def _text_and_font(self, option: QStyleOptionViewItem, index: QModelIndex) -> Tuple[str, QFont]:
+        font = index.data(Qt.FontRole)
+        return index.data(Qt.DisplayRole) or "", QFont(font) if font is not None else option.font
+
+    def _key(self, text: str, font: QFont) -> Hashable:
+        return text, self._width, font.key()
+
+    @traced
+    def _build_layout(self, text: str, font: QFont, width: int) -> QTextLayout:
+        layout = QTextLayout(text, font)
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(text_option)
+        layout.setCacheEnabled(True)
+        layout.beginLayout()
+        height = 0.0
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(width)
+            line.setPosition(QPointF(0, height))
+            height += line.height()
+        layout.endLayout()
+        return layout
+
+    def layout(self, text: str, font: QFont) -> QTextLayout:
+        """Return the layout of a text at the current width, from the cache when possible."""
+        return self._layouts.get_or_load(self._key(text, font), lambda: self._build_layout(text, font, self._width),
+                                         lambda _: 1)
+
+    def _estimate_height(self, text: str, font: QFont) -> int:
+        metrics = QFontMetricsF(font)
+        lines = max(1, ceil(metrics.horizontalAdvance(text) * 1.05 / self._width))
+        return ceil(lines * metrics.lineSpacing())
+
+    def _height(self, text: str, font: QFont) -> int:
+        """Return the exact height of a cached layout, or an estimate if the text is not laid out yet."""
+        layout = self._layouts.get(self._key(text, font))
+        if layout is None:
+            return self._estimate_height(text, font)
+        return ceil(layout.boundingRect().height())
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        text, font = self._text_and_font(option, index)
+        return QSize(self._width + 2 * H_MARGIN, self._height(text, font) + 2 * V_MARGIN)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        text, font = self._text_and_font(option, index)
+        known = self._key(text, font) in self._layouts
+        estimated = None if known else self._height(text, font)
+        layout = self.layout(text, font)
+
+        panel = QStyleOptionViewItem(option)
+        self.initStyleOption(panel, index)
+        panel.text = ""
+        style = panel.widget.style() if panel.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, panel, painter, panel.widget)
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            brush = index.data(Qt.ForegroundRole)
+            painter.setPen(brush.color() if brush is not None else option.palette.text().color())
+        painter.setClipRect(option.rect)
+        layout.draw(painter, QPointF(option.rect.left() + H_MARGIN, option.rect.top() + V_MARGIN))
+        painter.restore()
+
+        if estimated is not None and estimated != ceil(layout.boundingRect().height()):
+            # The estimate was off; tell the view after the paint, as relaying out now would repaint mid-paint
+            if not self._misestimated:
+                QTimer.singleShot(0, self._emit_size_hints)
+            self._misestimated.append(QPersistentModelIndex(index))
+
+    def _emit_size_hints(self) -> None:
+        rows, self._misestimated = self._misestimated, []
+        for row in rows:
+            if row.isValid():
+                self.sizeHintChanged.emit(QModelIndex(row))
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self._viewport and event.type() == QEvent.Resize:
+            self._relayoutTimer.start()
+        return False
+
+    def relayout(self) -> None:
+        """Adopt the current viewport width, laying out only the rows on screen; the others are estimated."""
+        width = self._viewport_width()
+        if width == self._width:
+            return
+        self._width = width
+        model, viewport = self.view.model(), self._viewport
+        if model is not None:
+            option = QStyleOptionViewItem()
+            option.font = self.view.font()
+            row = self.view.indexAt(viewport.rect().topLeft()).row()
+            last = self.view.indexAt(viewport.rect().bottomLeft()).row()
+            if row >= 0:
+                last = last if last >= 0 else model.rowCount() - 1
+                for row in range(row, last + 1):
+                    self.layout(*self._text_and_font(option, model.index(row, 0)))
+        self.view.doItemsLayout()
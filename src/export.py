@@ -0,0 +1,280 @@
+import json
+import os
+import time
+import zipfile
+from collections import deque
+from html import escape
+from typing import BinaryIO, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import uuid4
+from .logs import get_logger
+from .processes import reader_pool, worker_reader
+from .reader import RangeEntry
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("txt", "html", "epub", "jsonl")
+QUEUED_BOOKS_PER_WORKER = 2  # Rendered books waiting to be written, per worker; bounds memory on large translations
+
+
+class ExportReport(NamedTuple):
+    translation: str
+    format: str
+    path: str
+    books: int
+    verses: int
+    bytes: int
+    timings: Dict[str, float]  # seconds per stage: open, render (summed over workers), write, total
+
+
+class Writer:
+    """
+    Writes one export format. render_book runs in the worker processes and returns the bytes
+    of one book; begin, write_book and end run in the exporting process, in book order.
+    """
+    extension = ""
+
+    def __init__(self, out: BinaryIO, translation: str) -> None:
+        self.out = out
+        self.translation = translation
+
+    @staticmethod
+    def render_book(book: str, number: int, entries: Iterator[RangeEntry]) -> bytes:
+        """Render the entries of a book (number counts books from 1, in translation order)."""
+        raise NotImplementedError
+
+    def begin(self) -> None:
+        pass
+
+    def write_book(self, book: str, number: int, data: bytes) -> None:
+        self.out.write(data)
+
+    def end(self) -> None:
+        pass
+
+
+class TextWriter(Writer):
+    """Plain UTF-8 text: the book name, then 'Chapter N' headings and one 'N text' line per verse."""
+    extension = ".txt"
+
+    @staticmethod
+    def render_book(book: str, number: int, entries: Iterator[RangeEntry]) -> bytes:
+        lines = [book.upper()]
+        chapter = None
+        for entry in entries:
+            if entry.chapter != chapter:
+                chapter = entry.chapter
+                lines.append(f"\nChapter {chapter}")
+            lines.append(f"\n{entry.text}" if entry.is_title else f"{entry.verse} {entry.text}")
+        return ("\n".join(lines) + "\n\n\n").encode("utf-8")
+
+
+def _html_body(book: str, entries: Iterator[RangeEntry]) -> str:
+    parts = [f'<section class="book">\n<h2>{escape(book)}</h2>']
+    chapter = None
+    for entry in entries:
+        if entry.chapter != chapter:
+            if chapter is not None:
+                parts.append("</div>")
+            chapter = entry.chapter
+            parts.append(f'<div class="chapter">\n<h3>{escape(book)} {chapter}</h3>')
+        if entry.is_title:
+            parts.append(f'<h4>{escape(entry.text)}</h4>')
+            continue
+        text = escape(entry.text)
+        if entry.is_red:
+            text = f'<span class="red">{text}</span>'
+        parts.append(f'<p><sup>{entry.verse}</sup> {text}</p>')
+    if chapter is not None:
+        parts.append("</div>")
+    parts.append("</section>\n")
+    return "\n".join(parts)
+
+
+STYLE = ".red { color: #c00; } sup { color: #888; } h4 { font-style: italic; }"
+
+
+class HtmlWriter(Writer):
+    """One HTML document; words of Jesus are wrapped in <span class="red">."""
+    extension = ".html"
+
+    @staticmethod
+    def render_book(book: str, number: int, entries: Iterator[RangeEntry]) -> bytes:
+        return _html_body(book, entries).encode("utf-8")
+
+    def begin(self) -> None:
+        title = escape(self.translation)
+        self.out.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n'
+                       f'<style>{STYLE}</style>\n</head>\n<body>\n<h1>{title}</h1>\n'.encode("utf-8"))
+
+    def end(self) -> None:
+        self.out.write(b"</body>\n</html>\n")
+
+
+class EpubWriter(Writer):
+    """An EPUB 3 book with one XHTML document per book of the translation."""
+    extension = ".epub"
+
+    @staticmethod
+    def render_book(book: str, number: int, entries: Iterator[RangeEntry]) -> bytes:
+        return (f'<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+                f'<html xmlns="http://www.w3.org/1999/xhtml"><head><title>{escape(book)}</title>'
+                f'<link rel="stylesheet" href="style.css"/></head><body>\n'
+                f'{_html_body(book, entries)}</body></html>\n').encode("utf-8")
+
+    def begin(self) -> None:
+        self.zip = zipfile.ZipFile(self.out, "w", zipfile.ZIP_DEFLATED)
+        self.zip.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        self.zip.writestr("META-INF/container.xml",
+                          '<?xml version="1.0"?>\n<container version="1.0" '
+                          'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+                          '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+                          '</rootfiles></container>\n')
+        self.zip.writestr("OEBPS/style.css", STYLE + "\n")
+        self.contents: List[Tuple[str, str]] = []  # (file name, book) in reading order
+
+    def write_book(self, book: str, number: int, data: bytes) -> None:
+        name = f"book{number:03d}.xhtml"
+        self.zip.writestr(f"OEBPS/{name}", data)
+        self.contents.append((name, book))
+
+    def end(self) -> None:
+        title = escape(self.translation)
+        items = "".join(f'<item id="b{index}" href="{name}" media-type="application/xhtml+xml"/>'
+                        for index, (name, _) in enumerate(self.contents))
+        spine = "".join(f'<itemref idref="b{index}"/>' for index in range(len(self.contents)))
+        self.zip.writestr("OEBPS/content.opf",
+                          '<?xml version="1.0" encoding="utf-8"?>\n<package xmlns="http://www.idpf.org/2007/opf" '
+                          'version="3.0" unique-identifier="id"><metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                          f'<dc:identifier id="id">urn:uuid:{uuid4()}</dc:identifier><dc:title>{title}</dc:title>'
+                          '<dc:language>en</dc:language>'
+                          f'<meta property="dcterms:modified">{time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}</meta>'
+                          '</metadata><manifest><item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" '
+                          'properties="nav"/><item id="css" href="style.css" media-type="text/css"/>'
+                          f'{items}</manifest><spine>{spine}</spine></package>\n')
+        links = "".join(f'<li><a href="{name}">{escape(book)}</a></li>' for name, book in self.contents)
+        self.zip.writestr("OEBPS/nav.xhtml",
+                          '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n<html xmlns="http://www.w3.org/1999/xhtml" '
+                          f'xmlns:epub="http://www.idpf.org/2007/ops"><head><title>{title}</title></head><body>'
+                          f'<nav epub:type="toc"><h1>{title}</h1><ol>{links}</ol></nav></body></html>\n')
+        self.zip.close()
+
+
+class JsonLinesWriter(Writer):
+    """One JSON object per verse or section title."""
+    extension = ".jsonl"
+
+    @staticmethod
+    def render_book(book: str, number: int, entries: Iterator[RangeEntry]) -> bytes:
+        return "".join(
+            json.dumps({"book": entry.book, "chapter": entry.chapter, "verse": entry.verse, "text": entry.text,
+                        "red": entry.is_red, "title": entry.is_title}, ensure_ascii=False) + "\n"
+            for entry in entries
+        ).encode("utf-8")
+
+
+WRITERS: Dict[str, type] = {"txt": TextWriter, "html": HtmlWriter, "epub": EpubWriter, "jsonl": JsonLinesWriter}
+
+
+class _CountingIterator:
+    """Counts the verses (not titles) passing through an iterator of RangeEntry records."""
+    def __init__(self, entries: Iterator[RangeEntry]) -> None:
+        self.entries = entries
+        self.verses = 0
+
+    def __iter__(self) -> Iterator[RangeEntry]:
+        for entry in self.entries:
+            self.verses += not entry.is_title
+            yield entry
+
+
+def render_book(format_str: str, translation_str: str, book: str, number: int,
+                reader=None) -> Tuple[bytes, int, float]:
+    """
+    Render one book of a translation in an export format.
+
+    :param format_str: A key of WRITERS.
+    :param translation_str: Name of the translation.
+    :param book: Book name as written in the translation.
+    :param number: Position of the book in the translation, from 1.
+    :param reader: Reader to use (defaults to the worker process's Reader).
+    :return: (rendered bytes, verse count, seconds spent rendering).
+    """
+    start = time.perf_counter()
+    reader = reader or worker_reader()
+    chapters = reader.get_chapters(book, translation_str)
+    if not chapters:
+        return WRITERS[format_str].render_book(book, number, iter(())), 0, time.perf_counter() - start
+    entries = _CountingIterator(reader.iter_range(book, chapters[0], 1, (book, chapters[-1], None), translation_str))
+    data = WRITERS[format_str].render_book(book, number, iter(entries))
+    return data, entries.verses, time.perf_counter() - start
+
+
+def export_translation(reader, translation_str: str, format_str: str, path: str, max_workers: Optional[int] = None,
+                       progress: Optional[Callable[[int, int], None]] = None) -> ExportReport:
+    """
+    Export a whole translation, rendering books in a process pool and writing them in order as they finish.
+
+    At most QUEUED_BOOKS_PER_WORKER books per worker are rendered ahead of the writer, so memory use
+    does not grow with the size of the translation.
+
+    :param reader: The Reader providing the translation (its directories and backend are reused by the workers).
+    :param translation_str: Name of the translation.
+    :param format_str: One of EXPORT_FORMATS.
+    :param path: Output file, replaced atomically once the export is complete.
+    :param max_workers: Worker processes (defaults to the number of CPUs); 1 renders in this process.
+    :param progress: Optional callback receiving (books written, total books).
+    :return: The ExportReport.
+    """
+    timings = {"open": 0.0, "render": 0.0, "write": 0.0, "total": 0.0}
+    start = time.perf_counter()
+    reader.load_root(translation_str)  # build a missing store once here instead of in every worker
+    books = reader.get_books(translation_str=translation_str)
+    timings["open"] = time.perf_counter() - start
+
+    verses = 0
+    tmp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(tmp_path, "wb") as out:
+            writer = WRITERS[format_str](out, translation_str)
+            writer.begin()
+
+            def write(number: int, result: Tuple[bytes, int, float]) -> None:
+                nonlocal verses
+                data, count, seconds = result
+                timings["render"] += seconds
+                write_start = time.perf_counter()
+                writer.write_book(books[number - 1], number, data)
+                timings["write"] += time.perf_counter() - write_start
+                verses += count
+                if progress is not None:
+                    progress(number, len(books))
+
+            if max_workers == 1:
+                for number, book in enumerate(books, 1):
+                    write(number, render_book(format_str, translation_str, book, number, reader))
+            else:
+                with reader_pool(reader, max_workers) as executor:
+                    window = QUEUED_BOOKS_PER_WORKER * (max_workers or os.cpu_count() or 1)
+                    pending: Deque = deque()
+                    for number, book in enumerate(books, 1):
+                        pending.append(executor.submit(render_book, format_str, translation_str, book, number))
+                        if len(pending) >= window:
+                            write(number - len(pending) + 1, pending.popleft().result())
+                    while pending:
+                        write(len(books) - len(pending) + 1, pending.popleft().result())
+
+            write_start = time.perf_counter()
+            writer.end()
+            timings["write"] += time.perf_counter() - write_start
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+    timings["total"] = time.perf_counter() - start
+    report = ExportReport(translation_str, format_str, path, len(books), verses, os.path.getsize(path), timings)
+    logger.info(f"Exported {translation_str} to {path}: {report.books} books, {report.verses} verses "
+                f"in {timings['total']:.2f}s")
+    return report
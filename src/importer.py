@@ -0,0 +1,159 @@
+import os
+import xml.etree.ElementTree as ET
+from typing import Callable, List, NamedTuple, Optional
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+# Annotation elements inside a verse whose content is not part of the verse text (footnotes, cross-references)
+ANNOTATION_TAGS = {"note", "f", "x", "xref", "footnote", "crossref"}
+
+ProgressCallback = Callable[[int, int], None]  # (bytes read, total bytes)
+
+
+class ImportIssue(NamedTuple):
+    book: Optional[str]
+    chapter: Optional[str]
+    message: str
+
+    def __str__(self) -> str:
+        location = " ".join(part for part in (self.book, self.chapter) if part)
+        return f"{location}: {self.message}" if location else self.message
+
+
+class ImportReport(NamedTuple):
+    books: int
+    chapters: int
+    verses: int
+    issues: List[ImportIssue]
+
+
+def verse_text(element: ET.Element) -> str:
+    """
+    Return the text of a verse element, keeping inline markup but dropping annotations.
+
+    :param element: The <v> element.
+    :return: The verse text with whitespace collapsed.
+    """
+    parts = [element.text or ""]
+    for child in element:
+        if child.tag not in ANNOTATION_TAGS:
+            parts.append(verse_text(child))
+        parts.append(child.tail or "")
+    return " ".join("".join(parts).split())
+
+
+def _parse_number(value: Optional[str]) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def import_translation(xml_path: str, builder, progress: Optional[ProgressCallback] = None) -> ImportReport:
+    """
+    Stream a translation XML file into a builder with bounded memory.
+
+    The file is read with iterparse and every <v>, <c> and <b> element is cleared once it has been
+    handed to the builder, so memory use does not grow with the size of the file. The structure
+    described in the README (<bible>/<b n>/<c n>/<v n>) is validated as the file is read: malformed
+    books, chapters and verses are skipped and reported instead of aborting the import.
+
+    :param xml_path: Path of the translation XML file.
+    :param builder: Object with add_book(name), add_chapter(number) and add_verse(number, text) methods.
+    :param progress: Optional callback receiving (bytes read, total bytes) after every book.
+    :return: An ImportReport with counts and the issues found.
+    """
+    issues: List[ImportIssue] = []
+    books = chapters = verses = 0
+    total = os.path.getsize(xml_path)
+    book: Optional[str] = None    # current book name, None while inside a skipped book
+    chapter: Optional[str] = None  # current chapter number, None while inside a skipped chapter
+    seen_chapters = set()
+    depth_tags: List[str] = []
+    skip_depth: Optional[int] = None  # depth of a misplaced <b> or <c> whose whole content is skipped
+    root = None
+
+    with open(xml_path, "rb") as f:
+        try:
+            for event, element in ET.iterparse(f, events=("start", "end")):
+                tag = element.tag
+                if event == "start":
+                    if root is None:
+                        root = element
+                        if tag != "bible":
+                            issues.append(ImportIssue(None, None, f"root element is <{tag}>, expected <bible>"))
+                    parent = depth_tags[-1] if depth_tags else None
+                    depth_tags.append(tag)
+                    if skip_depth is not None or element is root:
+                        continue
+                    if tag == "b" and parent != root.tag:
+                        skip_depth = len(depth_tags)
+                        issues.append(ImportIssue(book, None, "book outside of the root skipped"))
+                    elif tag == "c" and parent != "b":
+                        skip_depth = len(depth_tags)
+                        issues.append(ImportIssue(book, element.attrib.get("n"), "chapter outside of a book skipped"))
+                    elif tag == "b":
+                        name = (element.attrib.get("n") or "").strip()
+                        if name:
+                            book, chapter = name, None
+                            seen_chapters = set()
+                            builder.add_book(name)
+                            books += 1
+                        else:
+                            book = None
+                            issues.append(ImportIssue(None, None, "book without a name skipped"))
+                    elif tag == "c":
+                        number = _parse_number(element.attrib.get("n"))
+                        if book is None:
+                            chapter = None
+                        elif number is None:
+                            chapter = None
+                            issues.append(ImportIssue(book, element.attrib.get("n"), "chapter with invalid number skipped"))
+                        elif number in seen_chapters:
+                            chapter = None
+                            issues.append(ImportIssue(book, str(number), "duplicate chapter skipped"))
+                        else:
+                            chapter = str(number)
+                            seen_chapters.add(number)
+                            builder.add_chapter(number)
+                            chapters += 1
+                    continue
+
+                depth_tags.pop()
+                parent = depth_tags[-1] if depth_tags else None
+                if skip_depth is not None:
+                    if len(depth_tags) < skip_depth:
+                        skip_depth = None  # the misplaced element itself has ended
+                        element.clear()
+                    continue
+                if tag == "v" and parent == "c":
+                    if chapter is not None:
+                        number = _parse_number(element.attrib.get("n"))
+                        if number is None:
+                            issues.append(ImportIssue(book, chapter, f"verse with invalid number {element.attrib.get('n')!r} skipped"))
+                        else:
+                            builder.add_verse(number, verse_text(element))
+                            verses += 1
+                    element.clear()
+                elif tag == "v" and parent not in ANNOTATION_TAGS:
+                    issues.append(ImportIssue(book, chapter, "verse outside of a chapter skipped"))
+                    element.clear()
+                elif tag == "c" and parent == "b":
+                    chapter = None
+                    element.clear()
+                elif tag == "b" and parent == root.tag:
+                    book = chapter = None
+                    element.clear()
+                    root.clear()
+                    if progress is not None:
+                        progress(f.tell(), total)
+        except ET.ParseError as e:
+            issues.append(ImportIssue(book, chapter, f"XML error, import stopped: {e}"))
+
+    for issue in issues:
+        logger.warning(f"{xml_path}: {issue}")
+    if progress is not None:
+        progress(total, total)
+    return ImportReport(books, chapters, verses, issues)
@@ -1,19 +1,52 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 # Dynamically get the logs/ folder alongside the current script
 LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, "exception.log")
+LOG_MAX_BYTES = 1024 * 1024  # Size of one log file before it is rotated
+LOG_BACKUPS = 5
+LOG_LEVEL = os.environ.get("BIBLE_GUI_LOG_LEVEL", "INFO").upper()
+
+# Records are put on a queue by the calling thread and written to the file by a listener thread,
+# so logging never blocks the GUI thread on disk I/O.
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(threadName)s - %(name)s - %(message)s'))
+        _listener = QueueListener(_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records to the log file and stop the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
 
 def get_logger(name: str = __name__) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        logger.setLevel(logging.DEBUG)
-        handler = RotatingFileHandler(LOG_FILE, maxBytes=10240, backupCount=5)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        _start_listener()
+        logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        logger.addHandler(QueueHandler(_queue))
     return logger
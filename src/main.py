@@ -1,13 +1,199 @@
 #!/usr/bin/env python3
 
-from .controller import *
+import argparse
+import sys
+from os import listdir
+from os.path import join, splitext
+from typing import List, Optional
 
 
+def compile_command(args: argparse.Namespace) -> None:
+    """Prebuild the compiled binary form of the translations."""
+    from .reader import BACKENDS, TRANSLATIONS_DIR
+    from .storage import build_all, conformance_issues, store_path
+
+    translations_dir = args.translations_dir or TRANSLATIONS_DIR
+    compiled_dir = args.compiled_dir or join(translations_dir, "compiled")
+    def progress(name: str, done: int, total: int) -> None:
+        print(f"\rCompiling {name}. . . {done * 100 // max(total, 1)}%", end="", flush=True)
+
+    backend = BACKENDS[args.backend]
+    built = build_all(translations_dir, compiled_dir, backend, args.translations or None, force=args.force,
+                      progress=progress)
+    for name, report in built:
+        print(f"\rCompiled {name}: {report.books} books, {report.chapters} chapters, {report.verses} verses")
+        for issue in report.issues:
+            print(f"  {issue}")
+    if not built:
+        print("All translations are up to date")
+
+    if args.verify:
+        from .compiled import CompiledTranslation, build_translation
+
+        failed = False
+        for name in args.translations or sorted(splitext(f)[0] for f in listdir(translations_dir) if f.endswith(".xml")):
+            xml_path = join(translations_dir, name + ".xml")
+            expected = CompiledTranslation(build_translation(xml_path)[0])
+            issues = conformance_issues(expected, backend.load(xml_path, store_path(compiled_dir, name, backend)))
+            print(f"Verified {name}: {'OK' if not issues else f'{len(issues)} difference(s)'}")
+            for issue in issues:
+                print(f"  {issue}")
+            failed = failed or bool(issues)
+        if failed:
+            sys.exit(1)
+
+
+def query_command(args: argparse.Namespace) -> None:
+    """Print the verses of references without starting the GUI (PyQt is never imported on this path)."""
+    from .query import Query, default_translation, write_results
+    from .reader import Reader, TRANSLATIONS_DIR
+
+    reader = Reader(args.translations_dir or TRANSLATIONS_DIR, backend=args.backend)
+    translation = args.translation or default_translation(reader)
+    if translation is None or translation not in reader.get_translations():
+        sys.exit(f"bible-gui: translation not found: {translation or '(none installed)'}")
+
+    lines = sys.stdin if not args.references or args.references == ["-"] else args.references
+    failures = write_results(Query(reader, translation), lines, sys.stdout, as_json=args.json)
+    if failures:
+        sys.exit(1)
+
+
+def serve_command(args: argparse.Namespace) -> None:
+    """Serve translations as a JSON HTTP API (PyQt is never imported on this path)."""
+    from .reader import Reader, TRANSLATIONS_DIR
+    from .server import serve
+
+    serve(Reader(args.translations_dir or TRANSLATIONS_DIR, backend=args.backend), args.host, args.port, args.workers)
+
+
+def compare_command(args: argparse.Namespace) -> None:
+    """Compare two translations verse by verse and print the differences."""
+    import json
+    from .compare import compare_translations
+    from .reader import Reader, TRANSLATIONS_DIR
+
+    reader = Reader(args.translations_dir or TRANSLATIONS_DIR, backend=args.backend)
+    for name in (args.left, args.right):
+        if name not in reader.get_translations():
+            sys.exit(f"bible-gui: translation not found: {name}")
+
+    def progress(done: int, total: int) -> None:
+        print(f"\rComparing {args.left} with {args.right}. . . {done}/{total} books", end="", file=sys.stderr, flush=True)
+
+    comparison = compare_translations(reader, args.left, args.right, max_workers=args.workers,
+                                      use_cache=not args.force, progress=progress)
+    print(file=sys.stderr)
+    if args.json:
+        for book in comparison.books:
+            for diff in book.changed:
+                print(json.dumps({"reference": diff.reference, "similarity": round(diff.similarity, 4),
+                                  "left": diff.left, "right": diff.right}, ensure_ascii=False))
+            for kind, keys in (("missing", book.missing), ("extra", book.extra)):
+                for key in keys:
+                    print(json.dumps({"reference": f"{key[0]} {key[1]}:{key[2]}", kind: True}))
+        return
+
+    for book in comparison.books:
+        if book.changed or book.missing or book.extra:
+            print(f"{book.book}: {len(book.changed)} changed, {len(book.missing)} missing, {len(book.extra)} extra")
+    summary = comparison.summary()
+    print(f"{summary['aligned']} aligned verses, {summary['identical']} identical, {summary['changed']} changed, "
+          f"{summary['missing']} missing, {summary['extra']} extra, similarity {summary['similarity']:.1%}")
+    for diff in sorted(comparison.changed, key=lambda diff: diff.similarity)[:args.limit]:
+        print(f"\n{diff.reference} ({diff.similarity:.0%})\n  - {diff.left}\n  + {diff.right}")
+
+
+def export_command(args: argparse.Namespace) -> None:
+    """Export a whole translation to a file (PyQt is never imported on this path)."""
+    from .export import WRITERS, export_translation
+    from .reader import Reader, TRANSLATIONS_DIR
+
+    reader = Reader(args.translations_dir or TRANSLATIONS_DIR, backend=args.backend)
+    if args.translation not in reader.get_translations():
+        sys.exit(f"bible-gui: translation not found: {args.translation}")
+
+    def progress(done: int, total: int) -> None:
+        print(f"\rExporting {args.translation}. . . {done}/{total} books", end="", file=sys.stderr, flush=True)
+
+    path = args.output or args.translation + WRITERS[args.format].extension
+    report = export_translation(reader, args.translation, args.format, path, max_workers=args.workers,
+                                progress=progress)
+    print(file=sys.stderr)
+    print(f"Wrote {report.path}: {report.books} books, {report.verses} verses, {report.bytes} bytes")
+    print("  " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in report.timings.items()))
+
+
+def gui_command(args: argparse.Namespace) -> None:
+    """Start the GUI."""
+    from PyQt5.QtWidgets import QApplication
+    from .controller import Controller
 
-def main() -> None:
     application = QApplication([])
-    controller = Controller()
+    controller = Controller(backend=args.backend)
     application.exec_()
 
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for the bible-gui entry point."""
+    parser = argparse.ArgumentParser(prog="bible-gui", description="Read the Bible in a Gui Interface")
+    parser.add_argument("--trace", action="store_true",
+                        help="Time hot paths and print the timings on exit (same as BIBLE_GUI_TRACE=1)")
+    parser.add_argument("--backend", choices=("compiled", "sqlite"), default="compiled",
+                        help="Storage backend for translations (default: compiled binary files)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    compile_parser = subparsers.add_parser("compile", help="Prebuild compiled translation files")
+    compile_parser.add_argument("translations", nargs="*", help="Translations to compile (default: all)")
+    compile_parser.add_argument("--translations-dir", help="Directory containing the translation XML files")
+    compile_parser.add_argument("--compiled-dir", help="Directory receiving the compiled files")
+    compile_parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    compile_parser.add_argument("--verify", action="store_true",
+                                help="Check every store against a fresh import of its XML file")
+    compile_parser.set_defaults(func=compile_command)
+
+    query_parser = subparsers.add_parser("query", help="Print verses for references such as 'John 3:16-18; Rom 8'")
+    query_parser.add_argument("references", nargs="*",
+                              help="References to look up, one query per argument (default or '-': one per line from stdin)")
+    query_parser.add_argument("-t", "--translation", help="Translation to read (default: NLT, else the first installed)")
+    query_parser.add_argument("--json", action="store_true", help="Write one JSON object per query")
+    query_parser.add_argument("--translations-dir", help="Directory containing the translation XML files")
+    query_parser.set_defaults(func=query_command)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two translations verse by verse")
+    compare_parser.add_argument("left", help="Reference translation")
+    compare_parser.add_argument("right", help="Translation under review")
+    compare_parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    compare_parser.add_argument("--limit", type=int, default=20, help="Least similar verses to print (default: 20)")
+    compare_parser.add_argument("--json", action="store_true", help="Write one JSON object per difference")
+    compare_parser.add_argument("--force", action="store_true", help="Ignore the cached comparison")
+    compare_parser.add_argument("--translations-dir", help="Directory containing the translation XML files")
+    compare_parser.set_defaults(func=compare_command)
+
+    export_parser = subparsers.add_parser("export", help="Export a translation as text, HTML, EPUB or JSON Lines")
+    export_parser.add_argument("translation", help="Translation to export")
+    export_parser.add_argument("-f", "--format", choices=("txt", "html", "epub", "jsonl"), default="txt",
+                               help="Output format (default: txt)")
+    export_parser.add_argument("-o", "--output", help="Output file (default: the translation name with the format's extension)")
+    export_parser.add_argument("--workers", type=int, help="Worker processes rendering books (default: one per CPU)")
+    export_parser.add_argument("--translations-dir", help="Directory containing the translation XML files")
+    export_parser.set_defaults(func=export_command)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve translations as a JSON HTTP API")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    serve_parser.add_argument("--workers", type=int, default=4, help="Threads building uncached responses")
+    serve_parser.add_argument("--translations-dir", help="Directory containing the translation XML files")
+    serve_parser.set_defaults(func=serve_command)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        from .tracing import enable
+        enable()  # before the traced modules are imported by the command
+    getattr(args, "func", gui_command)(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,251 @@
+from bisect import bisect_left
+from itertools import islice
+from typing import Any, Iterator, List, Optional, Tuple
+from PyQt5.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QBrush, QFont
+from .parallel import ParallelChapter
+from .reader import RangeEntry, RenderedChapter
+
+RedLetterRole = Qt.UserRole + 1
+TitleRole = Qt.UserRole + 2
+VerseNumberRole = Qt.UserRole + 3
+
+
+class ChapterModel(QAbstractListModel):
+    """
+    List model exposing one chapter rendered by the reader's chapter cache.
+
+    The rendered chapter is shared with the cache, so showing a chapter that was read recently
+    or prefetched costs nothing, and selecting another verse in the same chapter never rebuilds
+    the model. Rows are built eagerly, off the GUI thread, rather than in data(): a chapter is at
+    most a few hundred rows, and a cached chapter can be shown again without touching the store.
+    """
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._chapter: Optional[RenderedChapter] = None
+        self._key: Optional[Tuple[str, str, str]] = None
+        self._message: Optional[str] = None
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._red = QBrush(Qt.red)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._message is not None:
+            return 1
+        return len(self._chapter.rows) if self._chapter else 0
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if self._message is not None:
+            return self._message if role == Qt.DisplayRole else None
+
+        text, is_red, is_title, verse_number = self._chapter.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.ForegroundRole:
+            return self._red if is_red else None
+        if role == Qt.FontRole:
+            return self._bold if is_title else None
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignTop)
+        if role == RedLetterRole:
+            return is_red
+        if role == TitleRole:
+            return is_title
+        if role == VerseNumberRole:
+            return verse_number
+        return None
+
+    def chapter_key(self) -> Optional[Tuple[str, str, str]]:
+        """Return the (translation, book, chapter) currently shown, or None."""
+        return self._key
+
+    def set_chapter(self, translation: str, book: str, chapter: str, rendered: RenderedChapter) -> None:
+        """
+        Show a chapter.
+
+        :param translation: Name of the translation.
+        :param book: Book name.
+        :param chapter: Chapter number.
+        :param rendered: The chapter as rendered by Reader.render_chapter.
+        """
+        self.beginResetModel()
+        self._key = (translation, book, chapter)
+        self._chapter = rendered
+        self._message = None
+        self.endResetModel()
+
+    def set_message(self, message: str) -> None:
+        """Replace the contents with a single message row (e.g. an error)."""
+        self.beginResetModel()
+        self._key = None
+        self._message = message
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.beginResetModel()
+        self._key = None
+        self._chapter = None
+        self._message = None
+        self.endResetModel()
+
+    def row_for_verse(self, verse_number: int) -> int:
+        """
+        Return the row to scroll to for a verse: the section title right above it if there is one.
+
+        :param verse_number: Verse number to locate.
+        :return: Row index, or -1 if the chapter is empty.
+        """
+        if not self._chapter or not self._chapter.rows:
+            return -1
+        row = max(self._chapter.row_for_verse(verse_number), 0)
+        return row - 1 if row > 0 and self._chapter.rows[row - 1][2] else row
+
+
+class PassageModel(QAbstractListModel):
+    """
+    List model showing a long passage (e.g. 'Gen 1:1-3:24' or whole books) from a lazy iterator.
+
+    Rows are pulled from the iterator in batches through canFetchMore/fetchMore as the view
+    scrolls, so a range is never materialized before it is displayed. A heading row is inserted
+    whenever the passage enters a new chapter.
+    """
+    FETCH_BATCH = 100  # Entries read from the iterator per fetchMore call
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._entries: Optional[Iterator[RangeEntry]] = None
+        self._rows: List[Tuple[str, bool, bool, int]] = []
+        self._chapter: Optional[Tuple[str, int]] = None
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._red = QBrush(Qt.red)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        text, is_red, is_title, verse_number = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.ForegroundRole:
+            return self._red if is_red else None
+        if role == Qt.FontRole:
+            return self._bold if is_title else None
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignTop)
+        if role == RedLetterRole:
+            return is_red
+        if role == TitleRole:
+            return is_title
+        if role == VerseNumberRole:
+            return verse_number
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._entries is not None
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self._entries is None:
+            return
+        rows = []
+        count = 0
+        for count, entry in enumerate(islice(self._entries, self.FETCH_BATCH), 1):
+            if (entry.book, entry.chapter) != self._chapter:
+                self._chapter = (entry.book, entry.chapter)
+                rows.append((f"{entry.book} {entry.chapter}", False, True, 0))
+            if entry.is_title:
+                rows.append((entry.text, False, True, 0))
+            else:
+                rows.append((f"({entry.verse}) {entry.text}", entry.is_red, False, entry.verse))
+        if count < self.FETCH_BATCH:
+            self._entries = None  # exhausted
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def set_passage(self, entries: Iterator[RangeEntry]) -> None:
+        """
+        Show a passage; rows are read from entries as the view needs them.
+
+        :param entries: Iterator of RangeEntry records, e.g. from Reader.iter_range.
+        """
+        self.beginResetModel()
+        self._entries = iter(entries)
+        self._rows = []
+        self._chapter = None
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.beginResetModel()
+        self._entries = None
+        self._rows = []
+        self._chapter = None
+        self.endResetModel()
+
+
+class ParallelModel(QAbstractTableModel):
+    """
+    Table model showing one chapter in several translations: one column per translation,
+    one row per canonical verse. Verses missing from a translation are shown as empty cells.
+    """
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._chapter = ParallelChapter([], [], [])
+        self._red = QBrush(Qt.red)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._chapter.verses)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._chapter.translations)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        cell = self._chapter.cells[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return cell[0] if cell else ""
+        if role == Qt.ForegroundRole:
+            return self._red if cell and cell[1] else None
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignTop)
+        if role == RedLetterRole:
+            return bool(cell and cell[1])
+        if role == VerseNumberRole:
+            return self._chapter.verses[index.row()]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._chapter.translations[section]
+        return str(self._chapter.verses[section])
+
+    def set_chapter(self, chapter: ParallelChapter) -> None:
+        """Show an aligned chapter."""
+        self.beginResetModel()
+        self._chapter = chapter
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove all rows and columns."""
+        self.set_chapter(ParallelChapter([], [], []))
+
+    def row_for_verse(self, verse_number: int) -> int:
+        """Return the row of a verse, or of the first verse after it; -1 if the table is empty."""
+        verses = self._chapter.verses
+        if not verses:
+            return -1
+        return min(bisect_left(verses, verse_number), len(verses) - 1)
+
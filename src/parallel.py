@@ -0,0 +1,154 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join, exists
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from .books import canonical_name
+from .cache import UNBOUNDED, SharedLRUCache
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+VERSIFICATION_SUFFIX = ".versification.json"  # Per-translation verse mappings live next to the translation XML
+COLUMN_CACHE_SIZE = 256  # Number of (translation, book, chapter) columns kept in memory
+
+VerseKey = Tuple[str, int, int]  # (canonical book, chapter, verse)
+
+
+def book_key(book_str: str) -> str:
+    """Return the canonical name of a book, or the name itself if it is not a recognized book."""
+    return canonical_name(book_str) or book_str
+
+
+def parse_reference(reference: str) -> VerseKey:
+    """
+    Parse a 'Book C:V' reference into a canonical verse key.
+
+    :param reference: Reference such as 'Malachi 4:1' or '1 John 2:3'.
+    :return: (canonical book, chapter, verse).
+    """
+    book, _, chapter_verse = reference.strip().rpartition(" ")
+    chapter, _, verse = chapter_verse.partition(":")
+    return book_key(book), int(chapter), int(verse)
+
+
+class Versification:
+    """
+    Maps the verse numbering of one translation onto the canonical (book, chapter, verse) keys.
+
+    Verses are canonical by default. A translation that numbers some passages differently ships a
+    '<name>.versification.json' file next to its XML mapping its references to canonical ones,
+    e.g. {"Malachi 4:1": "Malachi 3:19"}.
+    """
+    def __init__(self, mapping: Optional[Dict[VerseKey, VerseKey]] = None) -> None:
+        self.mapping = mapping or {}
+        self._sources: Dict[Tuple[str, int], Set[Tuple[str, int]]] = {}
+        for (book, chapter, _), (canonical_book, canonical_chapter, _) in self.mapping.items():
+            self._sources.setdefault((canonical_book, canonical_chapter), set()).add((book, chapter))
+
+    @classmethod
+    def load(cls, translations_dir: str, translation_str: str) -> "Versification":
+        """Load the versification file of a translation, or return the identity mapping if it has none."""
+        path = join(translations_dir, translation_str + VERSIFICATION_SUFFIX)
+        if not exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls({parse_reference(source): parse_reference(target) for source, target in data.items()})
+
+    def to_canonical(self, key: VerseKey) -> VerseKey:
+        """Return the canonical key of a verse numbered as in this translation."""
+        return self.mapping.get(key, key)
+
+    def source_chapters(self, book: str, chapter: int) -> List[Tuple[str, int]]:
+        """Return the chapters of this translation holding verses of a canonical chapter."""
+        return sorted({(book, chapter)} | self._sources.get((book, chapter), set()))
+
+
+class ParallelChapter(NamedTuple):
+    translations: List[str]
+    verses: List[int]
+    cells: List[List[Optional[Tuple[str, bool]]]]  # [row][column] -> (text, is_red) or None if missing
+
+
+class ParallelFetcher:
+    """
+    Fetches one chapter from several translations concurrently and aligns them on canonical verse keys.
+
+    Each (translation, book, chapter) column is cached, so switching chapters only fetches the
+    chapter that changed and adding a translation only fetches its own column.
+    """
+    def __init__(self, reader, max_workers: int = 4) -> None:
+        """
+        :param reader: The Reader providing translations.
+        :param max_workers: Number of threads fetching columns concurrently.
+        """
+        self.reader = reader
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parallel")
+        # Both caches load outside their lock, so a slow column or mapping file never blocks the others
+        self._columns = SharedLRUCache(COLUMN_CACHE_SIZE)
+        self._versifications = SharedLRUCache(UNBOUNDED)
+
+    def versification(self, translation_str: str) -> Versification:
+        """Return the (cached) versification of a translation."""
+        return self._versifications.get_or_load(
+            translation_str, lambda: Versification.load(self.reader.translations_dir, translation_str), lambda _: 1)
+
+    def _book_names(self, translation_str: str) -> Dict[str, str]:
+        return {book_key(name): name for name in self.reader.get_books(translation_str=translation_str)}
+
+    def fetch_column(self, translation_str: str, book_str: str, chapter: int) -> Dict[int, Tuple[str, bool]]:
+        """
+        Return the verses of a canonical chapter in one translation, keyed by canonical verse number.
+
+        :param translation_str: Name of the translation.
+        :param book_str: Book name (any translation's spelling).
+        :param chapter: Canonical chapter number.
+        :return: Mapping of verse number -> (text, is_red); empty if the translation lacks the chapter.
+        """
+        book = book_key(book_str)
+        return self._columns.get_or_load((translation_str, book, chapter),
+                                         lambda: self._load_column(translation_str, book, chapter), lambda _: 1)
+
+    def _load_column(self, translation_str: str, book: str, chapter: int) -> Dict[int, Tuple[str, bool]]:
+        names = self._book_names(translation_str)
+        versification = self.versification(translation_str)
+        red_letter = self.reader.get_red_letter(translation_str)
+        column: Dict[int, Tuple[str, bool]] = {}
+        for source_book, source_chapter in versification.source_chapters(book, chapter):
+            name = names.get(source_book)
+            if name is None:
+                continue
+            try:
+                entries = self.reader.get_verse_entries(name, str(source_chapter), translation_str)
+            except KeyError:
+                continue
+            mask = red_letter.chapter_mask(name, str(source_chapter))
+            for verse_str, text in entries:
+                verse = int(verse_str)
+                if verse == 0:
+                    continue
+                target = versification.to_canonical((source_book, source_chapter, verse))
+                if target[:2] == (book, chapter):
+                    column[target[2]] = (text, bool(mask >> verse & 1))
+        return column
+
+    def fetch_chapter(self, translations: List[str], book_str: str, chapter: str) -> ParallelChapter:
+        """
+        Fetch and align a chapter across translations.
+
+        :param translations: Translation names, one per column.
+        :param book_str: Book name.
+        :param chapter: Chapter number.
+        :return: ParallelChapter with one row per verse present in any translation.
+        """
+        chapter = int(chapter)
+        futures = [self.executor.submit(self.fetch_column, translation, book_str, chapter) for translation in translations]
+        columns = [future.result() for future in futures]
+        verses = sorted(set().union(*columns)) if columns else []
+        cells = [[column.get(verse) for column in columns] for verse in verses]
+        return ParallelChapter(list(translations), verses, cells)
+
+    def invalidate(self, translation_str: str) -> None:
+        """Drop cached columns and versification of a translation (e.g. after its file changed)."""
+        self._columns.discard_where(lambda key: key[0] == translation_str)
+        self._versifications.discard(translation_str)
@@ -0,0 +1,32 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_worker_reader = None  # Reader opened once per worker process
+
+
+def _init_worker(translations_dir: str, compiled_dir: str, backend: str) -> None:
+    global _worker_reader
+    from .reader import Reader
+    _worker_reader = Reader(translations_dir, compiled_dir=compiled_dir, backend=backend)
+
+
+def worker_reader():
+    """Return the Reader of the current pool worker process, opened by reader_pool's initializer."""
+    return _worker_reader
+
+
+def reader_pool(reader, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers each open a Reader on the same translations as reader.
+
+    Workers are spawned rather than forked, since the GUI calls the batch jobs from a worker
+    thread of a threaded process. Tasks get their worker's Reader with worker_reader().
+
+    :param reader: Reader whose translations directory, compiled directory and backend workers use.
+    :param max_workers: Number of worker processes (defaults to the CPU count).
+    :return: The ProcessPoolExecutor.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker,
+                               initargs=(reader.translations_dir, reader.compiled_dir, reader.backend.name))
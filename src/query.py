@@ -0,0 +1,148 @@
+import json
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+from .books import resolve_book
+from .parallel import book_key
+from .reader import RangeEntry
+from .references import Reference, ReferenceParseError, parse_references
+
+DEFAULT_TRANSLATION = "NLT"  # Used by queries that do not name a translation, when available
+
+
+class VerseRecord(NamedTuple):
+    book: str       # book name as written in the translation
+    chapter: int
+    verse: int
+    text: str
+    red: bool
+
+    @property
+    def reference(self) -> str:
+        return f"{self.book} {self.chapter}:{self.verse}"
+
+
+class QueryError(Exception):
+    """Raised when a query names something the translation does not contain."""
+
+
+def default_translation(reader) -> Optional[str]:
+    """Return the translation used when none is given: NLT if present, else the first by name."""
+    translations = sorted(reader.get_translations())
+    if DEFAULT_TRANSLATION in translations:
+        return DEFAULT_TRANSLATION
+    return translations[0] if translations else None
+
+
+class Query:
+    """
+    Resolves parsed references against one translation of a Reader, without any GUI.
+
+    Book names of the translation are matched on their canonical names, so 'Rom 8' finds the
+    book whatever the translation calls it.
+    """
+    def __init__(self, reader, translation_str: str) -> None:
+        """
+        :param reader: The Reader providing translations.
+        :param translation_str: Name of the translation to read.
+        """
+        self.reader = reader
+        self.translation_str = translation_str
+        self._books: Dict[str, str] = {
+            book_key(name): name for name in reader.get_books(translation_str=translation_str)
+        }
+
+    def book_name(self, text: str) -> Optional[str]:
+        """Return the translation's name for a book given by name, alias or abbreviation, or None."""
+        book = resolve_book(text)
+        return self._books.get(book) if book else None
+
+    def chapters(self, book: str) -> List[int]:
+        """Return the chapter numbers of a book (as named by the translation)."""
+        return [int(chapter) for chapter in self.reader.get_chapters(book, self.translation_str)]
+
+    def entries(self, reference: Reference) -> Iterator[RangeEntry]:
+        """
+        Return a lazy iterator over the verses and section titles of a reference.
+
+        :param reference: A parsed reference.
+        :return: RangeEntry records from Reader.iter_range.
+        :raises QueryError: If the translation lacks the book or every chapter of the reference.
+        """
+        book = self._books.get(reference.book)
+        if book is None:
+            raise QueryError(f"{self.translation_str} has no book {reference.book}")
+        chapters = self.chapters(book)
+        if reference.start_chapter is not None:
+            chapters = [chapter for chapter in chapters if reference.start_chapter <= chapter <= reference.end_chapter]
+        if not chapters:
+            raise QueryError(f"{self.translation_str} has no verses for {reference}")
+
+        # Chapters missing from the translation are clipped off the ends of the range
+        verse_start = reference.start_verse if chapters[0] == reference.start_chapter else None
+        verse_end = reference.end_verse if chapters[-1] == reference.end_chapter else None
+        return self.reader.iter_range(book, str(chapters[0]), verse_start or 1,
+                                      (book, str(chapters[-1]), verse_end), self.translation_str)
+
+    def resolve(self, reference: Reference) -> List[VerseRecord]:
+        """
+        Return the verses of a reference in order.
+
+        :param reference: A parsed reference.
+        :return: The verses it covers.
+        :raises QueryError: If the translation lacks the book or every verse of the reference.
+        """
+        records = [VerseRecord(entry.book, entry.chapter, entry.verse, entry.text, entry.is_red)
+                   for entry in self.entries(reference) if not entry.is_title]
+        if not records:
+            raise QueryError(f"{self.translation_str} has no verses for {reference}")
+        return records
+
+    def run(self, text: str) -> List[VerseRecord]:
+        """
+        Parse and resolve a line of references such as 'John 3:16-18; Rom 8'.
+
+        :raises ReferenceParseError: If the references cannot be parsed.
+        :raises QueryError: If a reference cannot be found in the translation.
+        """
+        records: List[VerseRecord] = []
+        for reference in parse_references(text):
+            records.extend(self.resolve(reference))
+        return records
+
+
+def write_results(query: Query, lines: Iterable[str], out: TextIO, as_json: bool = False) -> int:
+    """
+    Run each line as a query and write the verses to out.
+
+    Plain output has one 'Book C:V text' line per verse; errors go to the output as '# error'
+    lines so batches stay aligned. JSON output has one object per query line (JSON Lines).
+
+    :param query: The Query to run.
+    :param lines: Reference lines; blank lines are skipped.
+    :param out: Stream receiving the results.
+    :param as_json: Write JSON Lines instead of plain text.
+    :return: The number of lines that failed.
+    """
+    failures = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records = query.run(line)
+            error = None
+        except (ReferenceParseError, QueryError) as e:
+            records, error = [], str(e)
+            failures += 1
+
+        if as_json:
+            result = {"query": line, "translation": query.translation_str,
+                      "verses": [{**record._asdict(), "reference": record.reference} for record in records]}
+            if error:
+                result["error"] = error
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elif error:
+            out.write(f"# {line}: {error}\n")
+        else:
+            for record in records:
+                out.write(f"{record.reference} {record.text}\n")
+    return failures
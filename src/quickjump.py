@@ -0,0 +1,192 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .books import ABBREVIATIONS, ALIASES, SINGLE_CHAPTER_BOOKS, canonical_name, normalize, resolve_book
+from .cache import LRUCache
+
+QUERY_RE = re.compile(r"^\s*(?P<book>(?:[1-3]\s*)?[^\d:]*?)\s*(?:(?P<chapter>\d+)\s*(?:[:.]\s*(?P<verse>\d+)?)?)?\s*$")
+SUGGESTION_CACHE_SIZE = 256  # Recent query texts whose suggestions are kept
+
+
+def max_distance(text: str) -> int:
+    """Return how many typos are tolerated in a book name of this length."""
+    return 0 if len(text) < 3 else 1 if len(text) < 6 else 2
+
+
+class Suggestion(NamedTuple):
+    book: str                # book name as written in the translation
+    chapter: Optional[int]
+    verse: Optional[int]
+    distance: int            # edit distance between the typed text and the closest name of the book
+
+    @property
+    def label(self) -> str:
+        if self.chapter is None:
+            return self.book
+        return f"{self.book} {self.chapter}" + (f":{self.verse}" if self.verse is not None else "")
+
+
+class _Node:
+    __slots__ = ("children", "books")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.books: set = set()  # books with a name starting with the path to this node
+
+
+class BookTrie:
+    """
+    Character trie over normalized book names, aliases and abbreviations.
+
+    Every node knows the books reachable below it, so a prefix lookup is one walk down the trie.
+    Typo-tolerant lookups walk the trie with one Levenshtein row per node and stop descending
+    as soon as every entry of the row exceeds the allowed distance.
+    """
+    def __init__(self) -> None:
+        self.root = _Node()
+
+    def insert(self, key: str, book: str) -> None:
+        node = self.root
+        node.books.add(book)
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.books.add(book)
+
+    def prefix(self, key: str) -> set:
+        """Return the books with a name starting with key."""
+        node = self.root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.books
+
+    def fuzzy_prefix(self, key: str, limit: int) -> Dict[str, int]:
+        """
+        Return the books with a name starting with something within limit edits of key.
+
+        Edits are insertions, deletions, substitutions and swaps of adjacent characters. The first
+        character is taken as typed, which keeps the walk to one branch of the trie.
+
+        :param key: Normalized text typed by the user.
+        :param limit: Maximum edit distance.
+        :return: Book -> smallest edit distance.
+        """
+        matches: Dict[str, int] = {}
+        start = self.root.children.get(key[:1])
+        if start is None:
+            return matches
+        size = len(key)
+        capped = limit + 1
+        root_row = list(range(size + 1))
+        first_row = [1] + [min(column - 1, capped) for column in range(1, size + 1)]
+        # (node, its character, the character above it, its row, the row above it, depth)
+        stack: List[Tuple[_Node, str, str, List[int], List[int], int]] = [(start, key[0], "", first_row, root_row, 1)]
+        while stack:
+            node, char, previous_char, row, previous, depth = stack.pop()
+            distance = row[size]
+            if distance <= limit:
+                # key matches a prefix of every name below this node
+                for book in node.books:
+                    if matches.get(book, capped) > distance:
+                        matches[book] = distance
+            if min(row) > limit:
+                continue
+            low, high = max(1, depth + 1 - limit), min(size, depth + 1 + limit)
+            for next_char, child in node.children.items():
+                # Only cells within limit of the diagonal can stay within limit edits; the others stay capped
+                next_row = [depth + 1] + [capped] * size
+                left = next_row[low - 1]
+                for column in range(low, high + 1):
+                    key_char = key[column - 1]
+                    cell = row[column - 1] if key_char == next_char else row[column - 1] + 1
+                    if left + 1 < cell:
+                        cell = left + 1
+                    if row[column] + 1 < cell:
+                        cell = row[column] + 1
+                    if column > 1 and key_char == char and key[column - 2] == next_char and previous[column - 2] + 1 < cell:
+                        cell = previous[column - 2] + 1  # swapped adjacent characters
+                    left = next_row[column] = cell if cell < capped else capped
+                stack.append((child, next_char, char, next_row, row, depth + 1))
+        return matches
+
+
+class QuickJumpIndex:
+    """
+    Resolves partial and misspelled references such as 'jhon 3:16', '1 cor 13:4' or 'revelatoin'
+    to the books of one translation.
+    """
+    def __init__(self, books: Iterable[str], chapter_counts: Optional[Dict[str, int]] = None) -> None:
+        """
+        :param books: Book names as written in the translation, in order.
+        :param chapter_counts: Number of chapters of each book, used to drop impossible chapters.
+        """
+        self.books = list(books)
+        self.chapter_counts = chapter_counts or {}
+        self._order = {book: index for index, book in enumerate(self.books)}
+        self._by_canonical: Dict[str, str] = {}
+        self.trie = BookTrie()  # names, aliases and abbreviations, for prefix lookups
+        self.names = BookTrie()  # full names and aliases only, for typo-tolerant lookups
+        for book in self.books:
+            keys = {normalize(book)}
+            canonical = canonical_name(book)
+            if canonical is not None:
+                self._by_canonical.setdefault(canonical, book)
+                keys.add(normalize(canonical))
+            keys |= {key.split(" ", 1)[1] for key in keys if key[:1].isdigit() and " " in key}  # 'corinthians'
+            for key in keys:
+                self.trie.insert(key, book)
+                self.names.insert(key, book)
+            for abbreviation in ABBREVIATIONS.get(canonical, []):
+                self.trie.insert(normalize(abbreviation), book)
+        for alias, canonical in ALIASES.items():
+            if canonical in self._by_canonical:
+                self.trie.insert(alias, self._by_canonical[canonical])
+                self.names.insert(alias, self._by_canonical[canonical])
+        self._suggestions = LRUCache(SUGGESTION_CACHE_SIZE)
+
+    @classmethod
+    def for_translation(cls, reader, translation_str: str) -> "QuickJumpIndex":
+        """Build the index of a translation from Reader.get_books and Reader.get_chapters."""
+        books = reader.get_books(translation_str=translation_str)
+        return cls(books, {book: len(reader.get_chapters(book, translation_str)) for book in books})
+
+    def _books(self, text: str) -> Dict[str, int]:
+        """Return candidate books for a typed book name, with their edit distance."""
+        key = normalize(text)
+        if not key:
+            return {}
+        exact = resolve_book(text)
+        if exact in self._by_canonical:
+            return {self._by_canonical[exact]: 0}
+        matches = {book: 0 for book in self.trie.prefix(key)}
+        if not matches:
+            matches = self.names.fuzzy_prefix(key, max_distance(key))
+        return matches
+
+    def suggest(self, text: str, limit: int = 8) -> List[Suggestion]:
+        """
+        Return the references a quick-jump text most likely means, best first.
+
+        :param text: Text as typed, e.g. 'jhn 3:16', '1cor 13' or 'ps 23'.
+        :param limit: Maximum number of suggestions.
+        :return: Suggestions ordered by edit distance, then by book order.
+        """
+        cached = self._suggestions.get((text, limit))
+        if cached is not None:
+            return cached
+        suggestions = []
+        match = QUERY_RE.match(text)
+        if match:
+            chapter = int(match.group("chapter")) if match.group("chapter") else None
+            verse = int(match.group("verse")) if match.group("verse") else None
+            for book, distance in self._books(match.group("book")).items():
+                book_chapter, book_verse = chapter, verse
+                if chapter is not None and verse is None and canonical_name(book) in SINGLE_CHAPTER_BOOKS:
+                    book_chapter, book_verse = 1, chapter  # 'Jude 3' is verse 3
+                if book_chapter is not None and not 1 <= book_chapter <= self.chapter_counts.get(book, book_chapter):
+                    continue
+                suggestions.append(Suggestion(book, book_chapter, book_verse, distance))
+            suggestions.sort(key=lambda suggestion: (suggestion.distance, self._order.get(suggestion.book, 0)))
+        suggestions = suggestions[:limit]
+        self._suggestions.put((text, limit), suggestions, 1)
+        return suggestions
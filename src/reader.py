@@ -1,41 +1,164 @@
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
-from os.path import splitext, basename, dirname, join
-import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import ElementTree, Element
-from typing import List, Tuple, Dict
-from .redletter import RedLetter
+from os.path import splitext, basename, dirname, join, exists
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from .cache import SharedLRUCache
+from . import compiled, sqlite_store
+from .storage import StorageBackend, TranslationStore, build_all, store_path
+from .redletter import RedLetter, RED_LETTER_OVERRIDE_SUFFIX
 from .logs import get_logger
+from .tracing import traced
 
 TRANSLATIONS_DIR = join(dirname(__file__), "translations")  # Path to the translations directory
+COMPILED_DIR = join(TRANSLATIONS_DIR, "compiled")  # Path to the compiled translation cache
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # Bytes of loaded translations kept in memory
+CHAPTER_CACHE_SIZE = 64  # Number of rendered chapters kept in memory
+BACKENDS: Dict[str, StorageBackend] = {backend.name: backend for backend in (compiled.BACKEND, sqlite_store.BACKEND)}
+DEFAULT_BACKEND = "compiled"
 
 logger = get_logger(__name__)
 
+
+class RangeEntry(NamedTuple):
+    book: str
+    chapter: int
+    verse: int       # 0 for section titles
+    text: str
+    is_red: bool
+    is_title: bool
+
+
+class RenderedChapter(NamedTuple):
+    rows: List[Tuple[str, bool, bool, int]]  # (text, is_red, is_title, verse number); titles have verse number 0
+    verse_rows: List[int]                    # row of every verse, in order
+    verse_numbers: List[int]                 # verse number of every row in verse_rows
+
+    def row_for_verse(self, verse_number: int) -> int:
+        """Return the row of the first verse numbered verse_number or later (the last verse if none), or -1."""
+        if not self.verse_rows:
+            return -1
+        position = bisect_left(self.verse_numbers, verse_number)
+        return self.verse_rows[min(position, len(self.verse_rows) - 1)]
+
+    def from_verse(self, verse_start: int) -> List[Tuple[str, bool, bool]]:
+        """
+        Slice the chapter from a verse, keeping the last section title seen before it.
+
+        :param verse_start: The first verse number to include.
+        :return: A list of (text, is_red, is_title) tuples.
+        """
+        position = bisect_left(self.verse_numbers, verse_start)
+        if position == len(self.verse_rows):
+            return []
+        start = self.verse_rows[position]
+        title = next((row for row in range(start - 1, -1, -1) if self.rows[row][2]), None)
+        rows = ([self.rows[title]] if title is not None else []) + self.rows[start:]
+        return [row[:3] for row in rows]
+
 class Reader:
-    def __init__(self) -> None:
-        """Initialize the Reader object and load available Bible translations into memory."""
+    def __init__(self, translations_dir: str = TRANSLATIONS_DIR, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 compiled_dir: Optional[str] = None, backend: str = DEFAULT_BACKEND) -> None:
+        """Initialize the Reader object. Translations are loaded lazily the first time they are selected.
+            Args:
+                translations_dir: Directory containing the translation XML files.
+                memory_budget: Approximate number of bytes of loaded translations to keep in memory.
+                    The least recently used translations are evicted once the budget is exceeded.
+                compiled_dir: Directory holding compiled translations (defaults to 'compiled' inside translations_dir).
+                backend: Storage backend of the compiled translations, a key of BACKENDS ('compiled' or 'sqlite').
+        """
         logger.info("Initialzing Reader Object. . .")
-        self.red_letter = RedLetter()
-        self._load_roots()
-         
-    
-    def _load_roots(self) -> None:
-        """Load root elements for all available translations from XML files."""
-        logger.info("Loading roots. . .")
+        self.translations_dir = translations_dir
+        self.compiled_dir = compiled_dir or join(translations_dir, "compiled")
+        self.backend = BACKENDS[backend]
+        self.red_letter = RedLetter()  # Default red-letter map, shared by translations without overrides
+        self._red_letters: Dict[str, RedLetter] = {}
         self._current_root = (None, None)  # Initialize the current root as None
-        self._roots: Dict = {}                   # Dictionary to store root elements by translation
-        for ts in self.get_translations():
-            self._roots[ts] = self._get_root(ts)
+        # Both caches are shared with worker threads; their locks cover lookups and inserts, never a load or render
+        self._roots = SharedLRUCache(memory_budget)  # Loaded translations by name, least recently used first
+        self._chapters = SharedLRUCache(CHAPTER_CACHE_SIZE)  # Rendered chapters by (translation, book, chapter)
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
 
-    def _get_root(self, translation_str: str) -> ElementTree:
-        """Parse the XML file for a given translation and return the root element.
+    def _get_root(self, translation_str: str) -> TranslationStore:
+        """Open the stored form of a translation, building it from XML if it is missing or stale.
             Args:
                 translation_str: The name of the translation (e.g., 'kjv').
 
             Returns:
-                The parsed ElementTree for the translation.
+                The TranslationStore for the translation.
+        """
+        logger.info(f"Loading translation {translation_str}. . .")
+        return self.backend.load(self._translation_path(translation_str),
+                                 store_path(self.compiled_dir, translation_str, self.backend))
+
+    def _translation_path(self, translation_str: str) -> str:
+        """Return the path of the XML file for a given translation."""
+        return "{0}/{1}.xml".format(self.translations_dir, translation_str)
+
+    @traced
+    def load_root(self, translation_str: str) -> TranslationStore:
+        """Return the loaded translation, opening it on first use.
+            Args:
+                translation_str: The translation to load.
+
+            Returns:
+                The TranslationStore for the translation.
+        """
+        return self._roots.get_or_load(
+            translation_str,
+            lambda: self._get_root(translation_str),
+            lambda root: root.nbytes,
+        )
+
+    def _root(self, translation_str: Optional[str] = None) -> TranslationStore:
+        """Return the given translation, or the current one when translation_str is None."""
+        current_str, current_root = self._current_root
+        if translation_str is None or translation_str == current_str:
+            return current_root
+        return self.load_root(translation_str)
+
+    def invalidate(self, translation_str: str) -> None:
+        """Forget everything cached for a translation after its file changed or was removed.
+            The next access reopens the store, rebuilding it if the XML is newer. If the translation is
+            the current root, it is reopened right away (or unset if its file is gone); other
+            translations and their cached chapters are left untouched.
+            Args:
+                translation_str: The translation whose file changed.
+        """
+        present = exists(self._translation_path(translation_str))
+        if present:
+            # Rebuild a stale store first, so the next load_root only has to open it
+            build_all(self.translations_dir, self.compiled_dir, self.backend, [translation_str])
+        self._roots.discard(translation_str)
+        self._chapters.discard_where(lambda key: key[0] == translation_str)
+        self._red_letters.pop(translation_str, None)
+        if self._current_root[0] == translation_str:
+            self._current_root = (translation_str, self.load_root(translation_str)) if present else (None, None)
+        logger.info(f"Invalidated translation {translation_str}")
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return the translation cache counters (loads, hits, evictions, size and budget)."""
+        return self._roots.stats()
+
+    def chapter_cache_stats(self) -> Dict[str, int]:
+        """Return the rendered chapter cache counters (loads are misses; size and budget count chapters)."""
+        return self._chapters.stats()
+
+    def get_red_letter(self, translation_str: Optional[str] = None) -> RedLetter:
+        """Return the red-letter map of a translation, including its override file if one exists.
+            Args:
+                translation_str: The translation (defaults to the current root).
+
+            Returns:
+                The RedLetter for the translation.
         """
-        return ET.parse("{0}/{1}.xml".format(TRANSLATIONS_DIR, translation_str))
+        translation_str = translation_str or self._current_root[0]
+        if translation_str not in self._red_letters:
+            override = join(self.translations_dir, translation_str + RED_LETTER_OVERRIDE_SUFFIX)
+            self._red_letters[translation_str] = RedLetter(override_paths=[override]) if exists(override) else self.red_letter
+        return self._red_letters[translation_str]
 
+    @traced
     def set_root(self, translation_str: str) -> None:
         """Set the current root to a specific translation if not already set.
             Args:
@@ -43,8 +166,8 @@ class Reader:
         """
         if self._current_root[0] == translation_str:
             return
-        self._current_root = (translation_str, self._roots[translation_str])
-        logger.info(f"Current root set to: {self._current_root}")
+        self._current_root = (translation_str, self.load_root(translation_str))
+        logger.info(f"Current root set to: {translation_str}")
 
     def get_translations(self) -> List[str]:
         """Retrieve a list of available translation names by reading XML files in the translations directory.
@@ -52,107 +175,205 @@ class Reader:
                 A list of translation names (without the '.xml' extension).
         """
         return [
-            splitext(basename(f))[0] for f in glob("{0}/*.xml".format(TRANSLATIONS_DIR))
+            splitext(basename(f))[0] for f in glob("{0}/*.xml".format(self.translations_dir))
         ]
 
-    def get_books(self) -> List[str]:
+    @traced
+    def get_books(self, translation_str: Optional[str] = None) -> List[str]:
         """Return a list of books available in the current translation.
+            Args:
+                translation_str: The translation to read (defaults to the current root).
+
             Returns:
                 A list of book names as strings.
         """
-        return [bel.attrib["n"] for bel in self._current_root[1].findall("b")]
+        return list(self._root(translation_str).book_order)
 
-    def get_chapters(self, book_str: str) -> List[str]:
+    @traced
+    def get_chapters(self, book_str: str, translation_str: Optional[str] = None) -> List[str]:
         """Return a list of chapter numbers for a given book in the current translation.
             Args:
                 book_str: The book name.
+                translation_str: The translation to read (defaults to the current root).
 
             Returns:
                 A list of chapter numbers as strings.
         """
         if book_str:
-            return [chel.attrib["n"] for chel in self._current_root[1].find("b[@n='{0}']".format(book_str)).findall("c")]
-        print(f'Book string: {book_str}')
+            root = self._root(translation_str)
+            return [str(root.chapter_number(chapter_index)) for chapter_index in root.book_chapters(root.find_book(book_str))]
+        logger.debug("get_chapters called without a book")
         return None
     
-    def get_verses_elements(self, book_str: str, chapter_str: str) -> List[Element]:
-        """Retrieve XML elements for all verses in a given book and chapter.
+    @traced
+    def get_verse_entries(self, book_str: str, chapter_str: str, translation_str: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Retrieve the verses of a given book and chapter.
             Args:
                 book_str: The book name.
                 chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
 
             Returns:
-                A list of verse XML elements.
+                A list of (verse number, text) tuples; verse number '0' marks a section title.
         """
-        return (
-            self._current_root[1]
-            .find("b[@n='{0}']".format(book_str))
-            .find("c[@n='{0}']".format(chapter_str))
-            .findall("v")
-        )
+        root = self._root(translation_str)
+        return [(str(number), text) for number, text in root.chapter_entries(root.find_chapter(book_str, chapter_str))]
 
-    def get_verses(self, book_str: str, chapter_str: str) -> List[str]:
+    @traced
+    def get_verses(self, book_str: str, chapter_str: str, translation_str: Optional[str] = None) -> List[str]:
         """Return a list of verse numbers for a specific book and chapter.
             Args:
                 book_str: The book name.
                 chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
 
             Returns:
                 A list of verse numbers as strings.
         """
+        root = self._root(translation_str)
         return [
-            vel.attrib["n"] for vel in self.get_verses_elements(book_str, chapter_str)
+            str(root.verse_number(verse_index))
+            for verse_index in root.chapter_verses(root.find_chapter(book_str, chapter_str))
         ]
 
-    def get_chapter_text(self, book_str: str, chapter_str: str, verse_start: int = 1) -> List[Tuple[str, bool, bool]]:
-        """Return a list of tuples for each verse or title in a chapter.
+    def _render_chapter(self, book_str: str, chapter_str: str, translation_str: Optional[str]) -> RenderedChapter:
+        root = self._root(translation_str)
+        red_mask = self.get_red_letter(translation_str).chapter_mask(book_str, chapter_str)
+        rows, verse_rows, verse_numbers = [], [], []
+        for verse_number, text in root.chapter_entries(root.find_chapter(book_str, chapter_str)):
+            if verse_number == 0:
+                rows.append((text, False, True, 0))
+            else:
+                verse_rows.append(len(rows))
+                verse_numbers.append(verse_number)
+                rows.append((f"({verse_number}) {text}", bool(red_mask >> verse_number & 1), False, verse_number))
+        return RenderedChapter(rows, verse_rows, verse_numbers)
 
-        Each tuple contains:
-            - The text of the verse or title.
-            - A boolean indicating if it is a red-letter verse.
-            - A boolean indicating if it is a title.
+    @traced
+    def render_chapter(self, book_str: str, chapter_str: str, translation_str: Optional[str] = None) -> RenderedChapter:
+        """Return a chapter with every verse and title formatted for display, from the chapter cache when possible.
+            Args:
+                book_str: The book name.
+                chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
 
-        Args:
-            book_str: The book name.
-            chapter_str: The chapter number.
-            verse_start: The starting verse number (default is 1).
+            Returns:
+                The RenderedChapter.
+        """
+        translation_str = translation_str or self._current_root[0]
+        return self._chapters.get_or_load(
+            (translation_str, book_str, str(chapter_str)),
+            lambda: self._render_chapter(book_str, str(chapter_str), translation_str),
+            lambda _: 1,
+        )
 
-        Returns:
-            A list of (text, is_red, is_title) tuples for the chapter."""
-        verses_elements = self.get_verses_elements(book_str, chapter_str)
-        text_with_red = []
+    def cached_chapter(self, book_str: str, chapter_str: str, translation_str: Optional[str] = None) -> Optional[RenderedChapter]:
+        """Return a chapter from the chapter cache without rendering it, or None if it is not cached.
+            Args:
+                book_str: The book name.
+                chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
+        """
+        return self._chapters.get((translation_str or self._current_root[0], book_str, str(chapter_str)))
 
-        current_title = None
-        found_verse_start = False
+    def neighbor_chapters(self, book_str: str, chapter_str: str,
+                          translation_str: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Return the (book, chapter) before and after a chapter, crossing book boundaries.
+            Args:
+                book_str: The book name.
+                chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
 
-        for v in verses_elements:
-            verse_n = v.attrib["n"]
+            Returns:
+                Up to two (book, chapter) tuples, previous chapter first.
+        """
+        root = self._root(translation_str)
+        chapter_index = root.find_chapter(book_str, chapter_str)
+        return [
+            (root.book_name(root.chapter_book(index)), str(root.chapter_number(index)))
+            for index in (chapter_index - 1, chapter_index + 1) if 0 <= index < root.chapter_count
+        ]
 
-            if verse_n == "0":
-                current_title = v.text.strip()
-                # If we've already passed verse_start, show titles normally
-                if found_verse_start:
-                    text_with_red.append((current_title, False, True))
+    def prefetch_neighbors(self, book_str: str, chapter_str: str, translation_str: Optional[str] = None) -> None:
+        """Render the chapters before and after a chapter in the background, so reading on never waits.
+            Args:
+                book_str: The book name.
+                chapter_str: The chapter number.
+                translation_str: The translation to read (defaults to the current root).
+        """
+        translation_str = translation_str or self._current_root[0]
+        for neighbor_book, neighbor_chapter in self.neighbor_chapters(book_str, chapter_str, translation_str):
+            if (translation_str, neighbor_book, neighbor_chapter) in self._chapters:
+                continue
+            self._prefetcher.submit(self.render_chapter, neighbor_book, neighbor_chapter, translation_str)
 
-            elif int(verse_n) >= int(verse_start):
-                if not found_verse_start:
-                    # First verse >= verse_start — show the title that was last seen
-                    if current_title:
-                        text_with_red.append((current_title, False, True))
-                    found_verse_start = True
+    @traced
+    def iter_range(self, book_str: str, chapter_str: str, verse_start: int = 1,
+                   end: Optional[Tuple[str, str, Optional[int]]] = None,
+                   translation_str: Optional[str] = None) -> Iterator[RangeEntry]:
+        """Lazily yield the verses and section titles of a range, crossing chapter and book boundaries in order.
+            Args:
+                book_str: The book of the first verse.
+                chapter_str: The chapter of the first verse.
+                verse_start: The first verse number; the section title just above it is included.
+                end: (book, chapter, last verse) ending the range, with None as the verse for the whole
+                    chapter; None to read to the end of the translation.
+                translation_str: The translation to read (defaults to the current root).
 
-                is_red = self.red_letter.is_red_letter(book_str, chapter_str, int(verse_n))
-                text_with_red.append((f"({verse_n}) {v.text}", is_red, False))
+            Returns:
+                An iterator of RangeEntry records; only the chapters being read are decoded.
+        """
+        translation_str = translation_str or self._current_root[0]
+        root = self._root(translation_str)
+        red_letter = self.get_red_letter(translation_str)
+        first = root.find_chapter(book_str, chapter_str)
+        last, last_verse = root.chapter_count - 1, None
+        if end is not None:
+            last, last_verse = root.find_chapter(end[0], end[1]), end[2]
+            if last < first:
+                raise ValueError(f"Range ends before {book_str} {chapter_str}")
 
-        return text_with_red
+        for chapter_index in range(first, last + 1):
+            book = root.book_name(root.chapter_book(chapter_index))
+            chapter = root.chapter_number(chapter_index)
+            red_mask = red_letter.chapter_mask(book, str(chapter))
+            started = chapter_index != first
+            titles: List[RangeEntry] = []  # titles are held back until the verse they introduce is yielded
+            for verse_number, text in root.chapter_entries(chapter_index):
+                if verse_number == 0:
+                    title = RangeEntry(book, chapter, 0, text, False, True)
+                    titles = titles + [title] if started else [title]  # before the range only the nearest title counts
+                    continue
+                if chapter_index == last and last_verse is not None and verse_number > last_verse:
+                    break
+                if not started:
+                    if verse_number < verse_start:
+                        continue
+                    started = True
+                yield from titles
+                titles = []
+                yield RangeEntry(book, chapter, verse_number, text, bool(red_mask >> verse_number & 1), False)
+            else:
+                if started:
+                    yield from titles
 
-    
-    
+    def get_chapter_text(self, book_str: str, chapter_str: str, verse_start: int = 1,
+                         translation_str: Optional[str] = None) -> List[Tuple[str, bool, bool]]:
+        """Return a list of tuples for each verse or title in a chapter.
 
+        Each tuple contains:
+            - The text of the verse or title.
+            - A boolean indicating if it is a red-letter verse.
+            - A boolean indicating if it is a title.
 
+        The chapter is rendered once and cached; other values of verse_start slice the cached chapter.
 
+        Args:
+            book_str: The book name.
+            chapter_str: The chapter number.
+            verse_start: The starting verse number (default is 1).
+            translation_str: The translation to read (defaults to the current root).
 
-        
-        
-    
-    
\ No newline at end of file
+        Returns:
+            A list of (text, is_red, is_title) tuples for the chapter."""
+        return self.render_chapter(book_str, chapter_str, translation_str).from_verse(int(verse_start))
@@ -0,0 +1,103 @@
+import re
+from typing import List, NamedTuple, Optional
+from .books import SINGLE_CHAPTER_BOOKS, resolve_book
+
+BOOK_RE = re.compile(r"^\s*(?P<book>(?:[1-3]|i{1,3}\b)?\s*[^\W\d][^\d:]*?)\s*(?P<rest>\d.*)?$", re.IGNORECASE)
+POINT_RE = re.compile(r"^(\d+)(?:[:.](\d+))?$")
+
+
+class ReferenceParseError(ValueError):
+    """Raised when a reference cannot be parsed."""
+
+
+class Reference(NamedTuple):
+    book: str                      # canonical book name
+    start_chapter: Optional[int]   # None for a whole book
+    start_verse: Optional[int]     # None for whole chapters
+    end_chapter: Optional[int]
+    end_verse: Optional[int]
+
+    def __str__(self) -> str:
+        if self.start_chapter is None:
+            return self.book
+        start = f"{self.start_chapter}" + (f":{self.start_verse}" if self.start_verse is not None else "")
+        if (self.end_chapter, self.end_verse) == (self.start_chapter, self.start_verse):
+            return f"{self.book} {start}"
+        if self.end_chapter == self.start_chapter and self.start_verse is not None:
+            return f"{self.book} {start}-{self.end_verse}"
+        end = f"{self.end_chapter}" + (f":{self.end_verse}" if self.end_verse is not None else "")
+        return f"{self.book} {start}-{end}"
+
+
+def _point(text: str, source: str):
+    match = POINT_RE.match(text.strip())
+    if not match:
+        raise ReferenceParseError(f"Cannot parse {text!r} in {source!r}")
+    return int(match.group(1)), (int(match.group(2)) if match.group(2) else None)
+
+
+def _parse_range(book: str, text: str, chapter: Optional[int], source: str) -> Reference:
+    """
+    Parse one range of a reference ('3:16-18', '8', '1:1-2:3', or '13' continuing a previous chapter).
+
+    :param chapter: Chapter of the previous range when text continues it after a comma, else None.
+    """
+    start_text, _, end_text = text.replace("–", "-").partition("-")
+    first, second = _point(start_text, source)
+
+    if book in SINGLE_CHAPTER_BOOKS and second is None and chapter is None:
+        start_chapter, start_verse = 1, first  # 'Jude 3' is verse 3 of the only chapter
+    elif chapter is not None and second is None:
+        start_chapter, start_verse = chapter, first  # ', 13' after 'John 3:16' is verse 13
+    else:
+        start_chapter, start_verse = first, second
+
+    if not end_text.strip():
+        return Reference(book, start_chapter, start_verse, start_chapter, start_verse)
+
+    end_first, end_second = _point(end_text, source)
+    if end_second is not None:
+        end_chapter, end_verse = end_first, end_second
+    elif start_verse is not None:
+        end_chapter, end_verse = start_chapter, end_first
+    else:
+        end_chapter, end_verse = end_first, None
+    if (end_chapter, end_verse or 0) < (start_chapter, start_verse or 0):
+        raise ReferenceParseError(f"Range ends before it starts in {source!r}")
+    return Reference(book, start_chapter, start_verse, end_chapter, end_verse)
+
+
+def parse_references(text: str) -> List[Reference]:
+    """
+    Parse references such as 'John 3:16-18; Rom 8', '1 Cor 13:4-7, 13' or 'Gen 1:1-2:3'.
+
+    Books may be abbreviated. Parts separated by ';' start a new reference (and may omit the book
+    to reuse the previous one); parts separated by ',' continue the previous chapter.
+
+    :param text: The references to parse.
+    :return: The parsed references in order.
+    :raises ReferenceParseError: If any part cannot be parsed or names an unknown book.
+    """
+    references: List[Reference] = []
+    book: Optional[str] = None
+    for part in filter(None, (part.strip() for part in text.split(";"))):
+        match = BOOK_RE.match(part)
+        if match and match.group("book").strip():
+            book = resolve_book(match.group("book"))
+            if book is None:
+                raise ReferenceParseError(f"Unknown book {match.group('book').strip()!r}")
+            rest = match.group("rest") or ""
+        elif book is not None and part[0].isdigit():
+            rest = part  # '; 5:1' reuses the previous book
+        else:
+            raise ReferenceParseError(f"Cannot parse {part!r}")
+
+        if not rest.strip():
+            references.append(Reference(book, None, None, None, None))
+            continue
+        chapter: Optional[int] = None
+        for piece in filter(None, (piece.strip() for piece in rest.split(","))):
+            reference = _parse_range(book, piece, chapter, part)
+            references.append(reference)
+            chapter = reference.end_chapter if reference.end_verse is not None else None
+    return references
@@ -0,0 +1,460 @@
+import heapq
+import math
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from itertools import chain, repeat
+from os.path import join
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .books import testament as book_testament
+from .cache import UNBOUNDED, SharedLRUCache
+from .storage import TranslationStore, is_fresh
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_EXTENSION = ".idx"
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"\w+(?:'\w+)?")
+# A '-' starting a token is a separate NOT operator, so it also applies to "phrases" and (groups)
+QUERY_TOKEN_RE = re.compile(r'(?<![^\s(])-(?=[^\s)])|"[^"]*"|\(|\)|[^\s()"]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    :param text: Verse text or query text.
+    :return: The list of tokens in order.
+    """
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchHit(NamedTuple):
+    book: str
+    chapter: str
+    verse: str
+    text: str
+    score: float
+
+
+class SearchResults(NamedTuple):
+    total: int
+    page: int
+    page_size: int
+    hits: List[SearchHit]
+
+
+class SearchIndex:
+    """
+    Positional inverted index over the verses of one translation.
+
+    Documents are verse indices of the TranslationStore (section titles are not indexed).
+    For every term the index keeps three parallel arrays: the documents containing it, the
+    term frequency in each document, and the positions of every occurrence grouped per document.
+    """
+    def __init__(self) -> None:
+        self.terms: Dict[str, Tuple[array, array, array]] = {}
+        self.doc_lengths = array("H")
+        self.verse_chapter = array("I")
+        self.chapter_book = array("I")
+        self.doc_count = 0
+        self.avg_length = 0.0
+        self._vocabulary: Optional[List[str]] = None
+        self._occurrences: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, translation: TranslationStore) -> "SearchIndex":
+        """
+        Tokenize every verse of a translation and build its index.
+
+        :param translation: The translation to index.
+        :return: The built SearchIndex.
+        """
+        index = cls()
+        postings: Dict[str, List[list]] = {}
+        total_length = 0
+        for book_index in range(translation.book_count):
+            for chapter_index in translation.book_chapters(book_index):
+                index.chapter_book.append(book_index)
+                entries = translation.chapter_entries(chapter_index)
+                for verse_index, (verse_number, text) in zip(translation.chapter_verses(chapter_index), entries):
+                    index.verse_chapter.append(chapter_index)
+                    if verse_number == 0:
+                        index.doc_lengths.append(0)
+                        continue
+                    tokens = tokenize(text)
+                    index.doc_lengths.append(min(len(tokens), 0xFFFF))
+                    total_length += len(tokens)
+                    index.doc_count += 1
+                    for position, token in enumerate(tokens):
+                        entry = postings.setdefault(token, [array("I"), array("H"), array("H")])
+                        if entry[0] and entry[0][-1] == verse_index:
+                            entry[1][-1] += 1
+                        else:
+                            entry[0].append(verse_index)
+                            entry[1].append(1)
+                        entry[2].append(min(position, 0xFFFF))
+        index.terms = {term: tuple(entry) for term, entry in postings.items()}
+        index.avg_length = total_length / index.doc_count if index.doc_count else 0.0
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        """Load an index previously written with save()."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("Unsupported search index version")
+        index = cls()
+        for name in ("terms", "doc_lengths", "verse_chapter", "chapter_book", "doc_count", "avg_length"):
+            setattr(index, name, data[name])
+        return index
+
+    def save(self, path: str) -> None:
+        """Persist the index to disk."""
+        data = {
+            "version": INDEX_VERSION,
+            "terms": self.terms,
+            "doc_lengths": self.doc_lengths,
+            "verse_chapter": self.verse_chapter,
+            "chapter_book": self.chapter_book,
+            "doc_count": self.doc_count,
+            "avg_length": self.avg_length,
+        }
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Return every indexed term starting with prefix."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.terms)
+        start = bisect_left(self._vocabulary, prefix)
+        matches = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def term_idf(self, term: str) -> float:
+        """Return the BM25 inverse document frequency of term."""
+        entry = self.terms.get(term)
+        docs = len(entry[0]) if entry is not None else 0
+        return math.log(1 + (self.doc_count - docs + 0.5) / (docs + 0.5))
+
+    def bm25(self, idf: float, tf: int, doc: int) -> float:
+        """Return the BM25 score of a term with the given idf occurring tf times in doc."""
+        norm = BM25_K1 * (1 - BM25_B) + BM25_K1 * BM25_B * self.doc_lengths[doc] / (self.avg_length or 1.0)
+        return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def term_scores(self, term: str) -> Dict[int, float]:
+        """Return BM25 scores of every document containing term."""
+        entry = self.terms.get(term)
+        if entry is None:
+            return {}
+        docs, tfs, _ = entry
+        idf = self.term_idf(term)
+        lengths = self.doc_lengths
+        norm = BM25_K1 * (1 - BM25_B)
+        scale = BM25_K1 * BM25_B / (self.avg_length or 1.0)
+        return {
+            doc: idf * tf * (BM25_K1 + 1) / (tf + norm + scale * lengths[doc])
+            for doc, tf in zip(docs, tfs)
+        }
+
+    def term_occurrences(self, term: str) -> array:
+        """
+        Return every occurrence of term as (document << 16 | position), in ascending order.
+        Built on first use and kept, so phrase queries compare whole occurrence lists at once.
+        """
+        occurrences = self._occurrences.get(term)
+        if occurrences is None:
+            docs, tfs, positions = self.terms[term]
+            documents = chain.from_iterable(map(repeat, docs, tfs))
+            occurrences = array("Q", [doc << 16 | position for doc, position in zip(documents, positions)])
+            self._occurrences[term] = occurrences
+        return occurrences
+
+    def term_frequency(self, term: str, doc: int) -> int:
+        """Return how often term occurs in doc."""
+        docs, tfs, _ = self.terms[term]
+        slot = bisect_left(docs, doc)
+        return tfs[slot] if slot < len(docs) and docs[slot] == doc else 0
+
+    def all_documents(self) -> Dict[int, float]:
+        """Return every indexed document with a zero score."""
+        return {doc: 0.0 for doc, length in enumerate(self.doc_lengths) if length}
+
+
+class _Node:
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        raise NotImplementedError
+
+
+class _Term(_Node):
+    def __init__(self, term: str) -> None:
+        self.term = term
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        return index.term_scores(self.term)
+
+
+class _Prefix(_Node):
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for term in index.expand_prefix(self.prefix):
+            for doc, score in index.term_scores(term).items():
+                scores[doc] = max(scores.get(doc, 0.0), score)
+        return scores
+
+
+class _Phrase(_Node):
+    def __init__(self, terms: List[str]) -> None:
+        self.terms = terms
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        if not self.terms:
+            return {}
+        if len(self.terms) == 1:
+            return index.term_scores(self.terms[0])
+        if any(term not in index.terms for term in self.terms):
+            return {}
+        # Phrase starts are the occurrences of the first term that every later term follows in turn;
+        # shifting each term's occurrences back by its offset turns that into plain set intersections
+        starts = set(index.term_occurrences(self.terms[0]))
+        for offset, term in enumerate(self.terms[1:], 1):
+            starts.intersection_update(map((-offset).__add__, index.term_occurrences(term)))
+            if not starts:
+                return {}
+        matches = {key >> 16 for key in starts}
+        idfs = [index.term_idf(term) for term in self.terms]
+        return {doc: sum(index.bm25(idf, index.term_frequency(term, doc), doc) for term, idf in zip(self.terms, idfs))
+                for doc in matches}
+
+
+class _Not(_Node):
+    def __init__(self, child: _Node) -> None:
+        self.child = child
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        excluded = self.child.evaluate(index)
+        return {doc: score for doc, score in index.all_documents().items() if doc not in excluded}
+
+
+class _And(_Node):
+    def __init__(self, children: List[_Node]) -> None:
+        self.children = children
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        positives = [child for child in self.children if not isinstance(child, _Not)]
+        negatives = [child.child for child in self.children if isinstance(child, _Not)]
+        if not positives:
+            scores = index.all_documents()
+        else:
+            results = sorted((child.evaluate(index) for child in positives), key=len)
+            scores = dict(results[0])
+            for result in results[1:]:
+                scores = {doc: score + result[doc] for doc, score in scores.items() if doc in result}
+        for child in negatives:
+            excluded = child.evaluate(index)
+            scores = {doc: score for doc, score in scores.items() if doc not in excluded}
+        return scores
+
+
+class _Or(_Node):
+    def __init__(self, children: List[_Node]) -> None:
+        self.children = children
+
+    def evaluate(self, index: SearchIndex) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for child in self.children:
+            for doc, score in child.evaluate(index).items():
+                scores[doc] = scores.get(doc, 0.0) + score
+        return scores
+
+
+class _QueryParser:
+    """
+    Recursive-descent parser for the query language.
+
+    Words are ANDed implicitly; supported operators are AND, OR, NOT (or a leading '-'),
+    parentheses, "quoted phrases" and trailing '*' for prefix matches.
+    """
+    def __init__(self, query: str) -> None:
+        self.tokens = QUERY_TOKEN_RE.findall(query)
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> Optional[_Node]:
+        children = []
+        while True:
+            node = self._or()
+            if node is not None:
+                children.append(node)
+            if self._peek() is None:
+                break
+            self.pos += 1  # an unmatched ')' is skipped like other punctuation; the rest is still ANDed
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _And(children)
+
+    def _or(self) -> Optional[_Node]:
+        children = [self._and()]
+        while self._peek() == "OR":
+            self.pos += 1
+            children.append(self._and())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _Or(children)
+
+    def _and(self) -> Optional[_Node]:
+        children = []
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self.pos += 1
+                continue
+            child = self._unary()
+            if child is not None:
+                children.append(child)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else _And(children)
+
+    def _unary(self) -> Optional[_Node]:
+        token = self.tokens[self.pos]
+        if token in ("NOT", "-"):
+            self.pos += 1
+            if self._peek() in (None, "OR", ")"):
+                return None
+            child = self._unary()
+            return _Not(child) if child is not None else None
+        return self._atom()
+
+    def _atom(self) -> Optional[_Node]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        if token == "(":
+            node = self._or()
+            if self._peek() == ")":
+                self.pos += 1
+            return node
+        if token.startswith('"'):
+            return _Phrase(tokenize(token.strip('"')))
+        if token.endswith("*") and tokenize(token):
+            return _Prefix(tokenize(token)[0])
+        terms = tokenize(token)
+        if not terms:
+            return None
+        return _Term(terms[0]) if len(terms) == 1 else _Phrase(terms)
+
+
+def parse_query(query: str) -> Optional[_Node]:
+    """Parse a query string into an evaluable tree (None for an empty query)."""
+    return _QueryParser(query).parse()
+
+
+class SearchEngine:
+    """
+    Full-text search over the translations known to a Reader.
+
+    Indexes are built on first use, persisted next to the compiled translations and
+    reloaded on later runs as long as they are newer than the translation XML.
+    """
+    def __init__(self, reader) -> None:
+        """
+        :param reader: The Reader providing translations.
+        """
+        self.reader = reader
+        # Shared by every window's worker threads; each translation is loaded or built at most once at a time
+        self._indexes = SharedLRUCache(UNBOUNDED)
+
+    def _index_path(self, translation_str: str) -> str:
+        return join(self.reader.compiled_dir, translation_str + INDEX_EXTENSION)
+
+    def index_for(self, translation_str: str) -> SearchIndex:
+        """
+        Return the search index of a translation, loading or building it as needed.
+        Threads asking for a translation that is being loaded wait for that load.
+
+        :param translation_str: Name of the translation.
+        :return: The SearchIndex for the translation.
+        """
+        return self._indexes.get_or_load(translation_str, lambda: self._load_index(translation_str), lambda _: 1)
+
+    def _load_index(self, translation_str: str) -> SearchIndex:
+        xml_path = self.reader._translation_path(translation_str)
+        index_path = self._index_path(translation_str)
+        index = None
+        if is_fresh(xml_path, index_path):
+            try:
+                index = SearchIndex.load(index_path)
+            except (OSError, ValueError, pickle.UnpicklingError, KeyError) as e:
+                logger.error(f"Ignoring unreadable search index {index_path}: {e}")
+        if index is None:
+            logger.info(f"Building search index for {translation_str}. . .")
+            index = SearchIndex.build(self.reader.load_root(translation_str))
+            try:
+                index.save(index_path)
+            except OSError as e:
+                logger.error(f"Could not write search index {index_path}: {e}")
+        return index
+
+    def invalidate(self, translation_str: str) -> None:
+        """Drop the loaded search index of a translation; it is reloaded or rebuilt on next use."""
+        self._indexes.discard(translation_str)
+
+    def search(self, translation_str: str, query: str, book: Optional[str] = None,
+               testament: Optional[str] = None, page: int = 1, page_size: int = 20) -> SearchResults:
+        """
+        Run a query against a translation and return one page of ranked results.
+
+        :param translation_str: Name of the translation to search.
+        :param query: Query text (words, "phrases", prefix*, AND/OR/NOT, parentheses).
+        :param book: Restrict results to this book.
+        :param testament: Restrict results to 'OT' or 'NT'.
+        :param page: 1-based page number.
+        :param page_size: Number of hits per page.
+        :return: SearchResults with the total number of matches and the requested hits.
+        """
+        tree = parse_query(query)
+        if tree is None:
+            return SearchResults(0, page, page_size, [])
+        index = self.index_for(translation_str)
+        translation = self.reader.load_root(translation_str)
+        scores = tree.evaluate(index)
+
+        if book is not None or testament is not None:
+            allowed = set()
+            for book_index, name in enumerate(translation.book_order):
+                if book is not None and name != book:
+                    continue
+                if testament is not None and book_testament(name) != testament.upper():
+                    continue
+                allowed.add(book_index)
+            chapter_book, verse_chapter = index.chapter_book, index.verse_chapter
+            scores = {doc: score for doc, score in scores.items() if chapter_book[verse_chapter[doc]] in allowed}
+
+        start = (max(page, 1) - 1) * page_size
+        ranked = heapq.nsmallest(start + page_size, scores.items(), key=lambda item: (-item[1], item[0]))
+        hits = []
+        for doc, score in ranked[start:]:
+            chapter_index = index.verse_chapter[doc]
+            hits.append(SearchHit(
+                translation.book_order[index.chapter_book[chapter_index]],
+                str(translation.chapter_number(chapter_index)),
+                str(translation.verse_number(doc)),
+                translation.verse_text(doc),
+                score,
+            ))
+        return SearchResults(len(scores), page, page_size, hits)
@@ -0,0 +1,344 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from .cache import LRUCache
+from .query import Query, QueryError
+from .references import ReferenceParseError
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+RESPONSE_CACHE_BUDGET = 32 * 1024 * 1024  # Bytes of encoded JSON responses kept for hot chapters
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024  # Request bodies are read and discarded; larger ones are refused
+KEEP_ALIVE_TIMEOUT = 15  # Seconds an idle keep-alive connection stays open
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    etag: str
+
+
+def _response(status: int, payload) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(status, body, '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"')
+
+
+class BibleApi:
+    """
+    Routes API paths to JSON documents built from a shared Reader.
+
+    Routes (translation, book and chapter are path segments; books may be abbreviated):
+        /translations
+        /translations/<translation>
+        /translations/<translation>/<book>
+        /translations/<translation>/<book>/<chapter>[?verses=16-18]
+        /translations/<translation>/passage?ref=John+3:16-18;+Rom+8
+
+    Successful responses are cached by path in an LRU cache, so hot chapters are served without
+    touching the Reader; building a response can block on loading a translation and runs on the
+    server's executor. Each translation's cached responses are dropped (and its store reloaded)
+    once its XML file changes on disk, and the translation list once the directory changes.
+    """
+    def __init__(self, reader, cache_budget: int = RESPONSE_CACHE_BUDGET) -> None:
+        """
+        :param reader: The Reader providing translations.
+        :param cache_budget: Bytes of encoded responses to cache.
+        """
+        self.reader = reader
+        self._queries: Dict[str, Query] = {}
+        self._responses = LRUCache(cache_budget)
+        self._stamps: Dict[Optional[str], Optional[Tuple[int, int]]] = {}  # translation (None: list) -> file state
+        self._lock = threading.Lock()
+
+    def _translation_of(self, target: str) -> Optional[str]:
+        """Return the translation a request target reads, or None for the translation list."""
+        parts = urlsplit(target).path.strip("/").split("/")
+        return unquote(parts[1]) if len(parts) > 1 and parts[0] == "translations" else None
+
+    def _stamp(self, translation_str: Optional[str]) -> Optional[Tuple[int, int]]:
+        """Return (mtime, size) of a translation's XML file (or of the directory), or None if it is missing."""
+        path = self.reader.translations_dir if translation_str is None else self.reader._translation_path(translation_str)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_current(self, translation_str: Optional[str]) -> bool:
+        stamp = self._stamp(translation_str)
+        with self._lock:
+            return translation_str in self._stamps and self._stamps[translation_str] == stamp
+
+    def refresh(self, translation_str: Optional[str]) -> None:
+        """Reload a translation whose file changed since its responses were cached (runs on the executor)."""
+        stamp = self._stamp(translation_str)
+        with self._lock:
+            known = self._stamps.get(translation_str, stamp)
+            self._stamps[translation_str] = stamp
+        if known != stamp:
+            logger.info(f"{translation_str or 'Translation list'} changed on disk; dropping cached responses")
+            if translation_str is not None:
+                self.reader.invalidate(translation_str)
+            self.invalidate(translation_str)
+
+    def cached(self, target: str) -> Optional[Response]:
+        """Return the cached response for a request target, if any and its translation is unchanged."""
+        if not self._is_current(self._translation_of(target)):
+            return None  # respond() reloads the translation off the event loop
+        with self._lock:
+            return self._responses.get(target)
+
+    def query(self, translation_str: str) -> Query:
+        """Return the (cached) Query of a translation."""
+        with self._lock:
+            query = self._queries.get(translation_str)
+        if query is None:
+            if translation_str not in self.reader.get_translations():
+                raise HttpError(404, f"Unknown translation {translation_str!r}")
+            query = Query(self.reader, translation_str)
+            with self._lock:
+                self._queries[translation_str] = query
+        return query
+
+    def invalidate(self, translation_str: Optional[str] = None) -> None:
+        """Drop the cached responses of one translation (and the translation list), or the list alone if None."""
+        with self._lock:
+            self._queries.pop(translation_str, None)
+            translation = self._translation_of
+            for key in [key for key in self._responses.keys() if translation(key) in (None, translation_str)]:
+                self._responses.discard(key)
+
+    def respond(self, target: str) -> Response:
+        """
+        Build (and cache) the response for a request target.
+
+        :param target: The request path and query string.
+        :return: The Response; errors are returned as JSON with their status.
+        """
+        self.refresh(self._translation_of(target))
+        try:
+            response = _response(200, self._route(target))
+        except HttpError as e:
+            return _response(e.status, {"error": str(e)})
+        except Exception:
+            logger.exception(f"Error serving {target}")
+            return _response(500, {"error": "Internal server error"})
+        with self._lock:
+            self._responses.put(target, response, len(response.body) + len(target))
+        return response
+
+    def _route(self, target: str):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if not parts or parts[0] != "translations" or len(parts) > 4:
+            raise HttpError(404, f"No route for {url.path}")
+        if len(parts) == 1:
+            return {"translations": sorted(self.reader.get_translations())}
+
+        query = self.query(parts[1])
+        if len(parts) == 2:
+            return {"translation": query.translation_str, "books": self.reader.get_books(translation_str=parts[1])}
+        if parts[2] == "passage" and len(parts) == 3:
+            return self._passage(query, params.get("ref", ""))
+
+        book = query.book_name(parts[2])
+        if book is None:
+            raise HttpError(404, f"{query.translation_str} has no book {parts[2]!r}")
+        if len(parts) == 3:
+            return {"translation": query.translation_str, "book": book, "chapters": query.chapters(book)}
+        return self._chapter(query, book, parts[3], params.get("verses"))
+
+    def _passage(self, query: Query, ref: str):
+        try:
+            records = query.run(ref)
+        except ReferenceParseError as e:
+            raise HttpError(400, str(e))
+        except QueryError as e:
+            raise HttpError(404, str(e))
+        return {
+            "translation": query.translation_str,
+            "ref": ref,
+            "verses": [{**record._asdict(), "reference": record.reference} for record in records],
+        }
+
+    def _chapter(self, query: Query, book: str, chapter_str: str, verses: Optional[str]):
+        first, last = 1, None
+        if verses:
+            start, _, end = verses.partition("-")
+            try:
+                first, last = int(start), int(end or start)
+            except ValueError:
+                raise HttpError(400, f"Invalid verse range {verses!r}")
+        try:
+            entries = self.reader.get_verse_entries(book, chapter_str, query.translation_str)
+        except KeyError:
+            raise HttpError(404, f"{query.translation_str} has no chapter {book} {chapter_str}")
+
+        mask = self.reader.get_red_letter(query.translation_str).chapter_mask(book, chapter_str)
+        items: List[dict] = []
+        title: Optional[str] = None
+        for verse_str, text in entries:
+            verse = int(verse_str)
+            if verse == 0:
+                title = text  # section titles are attached to the verse that follows them
+                continue
+            if verse >= first and (last is None or verse <= last):
+                item = {"verse": verse, "text": text, "red": bool(mask >> verse & 1)}
+                if title is not None:
+                    item["title"] = title
+                items.append(item)
+            title = None
+        return {"translation": query.translation_str, "book": book, "chapter": int(chapter_str), "verses": items}
+
+
+class ApiServer:
+    """
+    Minimal asyncio HTTP/1.1 server for BibleApi: GET and HEAD only, keep-alive, and ETag
+    conditional requests (If-None-Match answers 304 without a body).
+    """
+    def __init__(self, api: BibleApi, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: int = 4) -> None:
+        """
+        :param api: The BibleApi answering requests.
+        :param host: Interface to listen on.
+        :param port: Port to listen on (0 picks a free port).
+        :param max_workers: Threads building uncached responses; bounds concurrent translation loads.
+        """
+        self.api = api
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api")
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._serve_connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"API server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def _read_request(self, stream: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+        try:
+            head = await asyncio.wait_for(stream.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "Request headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Request body too large")
+        if length:
+            await stream.readexactly(length)  # request bodies are not used
+        return method, target, version, headers
+
+    async def _serve_connection(self, stream: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await self._read_request(stream)
+                except HttpError as e:
+                    self._write(writer, _response(e.status, {"error": str(e)}), False, False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+
+                if method not in ("GET", "HEAD"):
+                    response = _response(405, {"error": f"Method {method} not allowed"})
+                else:
+                    response = self.api.cached(target) or await loop.run_in_executor(self.executor, self.api.respond, target)
+                not_modified = response.status == 200 and response.etag in headers.get("if-none-match", "")
+                self._write(writer, response, keep_alive, method == "HEAD", not_modified)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, response: Response, keep_alive: bool, head_only: bool,
+               not_modified: bool = False) -> None:
+        status = 304 if not_modified else response.status
+        body = b"" if head_only or not_modified else response.body
+        header = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {0 if not_modified else len(response.body)}\r\n"
+            f"ETag: {response.etag}\r\n"
+            f"Cache-Control: no-cache\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(header.encode("latin-1") + body)
+
+
+def serve(reader, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: int = 4) -> None:
+    """
+    Serve the API until interrupted.
+
+    :param reader: The Reader providing translations.
+    :param host: Interface to listen on.
+    :param port: Port to listen on.
+    :param max_workers: Threads building uncached responses.
+    """
+    server = ApiServer(BibleApi(reader), host, port, max_workers)
+
+    async def run() -> None:
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}/translations", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+from array import array
+from typing import List, Optional, Tuple
+from .importer import ImportReport, ProgressCallback, import_translation
+from .logs import get_logger
+from .storage import StorageBackend, TranslationStore, build_lock, is_fresh
+
+logger = get_logger(__name__)
+
+SQLITE_EXTENSION = ".sqlite"
+SQLITE_FORMAT_VERSION = "1"
+PAGE_CACHE_KIB = 8 * 1024  # SQLite page cache per open translation
+INSERT_BATCH = 5000  # Verses inserted per executemany call while importing
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE books (id INTEGER PRIMARY KEY, name TEXT NOT NULL, first_chapter INTEGER NOT NULL, chapter_count INTEGER NOT NULL);
+CREATE TABLE chapters (id INTEGER PRIMARY KEY, book_id INTEGER NOT NULL, number INTEGER NOT NULL,
+                       first_verse INTEGER NOT NULL, verse_count INTEGER NOT NULL);
+CREATE TABLE verses (id INTEGER PRIMARY KEY, chapter_id INTEGER NOT NULL, number INTEGER NOT NULL, text TEXT NOT NULL);
+CREATE INDEX chapters_by_book ON chapters (book_id, number);
+CREATE INDEX verses_by_chapter ON verses (chapter_id, number);
+CREATE VIRTUAL TABLE verses_fts USING fts5 (text, content='verses', content_rowid='id');
+"""
+
+
+class SqliteTranslation(TranslationStore):
+    """
+    A translation stored in an SQLite database built once from its XML.
+
+    Only the small book and chapter tables are read into memory when the database is opened;
+    verse text is fetched on demand through the indexed verses table, so startup is instant and
+    the resident footprint stays small. The database file is opened read-only and can be shared
+    by any number of processes. Verse text is also indexed in an FTS5 table (see search_text).
+    """
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Path of the database file.
+        """
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()  # One connection is shared by the GUI thread and the workers
+        self._connection.execute(f"PRAGMA cache_size = -{PAGE_CACHE_KIB}")
+        version = self._connection.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        if version is None or version[0] != SQLITE_FORMAT_VERSION:
+            self._connection.close()
+            raise ValueError("Unsupported SQLite translation format")
+
+        self._book_rows: List[Tuple[str, int, int]] = self._connection.execute(
+            "SELECT name, first_chapter, chapter_count FROM books ORDER BY id").fetchall()
+        # number, first verse, verse count of every chapter, flattened like the compiled format's table
+        self._chapter_table = array("I")
+        for row in self._connection.execute("SELECT number, first_verse, verse_count FROM chapters ORDER BY id"):
+            self._chapter_table.extend(row)
+        self.book_count = len(self._book_rows)
+        self.chapter_count = len(self._chapter_table) // 3
+        self.verse_count = self._connection.execute("SELECT count(*) FROM verses").fetchone()[0]
+        self.nbytes = PAGE_CACHE_KIB * 1024 + 200 * self.book_count + self._chapter_table.itemsize * len(self._chapter_table)
+        self._build_index()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def book_name(self, book_index: int) -> str:
+        return self._book_rows[book_index][0]
+
+    def book_chapters(self, book_index: int) -> range:
+        _, first, count = self._book_rows[book_index]
+        return range(first, first + count)
+
+    def chapter_number(self, chapter_index: int) -> int:
+        return self._chapter_table[chapter_index * 3]
+
+    def chapter_verses(self, chapter_index: int) -> range:
+        first = self._chapter_table[chapter_index * 3 + 1]
+        return range(first, first + self._chapter_table[chapter_index * 3 + 2])
+
+    def _verse(self, verse_index: int) -> Tuple[int, str]:
+        with self._lock:
+            row = self._connection.execute("SELECT number, text FROM verses WHERE id = ?", (verse_index,)).fetchone()
+        if row is None:
+            raise IndexError(verse_index)
+        return row
+
+    def verse_number(self, verse_index: int) -> int:
+        return self._verse(verse_index)[0]
+
+    def verse_text(self, verse_index: int) -> str:
+        return self._verse(verse_index)[1]
+
+    def chapter_entries(self, chapter_index: int) -> List[Tuple[int, str]]:
+        verses = self.chapter_verses(chapter_index)
+        with self._lock:
+            return self._connection.execute(
+                "SELECT number, text FROM verses WHERE id >= ? AND id < ? ORDER BY id", (verses.start, verses.stop)
+            ).fetchall()
+
+    def search_text(self, match: str, limit: int = 50) -> List[int]:
+        """
+        Full-text search with SQLite FTS5.
+
+        :param match: An FTS5 MATCH expression, e.g. 'love NEAR faith' or '"living water"'.
+        :param limit: Maximum number of verses returned.
+        :return: Verse indices, best match first.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT rowid FROM verses_fts WHERE verses_fts MATCH ? ORDER BY rank LIMIT ?", (match, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class SqliteBuilder:
+    """Writes books, chapters and verses in document order into a new translation database."""
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.books: List[List] = []     # [name, first chapter, chapter count]
+        self.chapters: List[List] = []  # [book id, number, first verse, verse count]
+        self.verse_count = 0
+        self._pending: List[Tuple[int, int, int, str]] = []
+
+    def add_book(self, name: str) -> None:
+        self.books.append([name, len(self.chapters), 0])
+
+    def add_chapter(self, number: int) -> None:
+        self.chapters.append([len(self.books) - 1, number, self.verse_count, 0])
+        self.books[-1][2] += 1
+
+    def add_verse(self, number: int, text: str) -> None:
+        self._pending.append((self.verse_count, len(self.chapters) - 1, number, text))
+        self.verse_count += 1
+        self.chapters[-1][3] += 1
+        if len(self._pending) >= INSERT_BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        self.connection.executemany("INSERT INTO verses (id, chapter_id, number, text) VALUES (?, ?, ?, ?)", self._pending)
+        self._pending = []
+
+    def finish(self) -> None:
+        """Write the remaining verses, the book and chapter tables and the full-text index."""
+        self._flush()
+        self.connection.executemany("INSERT INTO books (id, name, first_chapter, chapter_count) VALUES (?, ?, ?, ?)",
+                                    [(index, *book) for index, book in enumerate(self.books)])
+        self.connection.executemany(
+            "INSERT INTO chapters (id, book_id, number, first_verse, verse_count) VALUES (?, ?, ?, ?, ?)",
+            [(index, *chapter) for index, chapter in enumerate(self.chapters)])
+        self.connection.execute("INSERT INTO verses_fts (verses_fts) VALUES ('rebuild')")
+        self.connection.execute("INSERT INTO meta (key, value) VALUES ('format', ?)", (SQLITE_FORMAT_VERSION,))
+
+
+def build_database(xml_path: str, db_path: str, progress: Optional[ProgressCallback] = None) -> ImportReport:
+    """
+    Import a translation XML file into a new SQLite database, replacing db_path atomically.
+
+    :param xml_path: Path of the source XML file.
+    :param db_path: Destination database file.
+    :param progress: Optional callback receiving (bytes read, total bytes).
+    :return: The import report.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SCHEMA)
+        builder = SqliteBuilder(connection)
+        report = import_translation(xml_path, builder, progress)
+        builder.finish()
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+    logger.info(f"Imported {xml_path} -> {db_path}")
+    return report
+
+
+def load_database(xml_path: str, db_path: str) -> SqliteTranslation:
+    """
+    Open the SQLite database of a translation, importing it first if it is missing or stale.
+
+    :param xml_path: Path of the source XML file.
+    :param db_path: Path of the database file.
+    :return: The opened SqliteTranslation.
+    """
+    stale = not is_fresh(xml_path, db_path)
+    if not stale:
+        try:
+            return SqliteTranslation(db_path)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Ignoring unreadable translation database {db_path}: {e}")
+    with build_lock(db_path):
+        if not (stale and is_fresh(xml_path, db_path)):  # otherwise imported by another process while we waited
+            build_database(xml_path, db_path)
+    return SqliteTranslation(db_path)
+
+
+BACKEND = StorageBackend(name="sqlite", extension=SQLITE_EXTENSION, build=build_database, load=load_database)
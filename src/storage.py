@@ -0,0 +1,211 @@
+import os
+from array import array
+from contextlib import contextmanager
+from os.path import join, getmtime, exists
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from .importer import ImportReport, ProgressCallback
+
+try:
+    import fcntl
+except ImportError:  # Windows: stores are built without cross-process locking
+    fcntl = None
+
+LOCK_EXTENSION = ".lock"
+
+
+class TranslationStore:
+    """
+    Read-only access to one translation, addressed by book, chapter and verse indices.
+
+    Books, chapters and verses are numbered in document order from 0, and the chapters of a
+    book (and the verses of a chapter) have consecutive indices. Backends implement the
+    primitives below and call _build_index() once their tables are readable; lookups by name
+    are provided here on top of the primitives.
+
+    Backends also set book_count, chapter_count, verse_count and nbytes (approximate resident size).
+    """
+    book_count = 0
+    chapter_count = 0
+    verse_count = 0
+    nbytes = 0
+
+    def book_name(self, book_index: int) -> str:
+        """Return the name of the book at book_index."""
+        raise NotImplementedError
+
+    def book_chapters(self, book_index: int) -> range:
+        """Return the range of chapter indices belonging to a book."""
+        raise NotImplementedError
+
+    def chapter_number(self, chapter_index: int) -> int:
+        """Return the chapter number of the chapter at chapter_index."""
+        raise NotImplementedError
+
+    def chapter_verses(self, chapter_index: int) -> range:
+        """Return the range of verse indices belonging to a chapter."""
+        raise NotImplementedError
+
+    def verse_number(self, verse_index: int) -> int:
+        """Return the verse number of the verse at verse_index (0 for section titles)."""
+        raise NotImplementedError
+
+    def verse_text(self, verse_index: int) -> str:
+        """Return the text of the verse at verse_index."""
+        raise NotImplementedError
+
+    def chapter_entries(self, chapter_index: int) -> List[Tuple[int, str]]:
+        """Return (verse number, text) for every entry of a chapter; backends may fetch these in one go."""
+        return [(self.verse_number(verse_index), self.verse_text(verse_index))
+                for verse_index in self.chapter_verses(chapter_index)]
+
+    def _build_index(self) -> None:
+        """
+        Build the book name lookup and the chapter-to-book table once, so navigation never scans the tables.
+
+        Chapters numbered 1, 2, 3... in order are found by position and need no entry of their own;
+        only the chapters of irregularly numbered books are kept in a dictionary.
+        """
+        self.book_order: List[str] = [self.book_name(book_index) for book_index in range(self.book_count)]
+        self._books: Dict[str, int] = {}
+        self._chapter_books = array("I", bytes(4 * self.chapter_count))
+        self._irregular_chapters: Dict[Tuple[int, int], int] = {}  # (book index, chapter number) -> chapter index
+        for book_index, name in enumerate(self.book_order):
+            self._books.setdefault(name, book_index)
+            for position, chapter_index in enumerate(self.book_chapters(book_index)):
+                number = self.chapter_number(chapter_index)
+                if number != position + 1:
+                    self._irregular_chapters.setdefault((book_index, number), chapter_index)
+                self._chapter_books[chapter_index] = book_index
+
+    def chapter_book(self, chapter_index: int) -> int:
+        """Return the index of the book holding the chapter at chapter_index."""
+        return self._chapter_books[chapter_index]
+
+    def find_book(self, book_str: str) -> int:
+        """Return the index of a book by name; raises KeyError if it is not in this translation."""
+        return self._books[book_str]
+
+    def find_chapter(self, book_str: str, chapter_str: str) -> int:
+        """Return the index of a chapter by book name and chapter number; raises KeyError if it is missing."""
+        book_index = self._books[book_str]
+        try:
+            number = int(chapter_str)
+        except ValueError:
+            raise KeyError((book_str, chapter_str)) from None
+        chapters = self.book_chapters(book_index)
+        candidates = [self._irregular_chapters.get((book_index, number))]
+        if 1 <= number <= len(chapters) and self.chapter_number(chapters[number - 1]) == number:
+            candidates.append(chapters[number - 1])
+        candidates = [index for index in candidates if index is not None]
+        if not candidates:
+            raise KeyError((book_str, chapter_str))
+        return min(candidates)  # the first chapter with this number, as in document order
+
+    def chapters_in(self, book_str: str) -> int:
+        """Return the number of chapters in a book."""
+        return len(self.book_chapters(self.find_book(book_str)))
+
+    def verses_in(self, book_str: str, chapter_str: str) -> int:
+        """Return the number of entries (verses and titles) in a chapter."""
+        return len(self.chapter_verses(self.find_chapter(book_str, chapter_str)))
+
+
+class StorageBackend(NamedTuple):
+    name: str
+    extension: str  # File extension of the stores it builds
+    build: Callable[[str, str, Optional[ProgressCallback]], ImportReport]  # (xml path, store path, progress)
+    load: Callable[[str, str], TranslationStore]  # (xml path, store path), rebuilding a missing or stale store
+
+
+def store_path(store_dir: str, translation_str: str, backend: StorageBackend) -> str:
+    """Return the path of a translation's store for a backend."""
+    return join(store_dir, translation_str + backend.extension)
+
+
+def is_fresh(xml_path: str, path: str) -> bool:
+    """Return True if the store exists and is at least as new as its XML source."""
+    return exists(path) and getmtime(path) >= getmtime(xml_path)
+
+
+@contextmanager
+def build_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a store while it is built, shared by every process and thread.
+
+    When several windows or processes start together, the first one to take the lock builds the
+    store and the others wait, then find it fresh and only open (memory-map) the finished file.
+
+    :param path: Path of the store; the lock is a file next to it.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + LOCK_EXTENSION, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_all(translations_dir: str, store_dir: str, backend: StorageBackend, names: Optional[List[str]] = None,
+              force: bool = False, progress: Optional[Callable[[str, int, int], None]] = None) -> List[Tuple[str, ImportReport]]:
+    """
+    Prebuild the stores of the translations in a directory.
+
+    :param translations_dir: Directory containing the translation XML files.
+    :param store_dir: Directory receiving the stores.
+    :param backend: Backend building the stores.
+    :param names: Translations to build; all XML files in the directory when omitted.
+    :param force: Rebuild even if the store is up to date.
+    :param progress: Optional callback receiving (translation name, bytes read, total bytes).
+    :return: (name, import report) for every translation that was (re)built.
+    """
+    if names is None:
+        names = sorted(os.path.splitext(f)[0] for f in os.listdir(translations_dir) if f.endswith(".xml"))
+    built = []
+    for name in names:
+        xml_path = join(translations_dir, name + ".xml")
+        path = store_path(store_dir, name, backend)
+        if force or not is_fresh(xml_path, path):
+            with build_lock(path):
+                if not force and is_fresh(xml_path, path):
+                    continue  # built by another process while we waited
+                callback = (lambda done, total, name=name: progress(name, done, total)) if progress else None
+                built.append((name, backend.build(xml_path, path, callback)))
+    return built
+
+
+def conformance_issues(expected: TranslationStore, actual: TranslationStore, limit: int = 20) -> List[str]:
+    """
+    Compare two stores of the same translation entry by entry.
+
+    :param expected: Reference store (e.g. freshly built from the XML).
+    :param actual: Store under test.
+    :param limit: Stop after this many differences.
+    :return: Descriptions of the differences; empty if the stores agree.
+    """
+    issues: List[str] = []
+    for attribute in ("book_count", "chapter_count", "verse_count"):
+        if getattr(expected, attribute) != getattr(actual, attribute):
+            issues.append(f"{attribute}: {getattr(expected, attribute)} != {getattr(actual, attribute)}")
+    if issues:
+        return issues
+    if expected.book_order != actual.book_order:
+        issues.append("book names differ")
+    for chapter_index in range(expected.chapter_count):
+        if len(issues) >= limit:
+            break
+        location = f"{expected.book_name(expected.chapter_book(chapter_index))} {expected.chapter_number(chapter_index)}"
+        if (expected.chapter_number(chapter_index), expected.chapter_verses(chapter_index),
+                expected.chapter_book(chapter_index)) != (actual.chapter_number(chapter_index),
+                                                          actual.chapter_verses(chapter_index),
+                                                          actual.chapter_book(chapter_index)):
+            issues.append(f"{location}: chapter layout differs")
+        elif expected.chapter_entries(chapter_index) != actual.chapter_entries(chapter_index):
+            issues.append(f"{location}: verses differ")
+        elif [(expected.verse_number(i), expected.verse_text(i)) for i in expected.chapter_verses(chapter_index)] != \
+                [(actual.verse_number(i), actual.verse_text(i)) for i in actual.chapter_verses(chapter_index)]:
+            issues.append(f"{location}: single verse lookups differ from chapter lookups")
+    return issues[:limit]
@@ -0,0 +1,145 @@
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+TRACE_ENV = "BIBLE_GUI_TRACE"  # Set to 1 to trace hot paths and dump timings on exit
+BUCKETS = 24  # Power-of-two microsecond buckets: <1us, <2us, ... <8s, and everything slower
+
+F = TypeVar("F", bound=Callable)
+
+_enabled = os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+class Histogram:
+    """Timings of one operation in power-of-two microsecond buckets."""
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets: List[int] = [0] * (BUCKETS + 1)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Return an upper bound in seconds for the given fraction (0-1) of the timings."""
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+
+class Tracer:
+    """Aggregates timings per operation name. Safe to use from worker threads."""
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds)
+
+    def histograms(self) -> Dict[str, Histogram]:
+        with self._lock:
+            return dict(self._histograms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def report(self) -> str:
+        """Return a table of the timings, slowest total first."""
+        rows = sorted(self.histograms().items(), key=lambda item: item[1].total, reverse=True)
+        lines = [f"{'operation':48} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for name, h in rows:
+            lines.append(
+                f"{name:48} {h.count:8d} {h.total * 1e3:10.2f} {h.total / h.count * 1e3:9.3f} "
+                f"{h.percentile(0.5) * 1e3:9.3f} {h.percentile(0.95) * 1e3:9.3f} {h.max * 1e3:9.3f}"
+            )
+        return "\n".join(lines)
+
+
+tracer = Tracer()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """
+    Turn tracing on. Only functions decorated after this call are traced, so call it before
+    importing the modules to trace (the command line does this for --trace).
+    """
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        atexit.register(_dump)
+
+
+def traced(fn: Optional[F] = None, *, name: Optional[str] = None):
+    """
+    Decorator recording the duration of every call in the tracer.
+
+    When tracing is disabled the function is returned unchanged, so it costs nothing.
+
+    :param name: Operation name (defaults to the function's qualified name).
+    """
+    def decorate(fn: F) -> F:
+        if not _enabled:
+            return fn
+        operation = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(operation, time.perf_counter() - start)
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block of code under an operation name (a no-op when tracing is disabled)."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.record(name, time.perf_counter() - start)
+
+
+def _dump() -> None:
+    if tracer.histograms():
+        report = tracer.report()
+        logger.info("Trace timings:\n" + report)
+        print(report, file=sys.stderr)
+
+
+if _enabled:
+    atexit.register(_dump)
@@ -82,6 +82,44 @@ class Ui_MainWindow(object):
         self.listVerses.setObjectName("listVerses")
         self.verticalLayout_5.addWidget(self.listVerses)
         self.stackedWidget.addWidget(self.pageVerses)
+        self.pageSearch = QtWidgets.QWidget()
+        self.pageSearch.setObjectName("pageSearch")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.pageSearch)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.label_search = QtWidgets.QLabel(self.pageSearch)
+        self.label_search.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_search.setObjectName("label_search")
+        self.verticalLayout_6.addWidget(self.label_search)
+        self.searchInput = QtWidgets.QLineEdit(self.pageSearch)
+        self.searchInput.setClearButtonEnabled(True)
+        self.searchInput.setObjectName("searchInput")
+        self.verticalLayout_6.addWidget(self.searchInput)
+        self.listSearchResults = QtWidgets.QListWidget(self.pageSearch)
+        self.listSearchResults.setWordWrap(True)
+        self.listSearchResults.setObjectName("listSearchResults")
+        self.verticalLayout_6.addWidget(self.listSearchResults)
+        self.stackedWidget.addWidget(self.pageSearch)
+        self.pageConcordance = QtWidgets.QWidget()
+        self.pageConcordance.setObjectName("pageConcordance")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.pageConcordance)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.label_concordance = QtWidgets.QLabel(self.pageConcordance)
+        self.label_concordance.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_concordance.setObjectName("label_concordance")
+        self.verticalLayout_7.addWidget(self.label_concordance)
+        self.concordanceInput = QtWidgets.QLineEdit(self.pageConcordance)
+        self.concordanceInput.setClearButtonEnabled(True)
+        self.concordanceInput.setObjectName("concordanceInput")
+        self.verticalLayout_7.addWidget(self.concordanceInput)
+        self.labelConcordanceStats = QtWidgets.QLabel(self.pageConcordance)
+        self.labelConcordanceStats.setWordWrap(True)
+        self.labelConcordanceStats.setObjectName("labelConcordanceStats")
+        self.verticalLayout_7.addWidget(self.labelConcordanceStats)
+        self.listConcordance = QtWidgets.QListWidget(self.pageConcordance)
+        self.listConcordance.setWordWrap(True)
+        self.listConcordance.setObjectName("listConcordance")
+        self.verticalLayout_7.addWidget(self.listConcordance)
+        self.stackedWidget.addWidget(self.pageConcordance)
         self.verticalLayout.addWidget(self.stackedWidget)
         self.gridLayout.addWidget(self.sidebarContainer, 1, 0, 1, 1)
         MainWindow.setCentralWidget(self.centralwidget)
@@ -108,6 +146,10 @@ class Ui_MainWindow(object):
         self.label_book.setText(_translate("MainWindow", "Book"))
         self.label.setText(_translate("MainWindow", "Chapter"))
         self.label_2.setText(_translate("MainWindow", "Verse"))
+        self.label_search.setText(_translate("MainWindow", "Search"))
+        self.searchInput.setPlaceholderText(_translate("MainWindow", "word, \"phrase\", prefix*, AND/OR/NOT"))
+        self.label_concordance.setText(_translate("MainWindow", "Concordance"))
+        self.concordanceInput.setPlaceholderText(_translate("MainWindow", "word (empty: top words of the book)"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,70 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+RESCAN_DELAY_MS = 500  # Quiet time after the last file system event before the directory is compared
+
+FileState = Tuple[int, int]  # (modification time in ns, size)
+
+
+class TranslationWatcher(QObject):
+    """
+    Watches a translations directory and reports which translation files were added, changed or removed.
+
+    File system events are debounced, since copying or saving a large XML file fires many of
+    them; the directory is then compared with the previous snapshot of names, sizes and
+    modification times, so only the files that really differ are reported.
+    """
+    translationsChanged = pyqtSignal(list, list, list)  # added, changed, removed translation names
+
+    def __init__(self, translations_dir: str, parent: Optional[QObject] = None) -> None:
+        """
+        :param translations_dir: Directory containing the translation XML files.
+        """
+        super().__init__(parent)
+        self.translations_dir = translations_dir
+        self._snapshot = self.scan()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(translations_dir)
+        self._watch_files()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(RESCAN_DELAY_MS)
+        self._timer.timeout.connect(self.rescan)
+        self._watcher.directoryChanged.connect(self._timer.start)
+        self._watcher.fileChanged.connect(self._timer.start)
+
+    def scan(self) -> Dict[str, FileState]:
+        """Return the state of every translation XML file in the directory, by translation name."""
+        snapshot = {}
+        try:
+            with os.scandir(self.translations_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".xml") and entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.name[:-len(".xml")]] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logger.error(f"Could not scan {self.translations_dir}: {e}")
+        return snapshot
+
+    def _watch_files(self) -> None:
+        # Files replaced by an editor or a copy drop out of the watch list, so re-add them after every scan
+        paths = [os.path.join(self.translations_dir, name + ".xml") for name in self._snapshot]
+        missing = sorted(set(paths) - set(self._watcher.files()))
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def rescan(self) -> None:
+        """Compare the directory with the last snapshot and emit translationsChanged if anything differs."""
+        snapshot = self.scan()
+        previous, self._snapshot = self._snapshot, snapshot
+        self._watch_files()
+        added = sorted(snapshot.keys() - previous.keys())
+        removed = sorted(previous.keys() - snapshot.keys())
+        changed = sorted(name for name in snapshot.keys() & previous.keys() if snapshot[name] != previous[name])
+        if added or changed or removed:
+            logger.info(f"Translations changed: added {added}, changed {changed}, removed {removed}")
+            self.translationsChanged.emit(added, changed, removed)
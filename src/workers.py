@@ -0,0 +1,119 @@
+from typing import Any, Callable, Dict, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class TaskSignals(QObject):
+    """Signals emitted by a Task from its worker thread."""
+    finished = pyqtSignal(str, int, object)  # channel, generation, result
+    failed = pyqtSignal(str, int, str)       # channel, generation, error message
+
+
+class Task(QRunnable):
+    """A QRunnable calling a function with arguments and reporting the result through TaskSignals."""
+    def __init__(self, channel: str, generation: int, fn: Callable, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.exception(f"Task on channel {self.channel} failed")
+            self.signals.failed.emit(self.channel, self.generation, str(e))
+            return
+        self.signals.finished.emit(self.channel, self.generation, result)
+
+
+class TaskRunner(QObject):
+    """
+    Runs blocking reader work on a QThreadPool and delivers results on the GUI thread.
+
+    Work is submitted on a named channel (e.g. 'translation' or 'text'). Submitting a new task
+    on a channel supersedes the previous one: if it has not started yet it is removed from the
+    pool, otherwise its result is discarded when it arrives. Only the latest request per channel
+    ever reaches its callback.
+    """
+    busyChanged = pyqtSignal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None, pool: Optional[QThreadPool] = None) -> None:
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[str, Task] = {}
+        self._callbacks: Dict[str, tuple] = {}
+
+    def submit(self, channel: str, fn: Callable, callback: Callable[[Any], None], *args: Any,
+               on_error: Optional[Callable[[str], None]] = None, **kwargs: Any) -> int:
+        """
+        Run fn(*args, **kwargs) on the pool and pass its result to callback on the GUI thread.
+
+        :param channel: Name of the channel; a newer submission cancels the older one.
+        :param fn: Function to run on a worker thread.
+        :param callback: Called with the result if the task is still the latest on its channel.
+        :param on_error: Called with the error message if the task raises.
+        :return: The generation number of the submitted task.
+        """
+        was_busy = self.is_busy()
+        self._drop(channel)
+        generation = self._generations.get(channel, 0) + 1
+        self._generations[channel] = generation
+        task = Task(channel, generation, fn, *args, **kwargs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._pending[channel] = task
+        self._callbacks[channel] = (callback, on_error)
+        self.pool.start(task)
+        if not was_busy:
+            self.busyChanged.emit(True)
+        return generation
+
+    def cancel(self, channel: str) -> None:
+        """Cancel the pending task of a channel; a running task finishes but its result is dropped."""
+        if self._drop(channel) and not self.is_busy():
+            self.busyChanged.emit(False)
+
+    def _drop(self, channel: str) -> bool:
+        task = self._pending.pop(channel, None)
+        if task is None:
+            return False
+        self.pool.tryTake(task)
+        self._generations[channel] = self._generations.get(channel, 0) + 1
+        self._callbacks.pop(channel, None)
+        return True
+
+    def is_pending(self, channel: str) -> bool:
+        """Return True if a channel has a task whose result is still wanted."""
+        return channel in self._pending
+
+    def is_busy(self) -> bool:
+        """Return True while any channel has a task whose result is still wanted."""
+        return bool(self._pending)
+
+    def _take(self, channel: str, generation: int) -> Optional[tuple]:
+        if self._generations.get(channel) != generation or channel not in self._pending:
+            return None
+        del self._pending[channel]
+        callbacks = self._callbacks.pop(channel)
+        if not self.is_busy():
+            self.busyChanged.emit(False)
+        return callbacks
+
+    @pyqtSlot(str, int, object)
+    def _on_finished(self, channel: str, generation: int, result: Any) -> None:
+        callbacks = self._take(channel, generation)
+        if callbacks is not None:
+            callbacks[0](result)
+
+    @pyqtSlot(str, int, str)
+    def _on_failed(self, channel: str, generation: int, message: str) -> None:
+        callbacks = self._take(channel, generation)
+        if callbacks is not None and callbacks[1] is not None:
+            callbacks[1](message)
@@ -0,0 +1,44 @@
+import pytest
+
+from src.reader import Reader
+
+# A small translation in the README XML shape, with a section title and a second book
+FIXTURE_XML = """<bible>
+  <b n="Genesis">
+    <c n="1">
+      <v n="0">The Creation</v>
+      <v n="1">In the beginning God created the heaven and the earth.</v>
+      <v n="2">And the earth was without form, and void.</v>
+      <v n="3">And God said, Let there be light: and there was light.</v>
+    </c>
+    <c n="2">
+      <v n="1">Thus the heavens and the earth were finished.</v>
+      <v n="2">And the LORD God formed man of the dust of the ground.</v>
+    </c>
+  </b>
+  <b n="Psalms">
+    <c n="23">
+      <v n="1">The LORD is my shepherd; I shall not want.</v>
+      <v n="2">He maketh me to lie down in green pastures.</v>
+    </c>
+  </b>
+  <b n="John">
+    <c n="3">
+      <v n="16">For God so loved the world, that he gave his only begotten Son.</v>
+      <v n="17">For God sent not his Son into the world to condemn the world.</v>
+    </c>
+  </b>
+</bible>
+"""
+
+
+@pytest.fixture
+def translations_dir(tmp_path):
+    """Directory holding the fixture translation as KJV.xml."""
+    (tmp_path / "KJV.xml").write_text(FIXTURE_XML, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def reader(translations_dir):
+    return Reader(str(translations_dir))
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from src.cache import LRUCache, SharedLRUCache
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = LRUCache(10)
+    cache.put("a", "A", 4)
+    cache.put("b", "B", 4)
+    cache.get("a")
+    cache.put("c", "C", 4)
+    assert cache.keys() == ["a", "c"]
+    assert cache.total_size == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = LRUCache(10)
+    cache.put("a", "A", 4)
+    cache.put("a", "AA", 6)
+    assert cache.total_size == 6 and len(cache) == 1
+
+
+def test_oversized_entry_is_kept_alone():
+    cache = LRUCache(10)
+    cache.put("a", "A", 4)
+    cache.put("big", "BIG", 50)
+    assert cache.keys() == ["big"]
+    assert cache.total_size == 50
+
+
+def test_get_or_load_counts_loads_and_hits():
+    cache = LRUCache(10)
+    assert cache.get_or_load("a", lambda: "A", len) == "A"
+    assert cache.get_or_load("a", lambda: pytest.fail("loaded twice"), len) == "A"
+    assert (cache.loads, cache.hits) == (1, 1)
+
+
+def test_shared_cache_loads_a_key_once():
+    cache = SharedLRUCache(10)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "A"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("a", load, len))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["A"] * 4
+    assert len(calls) == 1
+
+
+def test_shared_cache_does_not_keep_a_load_discarded_midway():
+    cache = SharedLRUCache(10)
+
+    def load():
+        cache.discard("a")
+        return "stale"
+
+    assert cache.get_or_load("a", load, len) == "stale"
+    assert "a" not in cache
@@ -0,0 +1,54 @@
+from src.importer import import_translation
+
+
+class RecordingBuilder:
+    """Collects what import_translation adds as (kind, value[, text]) tuples."""
+    def __init__(self):
+        self.calls = []
+
+    def add_book(self, name):
+        self.calls.append(("b", name))
+
+    def add_chapter(self, number):
+        self.calls.append(("c", number))
+
+    def add_verse(self, number, text):
+        self.calls.append(("v", number, text))
+
+
+def run_import(tmp_path, xml):
+    path = tmp_path / "T.xml"
+    path.write_text(xml, encoding="utf-8")
+    builder = RecordingBuilder()
+    return builder.calls, import_translation(str(path), builder)
+
+
+def messages(report):
+    return [issue.message for issue in report.issues]
+
+
+def test_well_formed_translation(tmp_path):
+    calls, report = run_import(tmp_path, '<bible><b n="A"><c n="1"><v n="0">Title</v><v n="1">One</v></c></b></bible>')
+    assert calls == [("b", "A"), ("c", 1), ("v", 0, "Title"), ("v", 1, "One")]
+    assert report.issues == []
+
+
+def test_chapter_after_its_book_is_reported_not_appended(tmp_path):
+    calls, report = run_import(tmp_path, '<bible><b n="A"><c n="1"><v n="1">One</v></c></b>'
+                                         '<c n="2"><v n="1">STRAY</v></c></bible>')
+    assert calls == [("b", "A"), ("c", 1), ("v", 1, "One")]
+    assert messages(report) == ["chapter outside of a book skipped"]
+
+
+def test_wrapped_chapter_is_reported(tmp_path):
+    calls, report = run_import(tmp_path, '<bible><b n="A"><section><c n="1"><v n="1">Lost</v></c></section>'
+                                         '<c n="2"><v n="1">Two</v></c></b></bible>')
+    assert calls == [("b", "A"), ("c", 2), ("v", 1, "Two")]
+    assert messages(report) == ["chapter outside of a book skipped"]
+
+
+def test_misplaced_book_is_reported_with_its_content(tmp_path):
+    calls, report = run_import(tmp_path, '<bible><b n="A"><b n="B"><c n="1"><v n="1">Inner</v></c></b>'
+                                         '<c n="1"><v n="1">Outer</v></c></b></bible>')
+    assert calls == [("b", "A"), ("c", 1), ("v", 1, "Outer")]
+    assert messages(report) == ["book outside of the root skipped"]
@@ -0,0 +1,26 @@
+from src.parallel import ParallelFetcher
+
+
+def test_fetch_column_keys_verses_by_canonical_number(reader):
+    fetcher = ParallelFetcher(reader)
+    column = fetcher.fetch_column("KJV", "John", 3)
+    assert sorted(column) == [16, 17]
+    assert column[16][0].startswith("For God so loved the world")
+
+
+def test_invalidate_during_fetch_does_not_keep_the_stale_column(reader, translations_dir):
+    fetcher = ParallelFetcher(reader)
+    get_verse_entries = reader.get_verse_entries
+
+    def changed_midway(*args):
+        entries = get_verse_entries(*args)
+        xml = translations_dir / "KJV.xml"
+        xml.write_text(xml.read_text(encoding="utf-8").replace("loved the world", "LOVED the world"), encoding="utf-8")
+        reader.invalidate("KJV")
+        fetcher.invalidate("KJV")
+        return entries
+
+    reader.get_verse_entries = changed_midway
+    assert "loved" in fetcher.fetch_column("KJV", "John", 3)[16][0]
+    reader.get_verse_entries = get_verse_entries
+    assert "LOVED" in fetcher.fetch_column("KJV", "John", 3)[16][0]
@@ -0,0 +1,36 @@
+import pytest
+
+from src.references import Reference, ReferenceParseError, parse_references
+
+
+def test_verse_range_and_whole_chapter():
+    assert parse_references("John 3:16-18; Rom 8") == [Reference("John", 3, 16, 3, 18), Reference("Romans", 8, None, 8, None)]
+
+
+def test_comma_continues_the_chapter():
+    assert parse_references("1 Cor 13:4-7, 13") == [Reference("1 Corinthians", 13, 4, 13, 7),
+                                                     Reference("1 Corinthians", 13, 13, 13, 13)]
+
+
+def test_range_across_chapters():
+    assert parse_references("Gen 1:1-2:3") == [Reference("Genesis", 1, 1, 2, 3)]
+    assert str(parse_references("Gen 1:1-2:3")[0]) == "Genesis 1:1-2:3"
+
+
+def test_single_chapter_book_number_is_a_verse():
+    assert parse_references("Jude 3") == [Reference("Jude", 1, 3, 1, 3)]
+
+
+def test_semicolon_reuses_the_book():
+    assert [str(reference) for reference in parse_references("Ps 23; 24:1")] == ["Psalms 23", "Psalms 24:1"]
+
+
+def test_roman_numeral_prefix_and_whole_book():
+    assert parse_references("ii kings 2") == [Reference("2 Kings", 2, None, 2, None)]
+    assert parse_references("Obadiah") == [Reference("Obadiah", None, None, None, None)]
+
+
+@pytest.mark.parametrize("text", ["Foo 1:1", "John 3:18-16", "John 3:x", "; 3"])
+def test_invalid_references_raise(text):
+    with pytest.raises(ReferenceParseError):
+        parse_references(text)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from src.concordance import ConcordanceEngine, WordFrequency
+from src.search import QUERY_TOKEN_RE, SearchEngine, SearchIndex
+
+
+@pytest.fixture
+def engine(reader):
+    return SearchEngine(reader)
+
+
+def references(results):
+    return {(hit.book, hit.chapter, hit.verse) for hit in results.hits}
+
+
+def search(engine, query):
+    return references(engine.search("KJV", query, page_size=100))
+
+
+def test_words_are_anded(engine):
+    assert search(engine, "god earth") == {("Genesis", "1", "1")}
+
+
+def test_phrase(engine):
+    assert search(engine, '"the lord"') == {("Genesis", "2", "2"), ("Psalms", "23", "1")}
+    assert search(engine, '"lord the"') == set()
+
+
+def test_negated_phrase_excludes_the_phrase(engine):
+    assert search(engine, 'god -"the lord"') == {("Genesis", "1", "1"), ("Genesis", "1", "3"),
+                                                   ("John", "3", "16"), ("John", "3", "17")}
+    assert search(engine, 'god NOT "the lord"') == search(engine, 'god -"the lord"')
+
+
+def test_negated_group(engine):
+    assert search(engine, "god -(world OR light)") == {("Genesis", "1", "1"), ("Genesis", "2", "2")}
+
+
+def test_or_and_prefix(engine):
+    assert search(engine, "shepherd OR pastures") == {("Psalms", "23", "1"), ("Psalms", "23", "2")}
+    assert search(engine, "heav*") == {("Genesis", "1", "1"), ("Genesis", "2", "1")}
+
+
+def test_unmatched_parenthesis_is_ignored(engine):
+    assert search(engine, "god ) world") == search(engine, "god world") == {("John", "3", "16"), ("John", "3", "17")}
+
+
+def test_hyphenated_words_are_not_negated():
+    assert QUERY_TOKEN_RE.findall('well-known -"a b" -(c)') == ["well-known", "-", '"a b"', "-", "(", "c", ")"]
+
+
+def test_section_titles_are_not_indexed(engine):
+    assert search(engine, "creation") == set()
+
+
+def test_concurrent_index_requests_build_once(engine, monkeypatch):
+    builds = []
+    build = SearchIndex.build.__func__
+
+    def counting_build(cls, translation):
+        builds.append(translation)
+        time.sleep(0.05)
+        return build(cls, translation)
+
+    monkeypatch.setattr(SearchIndex, "build", classmethod(counting_build))
+    indexes = []
+    threads = [threading.Thread(target=lambda: indexes.append(engine.index_for("KJV"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(index is indexes[0] for index in indexes)
+
+
+def test_concordance_counts_match_search_index(reader, engine):
+    concordance = ConcordanceEngine(reader, engine)
+    assert concordance.frequency("KJV", "world") == WordFrequency("world", 3, [("John", 3)])
+    assert concordance.chapter_frequencies("KJV", "earth", "Genesis") == [("1", 2), ("2", 1)]
+    assert [(o.verse, o.count) for o in concordance.occurrences("KJV", "world")] == [("16", 1), ("17", 2)]
+    assert concordance.top_words("KJV", 1) == [("god", 5)]
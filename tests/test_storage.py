@@ -0,0 +1,28 @@
+import pytest
+
+from src.compiled import CompiledTranslation, build_translation
+from src.reader import BACKENDS, Reader
+from src.storage import conformance_issues, store_path
+
+
+@pytest.mark.parametrize("backend", BACKENDS.values(), ids=list(BACKENDS))
+def test_backend_conforms_to_fresh_build(translations_dir, backend):
+    xml_path = str(translations_dir / "KJV.xml")
+    expected = CompiledTranslation(build_translation(xml_path)[0])
+    actual = backend.load(xml_path, store_path(str(translations_dir / "compiled"), "KJV", backend))
+    assert conformance_issues(expected, actual) == []
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_reader_reads_every_backend(translations_dir, backend):
+    reader = Reader(str(translations_dir), backend=backend)
+    assert reader.get_books(translation_str="KJV") == ["Genesis", "Psalms", "John"]
+    assert reader.get_chapters("Genesis", "KJV") == ["1", "2"]
+    assert reader.get_verse_entries("John", "3", "KJV")[0] == ("16", "For God so loved the world, that he gave his only begotten Son.")
+
+
+def test_conformance_reports_differences(translations_dir, tmp_path):
+    expected = CompiledTranslation(build_translation(str(translations_dir / "KJV.xml"))[0])
+    changed = tmp_path / "changed.xml"
+    changed.write_text((translations_dir / "KJV.xml").read_text(encoding="utf-8").replace("void", "empty"), encoding="utf-8")
+    assert conformance_issues(expected, CompiledTranslation(build_translation(str(changed))[0])) != []